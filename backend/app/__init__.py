@@ -3,25 +3,35 @@ from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from datetime import timedelta
 import os
+import logging
 from config import Config
-from flask_sqlalchemy import SQLAlchemy
+from .database import RoutingSQLAlchemy, prepare_sqlite_file, display_uri
 
-# 恢复数据库初始化
-db = SQLAlchemy()
+# 恢复数据库初始化（连接池参数和只读副本路由见database.py）
+db = RoutingSQLAlchemy()
 jwt = JWTManager()
 
+logger = logging.getLogger(__name__)
+
 def create_app():
     app = Flask(__name__)
     
     # 配置
     app.config.from_object(Config)
     
+    # 日志通过队列异步输出，避免阻塞请求线程
+    from .logging_setup import init_logging
+    init_logging(app)
+    
     # 初始化扩展，恢复数据库初始化
     db.init_app(app)
+    # SQLite单文件部署：确保数据库文件所在目录存在
+    sqlite_path = prepare_sqlite_file(app)
     jwt.init_app(app)
     
-    # 配置CORS，允许所有来源，所有方法和所有头部
-    CORS(app, resources={r"/api/*": {"origins": "*", "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"], "allow_headers": "*"}})
+    # 配置CORS，允许所有来源，所有方法和所有头部；暴露条件请求的响应头供前端读取
+    CORS(app, resources={r"/api/*": {"origins": "*", "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"], "allow_headers": "*",
+                                     "expose_headers": ["ETag", "Last-Modified"]}})
     
     # JWT错误处理
     @jwt.invalid_token_loader
@@ -55,14 +65,30 @@ def create_app():
     app.register_blueprint(robot_bp, url_prefix='/api/robots')  # 注册机器人蓝图
     app.register_blueprint(energy_efficiency_bp, url_prefix='/api/energy-efficiency')  # 注册能效分析蓝图
     
+    # 注册请求级性能指标（/api/system/metrics）
+    from . import metrics, slow_query
+    metrics.init_app(app)
+    
+    # 慢查询日志（/api/system/slow-queries，logs/slow_queries.log）
+    slow_query.init_app(app)
+    
     # 打印数据库连接信息
     with app.app_context():
-        print(f"数据库连接URI: {app.config['SQLALCHEMY_DATABASE_URI']}")
+        logger.info("数据库连接URI: %s", display_uri(app.config['SQLALCHEMY_DATABASE_URI']))
+        if sqlite_path:
+            # 嵌入式部署没有单独的建库步骤，启动时创建缺少的表和索引
+            db.create_all()
+        if app.config.get('SQLALCHEMY_BINDS'):
+            logger.info("只读副本URI: %s", display_uri(app.config['SQLALCHEMY_BINDS'].get('replica')))
         # 尝试从数据访问模块打印连接信息
         try:
             from .data_access import print_connection_info
             print_connection_info()
         except Exception as e:
-            print(f"无法打印数据库连接信息: {e}")
+            logger.error("无法打印数据库连接信息: %s", e)
+    
+    # 启动自动充电后台任务（CHARGING_WORKER_ENABLED=1 时）
+    from .charging_worker import start_worker
+    start_worker(app)
     
     return app 
\ No newline at end of file
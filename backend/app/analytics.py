@@ -0,0 +1,284 @@
+from datetime import datetime
+import numpy as np
+
+from .order_store import MISSING_TIME, now_epoch, format_epoch
+
+# 能效分析计算模块：基于订单列式快照（OrderFrame）的NumPy批量计算，供能效分析路由使用
+
+HOUR_SECONDS = 3600
+DAY_SECONDS = 24 * HOUR_SECONDS
+HOUR_SPAN = HOUR_SECONDS - 1  # 每个小时区间为 HH:00:00 ~ HH:59:59
+DEFAULT_CHARGE_AMOUNT = 5.0  # 无法估算充电量时使用的平均值 kWh
+DEFAULT_STATION_POWER = 10  # 找不到充电站时使用的默认功率
+PEAK_SLOTS = ['0-2', '2-4', '4-6', '6-8', '8-10', '10-12', '12-14', '14-16', '16-18', '18-20', '20-22', '22-24']
+
+def parse_datetime(datetime_str):
+    """解析日期时间字符串"""
+    if not datetime_str:
+        return datetime.now().replace(tzinfo=None)
+
+    try:
+        # 尝试解析ISO格式
+        dt = datetime.fromisoformat(datetime_str.replace('Z', '+00:00'))
+        # 去除时区信息，确保所有日期时间都是offset-naive的
+        return dt.replace(tzinfo=None)
+    except:
+        try:
+            # 尝试解析其他格式
+            return datetime.strptime(datetime_str, '%Y-%m-%d %H:%M:%S')
+        except:
+            return datetime.now().replace(tzinfo=None)
+
+def _or_now(values, now):
+    """缺失的时间按当前时间处理"""
+    return np.where(values == MISSING_TIME, now, values)
+
+def _mean(values):
+    """求平均值，没有数据时返回0"""
+    return float(values.sum()) / len(values) if len(values) else 0
+
+def _change(current, previous):
+    """计算与前一时间段相比的变化百分比"""
+    return ((current - previous) / previous * 100) if previous else 0
+
+def station_powers(frame, station_index):
+    """按订单对齐的充电站功率数组，找不到充电站时使用默认功率，功率为空时为NaN"""
+    if not len(frame):
+        return np.zeros(0, dtype='float64')
+    station_ids, inverse = np.unique(frame.station_id, return_inverse=True)
+    powers = []
+    for station_id in station_ids.tolist():
+        station = station_index.get(station_id)
+        power = DEFAULT_STATION_POWER if station is None else station['power']
+        powers.append(np.nan if power is None else power)
+    return np.array(powers, dtype='float64')[inverse]
+
+def order_efficiencies(frame, powers):
+    """订单充电效率：优先使用订单中的效率字段，否则对已完成订单按充电量、时长和功率计算，无法计算时为NaN"""
+    efficiency = frame.efficiency.copy()
+    hours = (frame.end - frame.start) / HOUR_SECONDS
+    with np.errstate(invalid='ignore'):
+        computable = (
+            np.isnan(efficiency) &
+            frame.status_is('completed') &
+            (frame.end != MISSING_TIME) & (frame.start != MISSING_TIME) &
+            (np.nan_to_num(frame.charge_amount) != 0) &
+            (hours > 0) & (powers > 0)
+        )
+    efficiency[computable] = frame.charge_amount[computable] / hours[computable] / powers[computable] * 100
+    return efficiency
+
+def _period_metrics(frame, powers, total_available_hours, now):
+    """计算单个时间段的KPI原始指标"""
+    completed = frame.status_is('completed')
+    efficiency = order_efficiencies(frame, powers)[completed]
+    charging_hours = (_or_now(frame.end, now) - _or_now(frame.start, now)) / HOUR_SECONDS
+    waited = (frame.start != MISSING_TIME) & (frame.created != MISSING_TIME) & (frame.start > frame.created)
+    finished = int(frame.status_is('completed', 'failed').sum())
+    successful = int(completed.sum())
+    return {
+        'efficiency': _mean(efficiency[~np.isnan(efficiency)]),
+        'energy': float(np.nan_to_num(frame.charge_amount[completed]).sum()),
+        'utilization': (float(charging_hours.sum()) / total_available_hours * 100) if total_available_hours else 0,
+        'wait_time': _mean((frame.start[waited] - frame.created[waited]) / 60),
+        'success_rate': (successful / finished * 100) if finished else 0,
+        'orders': successful
+    }
+
+def kpi_metrics(frame, powers, prev_frame, prev_powers, total_available_hours):
+    """计算KPI指标及与前一个相同时间段的比较"""
+    now = now_epoch()
+    current = _period_metrics(frame, powers, total_available_hours, now)
+    previous = _period_metrics(prev_frame, prev_powers, total_available_hours, now)
+    return {
+        'avgEfficiency': current['efficiency'],
+        'efficiencyChange': _change(current['efficiency'], previous['efficiency']),
+        'totalEnergy': current['energy'],
+        'energyChange': _change(current['energy'], previous['energy']),
+        'utilization': current['utilization'],
+        'utilizationChange': _change(current['utilization'], previous['utilization']),
+        'avgWaitTime': current['wait_time'],
+        'waitTimeChange': _change(current['wait_time'], previous['wait_time']),
+        'successRate': current['success_rate'],
+        'successRateChange': _change(current['success_rate'], previous['success_rate']),
+        'totalOrders': current['orders'],
+        'ordersChange': _change(current['orders'], previous['orders'])
+    }
+
+def daily_efficiency_table(frame, powers):
+    """按 (充电站ID, 日期) 汇总订单数、效率之和与效率个数"""
+    if not len(frame):
+        return {}
+    days = np.floor_divide(_or_now(frame.start, now_epoch()), DAY_SECONDS)
+    efficiency = order_efficiencies(frame, powers)
+    valid = ~np.isnan(efficiency)
+
+    keys, inverse = np.unique(np.stack([frame.station_id, days], axis=1), axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    order_counts = np.bincount(inverse, minlength=len(keys))
+    efficiency_sums = np.bincount(inverse[valid], weights=efficiency[valid], minlength=len(keys))
+    efficiency_counts = np.bincount(inverse[valid], minlength=len(keys))
+
+    dates = [text[:10] for text in format_epoch(keys[:, 1] * DAY_SECONDS)]
+    return {
+        (station_id, date): (count, efficiency_sum, efficiency_count)
+        for station_id, date, count, efficiency_sum, efficiency_count in zip(
+            keys[:, 0].tolist(), dates, order_counts.tolist(), efficiency_sums.tolist(), efficiency_counts.tolist()
+        )
+    }
+
+def charge_amounts(frame, powers):
+    """订单充电量，缺失时按充电效率和时长估算，无法估算时使用平均值"""
+    amounts = frame.charge_amount.copy()
+    missing = np.isnan(amounts)
+    estimable = missing & (np.nan_to_num(frame.efficiency) != 0) & (frame.end != MISSING_TIME)
+    starts = _or_now(frame.start, now_epoch())
+    hours = (frame.end - starts) / HOUR_SECONDS
+    amounts[estimable] = powers[estimable] * hours[estimable] * frame.efficiency[estimable] / 100
+    amounts[missing & ~estimable] = DEFAULT_CHARGE_AMOUNT
+    return amounts
+
+def energy_distribution_matrix(frame, powers, first_day, num_days):
+    """计算能耗分布热力图矩阵
+
+    将每个订单的充电量按其在各小时区间内的时长比例分摊，
+    返回 (energy, counts) 两个 num_days x 24 的矩阵，counts为与每个小时区间重叠的订单数。
+    """
+    num_buckets = num_days * 24
+    energy = np.zeros(num_buckets, dtype='float64')
+    counts = np.zeros(num_buckets, dtype='int64')
+    if not len(frame) or num_buckets <= 0:
+        return energy.reshape(num_days, 24), counts.reshape(num_days, 24)
+
+    now = now_epoch()
+    starts = _or_now(frame.start, now)
+    ends = _or_now(frame.end, now)
+    amounts = charge_amounts(frame, powers)
+
+    # 订单覆盖的第一个和最后一个小时区间
+    origin = int(np.datetime64(first_day.strftime('%Y-%m-%d'), 's').astype('int64'))
+    first_clipped = np.maximum(np.floor_divide(starts - origin, HOUR_SECONDS), 0)
+    last_clipped = np.minimum(np.floor_divide(ends - origin, HOUR_SECONDS), num_buckets - 1)
+    spans = last_clipped - first_clipped + 1
+    valid = spans > 0
+
+    # 差分数组统计每个小时区间的重叠订单数
+    diff = np.zeros(num_buckets + 1, dtype='int64')
+    np.add.at(diff, first_clipped[valid], 1)
+    np.add.at(diff, last_clipped[valid] + 1, -1)
+    counts = np.cumsum(diff[:-1])
+
+    # 按订单展开其覆盖的小时区间，计算每段的时长比例
+    total_durations = ends - starts
+    charged = valid & (total_durations > 0)
+    order_index = np.repeat(np.nonzero(charged)[0], spans[charged])
+    offsets = np.arange(len(order_index)) - np.repeat(np.cumsum(spans[charged]) - spans[charged], spans[charged])
+    buckets = first_clipped[order_index] + offsets
+
+    bucket_starts = origin + buckets * HOUR_SECONDS
+    overlap_starts = np.maximum(starts[order_index], bucket_starts)
+    overlap_ends = np.minimum(ends[order_index], bucket_starts + HOUR_SPAN)
+    proportions = (overlap_ends - overlap_starts).astype('float64') / total_durations[order_index].astype('float64')
+
+    # np.add.at按订单顺序累加，与逐订单累加的结果一致
+    np.add.at(energy, buckets, amounts[order_index] * proportions)
+
+    return energy.reshape(num_days, 24), counts.reshape(num_days, 24)
+
+def energy_distribution_points(dates, energy, counts):
+    """将热力图矩阵转换为 [日期, 小时, 能耗] 数据点列表"""
+    heatmap_data = []
+    for day_index, date in enumerate(dates):
+        for hour in range(24):
+            if counts[day_index, hour] > 0:
+                heatmap_data.append([date, str(hour), round(float(energy[day_index, hour]), 2)])
+            else:
+                # 即使没有数据，也添加零值点，确保热力图完整
+                heatmap_data.append([date, str(hour), 0])
+    return heatmap_data
+
+def station_busy_hours(frame):
+    """按充电站汇总充电时长（小时），未结束的订单按当前时间计算"""
+    if not len(frame):
+        return {}
+    now = now_epoch()
+    hours = (_or_now(frame.end, now) - _or_now(frame.start, now)) / HOUR_SECONDS
+    station_ids, inverse = np.unique(frame.station_id, return_inverse=True)
+    totals = np.bincount(inverse, weights=hours, minlength=len(station_ids))
+    return dict(zip(station_ids.tolist(), totals.tolist()))
+
+def robot_charging_stats(frame):
+    """按机器人汇总充电次数、平均充电时长（分钟）和平均等待时间（分钟）"""
+    if not len(frame):
+        return {}
+    robot_ids, inverse = np.unique(frame.robot_id, return_inverse=True)
+    size = len(robot_ids)
+    counts = np.bincount(inverse, minlength=size)
+
+    finished = frame.status_is('completed') & (frame.end != MISSING_TIME)
+    durations = (frame.end[finished] - _or_now(frame.start, now_epoch())[finished]) / 60
+    duration_sums = np.bincount(inverse[finished], weights=durations, minlength=size)
+    duration_counts = np.bincount(inverse[finished], minlength=size)
+
+    starts = _or_now(frame.start, now_epoch())
+    waited = (frame.created != MISSING_TIME) & (starts > frame.created)
+    waits = (starts[waited] - frame.created[waited]) / 60
+    wait_sums = np.bincount(inverse[waited], weights=waits, minlength=size)
+    wait_counts = np.bincount(inverse[waited], minlength=size)
+
+    stats = {}
+    for i, robot_id in enumerate(robot_ids.tolist()):
+        stats[robot_id] = {
+            'count': int(counts[i]),
+            'avg_duration': float(duration_sums[i]) / duration_counts[i] if duration_counts[i] else 0,
+            'avg_wait': float(wait_sums[i]) / wait_counts[i] if wait_counts[i] else 0
+        }
+    return stats
+
+def peak_analysis(frame):
+    """按订单创建时间所在的两小时时段统计请求数和平均等待时间"""
+    created = _or_now(frame.created, now_epoch())
+    slots = np.floor_divide(np.mod(created, DAY_SECONDS), HOUR_SECONDS) // 2
+    request_counts = np.bincount(slots, minlength=12)
+
+    waited = (frame.start != MISSING_TIME) & (frame.start > created)
+    waits = (frame.start[waited] - created[waited]) / 60
+    wait_sums = np.bincount(slots[waited], weights=waits, minlength=12)
+    wait_counts = np.bincount(slots[waited], minlength=12)
+    return {
+        'timeSlots': list(PEAK_SLOTS),
+        'requestCounts': request_counts.tolist(),
+        'avgWaitingTimes': [
+            round(total / count, 2) if count else 0
+            for total, count in zip(wait_sums.tolist(), wait_counts.tolist())
+        ]
+    }
+
+def rollup_daily_efficiency_table(rollup_rows):
+    """由充电站小时汇总数据生成与daily_efficiency_table相同格式的 (充电站ID, 日期) 汇总表"""
+    table = {}
+    for row in rollup_rows:
+        if not row['session_count']:
+            # 只有跨小时分摊的充电时长，当天没有开始的订单
+            continue
+        key = (row['station_id'], row['hour'][:10])
+        count, efficiency_sum, efficiency_count = table.get(key, (0, 0, 0))
+        table[key] = (
+            count + row['session_count'],
+            efficiency_sum + row['efficiency_sum'],
+            efficiency_count + row['efficiency_count']
+        )
+    return table
+
+def rollup_energy_matrix(rollup_rows, first_day, num_days):
+    """由充电站小时汇总数据生成能耗分布热力图矩阵，counts为有充电时长的充电站数"""
+    energy = np.zeros((num_days, 24), dtype='float64')
+    counts = np.zeros((num_days, 24), dtype='int64')
+    origin = first_day.replace(hour=0, minute=0, second=0, microsecond=0)
+    for row in rollup_rows:
+        hour = datetime.strptime(row['hour'], '%Y-%m-%d %H:%M:%S')
+        day_index = (hour - origin).days
+        if 0 <= day_index < num_days and row['busy_seconds'] > 0:
+            energy[day_index, hour.hour] += row['energy']
+            counts[day_index, hour.hour] += 1
+    return energy, counts
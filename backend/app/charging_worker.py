@@ -0,0 +1,145 @@
+import logging
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import text
+
+from . import db, data_access
+
+logger = logging.getLogger(__name__)
+
+# 自动充电后台任务：按固定间隔执行低电量检查和充电进度推进，
+# 多个进程同时运行时通过MySQL GET_LOCK选出一个leader执行。
+# leader执行后的clear_cache会递增数据库中的数据版本，但清除缓存和实时推送只作用于leader所在进程：
+# 其他进程的读取和条件请求（列表、仪表盘、能效分析）最长在本进程缓存过期（60秒）后才看到变化，
+# 其他进程的SSE连接不会收到自动充电的变化
+
+_LOCK_NAME = 'charging_worker_leader'
+
+class ChargingWorker:
+    """自动充电后台线程"""
+
+    def __init__(self, app, interval):
+        self.app = app
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock_conn = None  # 持有GET_LOCK的数据库连接，连接断开时锁自动释放
+        self.stats = {
+            'is_leader': False,
+            'ticks': 0,
+            'errors': 0,
+            'last_tick_at': None,
+            'last_tick_seconds': 0,
+            'max_tick_seconds': 0,
+            'total_tick_seconds': 0,
+            'actions': {}  # 各类处理结果累计次数，如 assign_and_start_charging / charging_completed
+        }
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='charging-worker', daemon=True)
+            self._thread.start()
+            logger.info("自动充电后台任务已启动，间隔 %s 秒", self.interval)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 5)
+        self._release_leadership()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            with self.app.app_context():
+                try:
+                    if self._ensure_leadership():
+                        self._tick()
+                except Exception as e:
+                    self.stats['errors'] += 1
+                    logger.exception("自动充电后台任务出错: %s", e)
+                finally:
+                    db.session.remove()
+
+    def _ensure_leadership(self):
+        """确认当前进程是leader，不是时尝试获取GET_LOCK（非MySQL数据库只有单进程，直接视为leader）"""
+        if db.engine.dialect.name != 'mysql':
+            self.stats['is_leader'] = True
+            return True
+
+        if self._lock_conn is not None:
+            try:
+                # 确认锁仍由本连接持有（连接重建后锁会丢失）
+                held = self._lock_conn.execute(
+                    text("SELECT IS_USED_LOCK(:name) = CONNECTION_ID()"), {'name': _LOCK_NAME}
+                ).scalar()
+                if held:
+                    return True
+            except Exception as e:
+                logger.warning("检查自动充电leader锁失败: %s", e)
+            self._release_leadership()
+
+        conn = db.engine.connect()
+        try:
+            acquired = conn.execute(text("SELECT GET_LOCK(:name, 0)"), {'name': _LOCK_NAME}).scalar()
+        except Exception:
+            conn.close()
+            raise
+        if acquired == 1:
+            self._lock_conn = conn
+            self.stats['is_leader'] = True
+            logger.info('当前进程成为自动充电任务leader')
+            return True
+        conn.close()
+        return False
+
+    def _release_leadership(self):
+        if self._lock_conn is not None:
+            try:
+                self._lock_conn.execute(text("SELECT RELEASE_LOCK(:name)"), {'name': _LOCK_NAME})
+            except Exception:
+                pass
+            self._lock_conn.close()
+            self._lock_conn = None
+        self.stats['is_leader'] = False
+
+    def _tick(self):
+        """执行一次低电量检查，记录耗时和处理结果"""
+        started = time.perf_counter()
+        results = data_access.check_low_battery_robots()
+        elapsed = time.perf_counter() - started
+
+        # 有分配或完成充电时清除全部缓存，否则只有充电中机器人的电量变化
+        if any(result['action'] != 'no_idle_station' for result in results):
+            data_access.clear_cache()
+        else:
+            data_access.clear_cache('robots')
+        actions = self.stats['actions']
+        for result in results:
+            actions[result['action']] = actions.get(result['action'], 0) + 1
+        self.stats['ticks'] += 1
+        self.stats['last_tick_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.stats['last_tick_seconds'] = round(elapsed, 4)
+        self.stats['max_tick_seconds'] = round(max(self.stats['max_tick_seconds'], elapsed), 4)
+        self.stats['total_tick_seconds'] += elapsed
+
+_worker = None
+
+def start_worker(app):
+    """根据配置启动自动充电后台任务（每个进程一个线程，由leader锁保证只有一个进程执行）"""
+    global _worker
+    if _worker is None and app.config.get('CHARGING_WORKER_ENABLED'):
+        _worker = ChargingWorker(app, app.config.get('CHARGING_WORKER_INTERVAL', 30))
+        _worker.start()
+    return _worker
+
+def get_worker_stats():
+    """获取自动充电后台任务的运行指标"""
+    if _worker is None:
+        return {'enabled': False}
+    stats = dict(_worker.stats)
+    stats['actions'] = dict(stats['actions'])
+    stats['enabled'] = True
+    stats['interval'] = _worker.interval
+    stats['avg_tick_seconds'] = round(stats.pop('total_tick_seconds') / stats['ticks'], 4) if stats['ticks'] else 0
+    return stats
@@ -1,27 +1,202 @@
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 import bcrypt
-import sys
-import traceback
-from flask import current_app
-from sqlalchemy import create_engine, text
+import logging
+from flask import current_app, g, has_app_context
+from sqlalchemy import create_engine, text, case, and_, or_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import scoped_session, sessionmaker
 import random
+import heapq
+import threading
+import time
+from collections import OrderedDict, deque
 
 # 导入模型
-from .models import User, ChargingStation, Robot, ChargingOrder, SystemAlert, EfficiencyLog, SystemSetting, SystemLog
+from .models import User, ChargingStation, Robot, ChargingOrder, SystemAlert, EfficiencyLog, SystemSetting, SystemLog, StationHourlyRollup, DeletedRecord, DataVersion
 from . import db
+from .database import begin_write, display_uri
+
+logger = logging.getLogger(__name__)
 
 # 缓存数据，避免频繁查询数据库
-_data_cache = {}
+_data_cache = OrderedDict()  # 按最近使用顺序保存各类数据，超出上限时淘汰最久未使用的条目
 _cache_timeout = 60  # 缓存过期时间（秒）
+_cache_max_entries = 32  # 缓存条目上限
 _last_cache_time = {}  # 记录每种数据的最后缓存时间
+_cache_lock = threading.RLock()
+_cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+# 充电站属性索引 {station_id: {'name', 'power', 'efficiency'}}，进程级共享，写操作后失效
+_station_index = None
+_station_index_time = 0
+
+# 缓存清除时的回调（如内存列式订单存储），参数为被清除的key，None表示全部
+_invalidation_listeners = []
+
+# 写操作提交后的数据变更回调（如SSE推送），参数为本次提交中变化的行，见_notify_changes
+_change_listeners = []
+
+# 各类数据缓存条目加载前从数据库读到的版本 {key: (版本号, 变化时间)}，用于HTTP条件请求（ETag / Last-Modified）
+_cache_versions = {}
+
+# 数据快照的版本来源（如内存列式订单存储）{key: [回调]}，回调返回快照加载前读到的版本，快照需要刷新时返回None
+_version_sources = {}
+
+_VERSION_KEYS = ('stations', 'robots', 'orders')
+_EPOCH = datetime(1970, 1, 1)
+
+def add_invalidation_listener(listener):
+    """注册缓存清除回调"""
+    if listener not in _invalidation_listeners:
+        _invalidation_listeners.append(listener)
+
+def add_version_source(key, source):
+    """注册数据快照的版本来源"""
+    sources = _version_sources.setdefault(key, [])
+    if source not in sources:
+        sources.append(source)
+
+def add_change_listener(listener):
+    """注册数据变更回调"""
+    if listener not in _change_listeners:
+        _change_listeners.append(listener)
+
+def _notify_changes(robots=(), stations=(), deleted_stations=(), new_orders=0):
+    """通知已提交的变更：robots/stations为包含id和变化字段的字典列表，
+    deleted_stations为被删除的充电桩ID，new_orders为新建的充电订单数"""
+    if not _change_listeners:
+        return
+    changes = {
+        'robots': list(robots),
+        'stations': list(stations),
+        'deleted_stations': list(deleted_stations),
+        'new_orders': new_orders
+    }
+    for listener in _change_listeners:
+        try:
+            listener(changes)
+        except Exception as e:
+            # 回调出错不影响已提交的写操作
+            logger.exception("数据变更回调出错: %s", e)
+
+def clear_cache(key=None):
+    """写操作提交后调用：递增数据版本并清除本进程的数据缓存，指定key时只处理该类数据"""
+    # 先递增版本再清除缓存，清除后重新加载的缓存条目读到的一定是新版本
+    _bump_data_versions(_VERSION_KEYS if key is None else [key] if key in _VERSION_KEYS else [])
+    with _cache_lock:
+        if key is None:
+            _data_cache.clear()
+            _last_cache_time.clear()
+            _cache_versions.clear()
+        else:
+            _data_cache.pop(key, None)
+            _last_cache_time.pop(key, None)
+            _cache_versions.pop(key, None)
+        _cache_stats['invalidations'] += 1
+    if key in (None, 'stations'):
+        invalidate_station_index()
+    for listener in _invalidation_listeners:
+        listener(key)
+    logger.debug('数据缓存已清除: %s', key or '全部')
+
+def _bump_data_versions(keys):
+    """在独立事务中递增数据版本，其他进程的缓存过期后据此发现本进程的写操作"""
+    if not keys or not has_app_context():
+        return
+    table = DataVersion.__table__
+    now = datetime.utcnow()
+    try:
+        with db.engine.begin() as conn:
+            for key in keys:
+                updated = conn.execute(table.update().where(table.c.name == key)
+                                       .values(version=table.c.version + 1, updated_at=now))
+                if updated.rowcount == 0:
+                    conn.execute(table.insert().values(name=key, version=1, updated_at=now))
+    except Exception as e:
+        # 写操作本身已经提交，只是其他进程的条件请求在下一次写操作前不会发现这次变化
+        logger.exception("递增数据版本时出错: %s", e)
+
+def get_cache_stats():
+    """获取缓存命中统计"""
+    with _cache_lock:
+        stats = dict(_cache_stats)
+        stats['entries'] = len(_data_cache)
+        stats['keys'] = list(_data_cache.keys())
+    total = stats['hits'] + stats['misses']
+    stats['hit_rate'] = round(stats['hits'] / total * 100, 2) if total else 0
+    return stats
+
+def _copy_rows(rows):
+    """复制缓存中的行数据，避免调用方修改缓存内容"""
+    return [dict(row) for row in rows]
+
+def _cache_fresh(key):
+    """缓存条目存在且未过期（调用方持有_cache_lock）"""
+    return key in _data_cache and time.time() - _last_cache_time.get(key, 0) < _cache_timeout
 
-def clear_cache():
-    """清除数据缓存"""
-    global _data_cache
-    _data_cache = {}
-    print("数据缓存已清除")
+def _cache_get(key):
+    """读取缓存，过期或不存在时返回None"""
+    with _cache_lock:
+        if _cache_fresh(key):
+            _data_cache.move_to_end(key)
+            _cache_stats['hits'] += 1
+            return _copy_rows(_data_cache[key])
+        _data_cache.pop(key, None)
+        _last_cache_time.pop(key, None)
+        _cache_versions.pop(key, None)
+        _cache_stats['misses'] += 1
+    return None
+
+def _cache_set(key, rows, version=None):
+    """写入缓存并返回数据副本，version为查询数据前读到的数据版本"""
+    with _cache_lock:
+        _data_cache[key] = rows
+        _data_cache.move_to_end(key)
+        _last_cache_time[key] = time.time()
+        if version is not None:
+            _cache_versions[key] = version
+        else:
+            _cache_versions.pop(key, None)
+        while len(_data_cache) > _cache_max_entries:
+            evicted, _ = _data_cache.popitem(last=False)
+            _last_cache_time.pop(evicted, None)
+            _cache_versions.pop(evicted, None)
+            _cache_stats['evictions'] += 1
+    return _copy_rows(rows)
+
+def read_data_version(key):
+    """从数据库读取某类数据当前的版本 (版本号, 变化时间)，还没有写操作时为 (0, 1970-01-01)"""
+    row = _get_db_session().query(DataVersion.version, DataVersion.updated_at).filter(
+        DataVersion.name == key
+    ).first()
+    return (row.version, row.updated_at) if row is not None else (0, _EPOCH)
+
+def loading_data_version(key):
+    """加载缓存或快照数据前读取数据版本，读取失败（如数据库中还没有data_versions表）时返回None"""
+    try:
+        return read_data_version(key)
+    except Exception as e:
+        logger.warning("读取数据版本失败: %s", e)
+        return None
+
+def get_data_version(key):
+    """获取某类数据（stations/robots/orders）的版本 (版本标识, 最后变化时间)
+
+    版本号由写操作后的clear_cache在数据库中递增。本进程的缓存未过期时使用缓存加载前读到的版本，
+    不查询数据库，版本与接口实际返回的缓存数据一致；其他进程的写操作在缓存过期后才反映到版本上。
+    其他数据快照（如内存列式订单存储）的版本一并计入版本标识，缓存或快照需要重新加载时读取数据库中的版本。
+    """
+    with _cache_lock:
+        cached = _cache_versions.get(key) if _cache_fresh(key) else None
+    versions = [cached] + [source() for source in _version_sources.get(key, ())]
+    if None in versions:
+        current = read_data_version(key)
+        versions = [current if version is None else version for version in versions]
+    modified = max(updated_at for _, updated_at in versions)
+    token = '.'.join(str(number) for number, _ in versions)
+    # 附带变化时间，版本表被重建、版本号从头计数时也不会与之前的版本标识相同
+    return f'{token}@{modified:%Y%m%d%H%M%S%f}', modified
 
 def _get_db_session():
     """获取数据库会话"""
@@ -34,6 +209,9 @@ def _to_dict(obj):
     
     result = {}
     for column in obj.__table__.columns:
+        if column.computed is not None:
+            # 数据库生成列（如active_station_id）只用于约束，不对外输出
+            continue
         value = getattr(obj, column.name)
         # 处理日期时间类型，转换为字符串
         if isinstance(value, datetime):
@@ -50,8 +228,7 @@ def get_users():
         users = session.query(User).all()
         return [_to_dict(user) for user in users]
     except Exception as e:
-        print(f"获取用户数据时出错: {str(e)}")
-        traceback.print_exc(file=sys.stdout)
+        logger.exception("获取用户数据时出错: %s", e)
         return []
 
 def get_user_by_id(user_id):
@@ -61,8 +238,7 @@ def get_user_by_id(user_id):
         user = session.query(User).filter_by(id=user_id).first()
         return _to_dict(user)
     except Exception as e:
-        print(f"根据ID获取用户时出错: {str(e)}")
-        traceback.print_exc(file=sys.stdout)
+        logger.exception("根据ID获取用户时出错: %s", e)
     return None
 
 def get_user_by_username(username):
@@ -72,8 +248,7 @@ def get_user_by_username(username):
         user = session.query(User).filter_by(username=username).first()
         return _to_dict(user)
     except Exception as e:
-        print(f"根据用户名获取用户时出错: {str(e)}")
-        traceback.print_exc(file=sys.stdout)
+        logger.exception("根据用户名获取用户时出错: %s", e)
     return None
 
 def check_password(user, password):
@@ -92,16 +267,20 @@ def check_password(user, password):
         else:
             return False
     except Exception as e:
-        print(f"密码验证错误: {str(e)}")
-        traceback.print_exc(file=sys.stdout)
+        logger.exception("密码验证错误: %s", e)
         # 开发环境下，可以临时允许任何密码
         return True
 
 # 充电站相关数据访问函数
 def get_charging_stations():
     """获取所有充电站"""
+    cached = _cache_get('stations')
+    if cached is not None:
+        return cached
+    
     try:
         session = _get_db_session()
+        version = loading_data_version('stations')
         stations = session.query(ChargingStation).all()
         result = [_to_dict(station) for station in stations]
         
@@ -110,12 +289,55 @@ def get_charging_stations():
             if 'power_output' in station:
                 station['power_rating'] = station['power_output']
         
-        return result
+        return _cache_set('stations', result, version)
     except Exception as e:
-        print(f"获取充电站数据时出错: {str(e)}")
-        traceback.print_exc(file=sys.stdout)
+        logger.exception("获取充电站数据时出错: %s", e)
         return []
 
+def invalidate_station_index():
+    """使充电站属性索引失效"""
+    global _station_index
+    with _cache_lock:
+        _station_index = None
+    if has_app_context():
+        g.pop('station_index', None)
+
+def get_station_index():
+    """获取充电站属性索引，同一请求内只构建一次，进程内按缓存过期时间复用"""
+    global _station_index, _station_index_time
+    if has_app_context() and 'station_index' in g:
+        return g.station_index
+    
+    with _cache_lock:
+        index = _station_index
+        if index is not None and time.time() - _station_index_time >= _cache_timeout:
+            index = None
+    
+    if index is None:
+        try:
+            session = _get_db_session()
+            rows = session.query(
+                ChargingStation.id,
+                ChargingStation.name,
+                ChargingStation.power_output,
+                ChargingStation.efficiency
+            ).all()
+            # 与get_charging_stations一致，功率取power_output字段
+            index = {
+                row.id: {'name': row.name, 'power': row.power_output, 'efficiency': row.efficiency}
+                for row in rows
+            }
+        except Exception as e:
+            logger.exception("构建充电站属性索引时出错: %s", e)
+            return {}
+        with _cache_lock:
+            _station_index = index
+            _station_index_time = time.time()
+    
+    if has_app_context():
+        g.station_index = index
+    return index
+
 def get_station_by_id(station_id):
     """根据ID获取充电站"""
     try:
@@ -129,8 +351,7 @@ def get_station_by_id(station_id):
         
         return result
     except Exception as e:
-        print(f"根据ID获取充电站时出错: {str(e)}")
-        traceback.print_exc(file=sys.stdout)
+        logger.exception("根据ID获取充电站时出错: %s", e)
     return None
 
 def add_charging_station(station_data):
@@ -159,13 +380,15 @@ def add_charging_station(station_data):
         # 添加到数据库
         session.add(new_station)
         session.commit()
+        invalidate_station_index()
         
         # 返回新创建的充电站
-        return _to_dict(new_station)
+        result = _to_dict(new_station)
+        _notify_changes(stations=[result])
+        return result
     except Exception as e:
         session.rollback()
-        print(f"添加充电站时出错: {str(e)}")
-        traceback.print_exc(file=sys.stdout)
+        logger.exception("添加充电站时出错: %s", e)
         return None
 
 def update_charging_station(station_id, station_data):
@@ -176,7 +399,7 @@ def update_charging_station(station_id, station_data):
         # 查找要更新的充电站
         station = session.query(ChargingStation).filter_by(id=station_id).first()
         if not station:
-            print(f"未找到ID为{station_id}的充电站")
+            logger.warning("未找到ID为%s的充电站", station_id)
             return None
         
         # 处理功率值
@@ -198,12 +421,14 @@ def update_charging_station(station_id, station_data):
         
         # 保存到数据库
         session.commit()
+        invalidate_station_index()
         
-        return _to_dict(station)
+        result = _to_dict(station)
+        _notify_changes(stations=[result])
+        return result
     except Exception as e:
         session.rollback()
-        print(f"更新充电站时出错: {str(e)}")
-        traceback.print_exc(file=sys.stdout)
+        logger.exception("更新充电站时出错: %s", e)
         return None
 
 def delete_charging_station(station_id):
@@ -214,30 +439,36 @@ def delete_charging_station(station_id):
         # 查找要删除的充电站
         station = session.query(ChargingStation).filter_by(id=station_id).first()
         if not station:
-            print(f"未找到ID为{station_id}的充电站")
+            logger.warning("未找到ID为%s的充电站", station_id)
             return False
         
-        # 删除充电站
+        # 删除充电站，同一事务中记录墓碑供增量同步使用
         session.delete(station)
+        session.add(DeletedRecord(table_name=ChargingStation.__tablename__, record_id=station_id))
         session.commit()
+        invalidate_station_index()
+        _notify_changes(deleted_stations=[station_id])
         
         return True
     except Exception as e:
         session.rollback()
-        print(f"删除充电站时出错: {str(e)}")
-        traceback.print_exc(file=sys.stdout)
+        logger.exception("删除充电站时出错: %s", e)
         return False
 
 # 机器人相关数据访问函数
 def get_robots():
     """获取所有机器人"""
+    cached = _cache_get('robots')
+    if cached is not None:
+        return cached
+    
     try:
         session = _get_db_session()
+        version = loading_data_version('robots')
         robots = session.query(Robot).all()
-        return [_to_dict(robot) for robot in robots]
+        return _cache_set('robots', [_to_dict(robot) for robot in robots], version)
     except Exception as e:
-        print(f"获取机器人数据时出错: {str(e)}")
-        traceback.print_exc(file=sys.stdout)
+        logger.exception("获取机器人数据时出错: %s", e)
         return []
 
 def get_robot_by_id(robot_id):
@@ -247,15 +478,134 @@ def get_robot_by_id(robot_id):
         robot = session.query(Robot).filter_by(id=robot_id).first()
         return _to_dict(robot)
     except Exception as e:
-        print(f"根据ID获取机器人时出错: {str(e)}")
-        traceback.print_exc(file=sys.stdout)
+        logger.exception("根据ID获取机器人时出错: %s", e)
     return None
 
+def update_robot(robot_id, robot_data):
+    """更新机器人信息"""
+    try:
+        session = _get_db_session()
+        
+        # 查找要更新的机器人
+        robot = session.query(Robot).filter_by(id=robot_id).first()
+        if not robot:
+            logger.warning("未找到ID为%s的机器人", robot_id)
+            return None
+        
+        # 更新字段
+        for key, value in robot_data.items():
+            if key != 'id' and hasattr(robot, key):  # 不允许更新ID，且属性必须存在
+                setattr(robot, key, value)
+        
+        # 保存到数据库
+        session.commit()
+        
+        result = _to_dict(robot)
+        _notify_changes(robots=[result])
+        return result
+    except Exception as e:
+        session.rollback()
+        logger.exception("更新机器人时出错: %s", e)
+        return None
+
+ROBOT_STATUSES = ('idle', 'working', 'charging', 'error')
+
+def _parse_telemetry(records):
+    """校验遥测记录，同一机器人多条记录时以最后一条为准，返回 ({robot_id: (battery_level, status)}, invalid)"""
+    telemetry = {}
+    invalid = []
+    for index, record in enumerate(records):
+        try:
+            robot_id = int(record['id'])
+            battery_level = record.get('battery_level')
+            if battery_level is not None:
+                battery_level = float(battery_level)
+                if not 0 <= battery_level <= 100:
+                    raise ValueError('battery_level 超出范围 0-100')
+            status = record.get('status')
+            if status is not None and status not in ROBOT_STATUSES:
+                raise ValueError(f'未知状态 {status}')
+            if battery_level is None and status is None:
+                raise ValueError('缺少 battery_level 和 status')
+        except (KeyError, TypeError, ValueError) as e:
+            invalid.append({'index': index, 'error': str(e)})
+            continue
+        telemetry[robot_id] = (battery_level, status)
+    return telemetry, invalid
+
+def apply_robot_telemetry(records, batch_size=1000):
+    """批量写入机器人遥测数据（电量、状态）
+
+    每批先用一次查询读取当前值，跳过没有变化的记录，
+    其余记录用一条 UPDATE ... SET battery_level = CASE id ... END 语句更新。
+    """
+    telemetry, invalid = _parse_telemetry(records)
+    summary = {'received': len(records), 'updated': 0, 'unchanged': 0, 'not_found': [], 'invalid': invalid}
+    session = _get_db_session()
+    robot_ids = list(telemetry)
+    try:
+        for i in range(0, len(robot_ids), batch_size):
+            batch = robot_ids[i:i + batch_size]
+            current = {
+                robot_id: (battery_level, status)
+                for robot_id, battery_level, status in session.query(Robot.id, Robot.battery_level, Robot.status).filter(Robot.id.in_(batch))
+            }
+            
+            battery_updates = {}
+            status_updates = {}
+            for robot_id in batch:
+                if robot_id not in current:
+                    summary['not_found'].append(robot_id)
+                    continue
+                battery_level, status = telemetry[robot_id]
+                current_battery, current_status = current[robot_id]
+                if battery_level is not None and (current_battery is None or abs(current_battery - battery_level) > 1e-6):
+                    battery_updates[robot_id] = battery_level
+                if status is not None and status != current_status:
+                    status_updates[robot_id] = status
+                if robot_id not in battery_updates and robot_id not in status_updates:
+                    summary['unchanged'] += 1
+            
+            changed = set(battery_updates) | set(status_updates)
+            if not changed:
+                continue
+            
+            values = {'updated_at': datetime.utcnow()}
+            if battery_updates:
+                values['battery_level'] = case(battery_updates, value=Robot.id, else_=Robot.battery_level)
+            if status_updates:
+                values['status'] = case(status_updates, value=Robot.id, else_=Robot.status)
+            session.query(Robot).filter(Robot.id.in_(changed)).update(values, synchronize_session=False)
+            session.commit()
+            summary['updated'] += len(changed)
+            
+            robot_changes = []
+            for robot_id in changed:
+                change = {'id': robot_id}
+                if robot_id in battery_updates:
+                    change['battery_level'] = battery_updates[robot_id]
+                if robot_id in status_updates:
+                    change['status'] = status_updates[robot_id]
+                robot_changes.append(change)
+            _notify_changes(robots=robot_changes)
+        
+        if summary['updated']:
+            clear_cache('robots')
+        return summary
+    except Exception:
+        session.rollback()
+        raise
+
 # 订单相关数据访问函数
 def get_charging_orders():
     """获取所有充电订单"""
+    cached = _cache_get('orders')
+    if cached is not None:
+        return cached
+    
     try:
         session = _get_db_session()
+        version = loading_data_version('orders')
         orders = session.query(ChargingOrder).all()
         result = [_to_dict(order) for order in orders]
         
@@ -264,12 +614,40 @@ def get_charging_orders():
             if 'charge_amount' in order:
                 order['amount'] = order['charge_amount']
         
-        return result
+        return _cache_set('orders', result, version)
     except Exception as e:
-        print(f"获取充电订单数据时出错: {str(e)}")
-        traceback.print_exc(file=sys.stdout)
+        logger.exception("获取充电订单数据时出错: %s", e)
         return []
 
+def _active_order_query(session, robot_id):
+    """查找机器人最近一条充电中订单的查询，使用idx_orders_robot_status_start索引"""
+    return session.query(ChargingOrder).filter_by(
+        robot_id=robot_id,
+        status='charging'
+    ).order_by(ChargingOrder.start_time.desc())
+
+def get_order_columns(updated_since=None):
+    """按列读取充电订单原始值（不做字符串格式化），供内存列式订单存储增量刷新使用
+
+    updated_since不为空时只返回updated_at不早于该时间的订单
+    """
+    session = _get_db_session()
+    query = session.query(
+        ChargingOrder.id,
+        ChargingOrder.robot_id,
+        ChargingOrder.station_id,
+        ChargingOrder.start_time,
+        ChargingOrder.end_time,
+        ChargingOrder.created_at,
+        ChargingOrder.updated_at,
+        ChargingOrder.status,
+        ChargingOrder.charge_amount,
+        ChargingOrder.charging_efficiency
+    )
+    if updated_since is not None:
+        query = query.filter(ChargingOrder.updated_at >= updated_since)
+    return query.order_by(ChargingOrder.id).all()
+
 def get_order_by_id(order_id):
     """根据ID获取订单"""
     try:
@@ -283,8 +661,7 @@ def get_order_by_id(order_id):
         
         return result
     except Exception as e:
-        print(f"根据ID获取订单时出错: {str(e)}")
-        traceback.print_exc(file=sys.stdout)
+        logger.exception("根据ID获取订单时出错: %s", e)
     return None
 
 # 系统告警相关数据访问函数
@@ -295,10 +672,26 @@ def get_system_alerts():
         alerts = session.query(SystemAlert).all()
         return [_to_dict(alert) for alert in alerts]
     except Exception as e:
-        print(f"获取系统告警数据时出错: {str(e)}")
-        traceback.print_exc(file=sys.stdout)
+        logger.exception("获取系统告警数据时出错: %s", e)
         return []
 
+def _alerts_page_query(session, page, per_page):
+    """按时间倒序分页查询告警，使用idx_alerts_time索引"""
+    return session.query(SystemAlert).order_by(
+        SystemAlert.time.desc()
+    ).offset(max(page - 1, 0) * per_page).limit(per_page)
+
+def get_system_alerts_page(page=1, per_page=7):
+    """分页获取系统告警，排序和分页在数据库中完成，返回(告警列表, 总数)"""
+    try:
+        session = _get_db_session()
+        total = session.query(SystemAlert).count()
+        alerts = _alerts_page_query(session, page, per_page).all()
+        return [_to_dict(alert) for alert in alerts], total
+    except Exception as e:
+        logger.exception("分页获取系统告警数据时出错: %s", e)
+        return [], 0
+
 # 充电效率记录相关数据访问函数
 def get_charging_efficiency_logs():
     """获取所有充电效率记录"""
@@ -307,8 +700,7 @@ def get_charging_efficiency_logs():
         logs = session.query(EfficiencyLog).all()
         return [_to_dict(log) for log in logs]
     except Exception as e:
-        print(f"获取充电效率记录数据时出错: {str(e)}")
-        traceback.print_exc(file=sys.stdout)
+        logger.exception("获取充电效率记录数据时出错: %s", e)
         return []
 
 # 系统设置相关数据访问函数
@@ -319,8 +711,7 @@ def get_system_settings():
         settings = session.query(SystemSetting).all()
         return [_to_dict(setting) for setting in settings]
     except Exception as e:
-        print(f"获取系统设置数据时出错: {str(e)}")
-        traceback.print_exc(file=sys.stdout)
+        logger.exception("获取系统设置数据时出错: %s", e)
         return []
 
 def get_setting_by_key(key):
@@ -330,8 +721,7 @@ def get_setting_by_key(key):
         setting = session.query(SystemSetting).filter_by(setting_key=key).first()
         return _to_dict(setting)
     except Exception as e:
-        print(f"根据键名获取系统设置时出错: {str(e)}")
-        traceback.print_exc(file=sys.stdout)
+        logger.exception("根据键名获取系统设置时出错: %s", e)
     return None
 
 # 系统日志相关数据访问函数
@@ -342,138 +732,358 @@ def get_system_logs():
         logs = session.query(SystemLog).all()
         return [_to_dict(log) for log in logs]
     except Exception as e:
-        print(f"获取系统日志数据时出错: {str(e)}")
-        traceback.print_exc(file=sys.stdout)
+        logger.exception("获取系统日志数据时出错: %s", e)
         return []
 
+def _charging_sweep_robots_query(session, threshold=20):
+    """自动充电检查涉及的机器人：低电量空闲机器人和正在充电的机器人，使用idx_robots_status_battery索引"""
+    return session.query(Robot).filter(or_(
+        and_(Robot.status == 'idle', Robot.battery_level < threshold),
+        Robot.status == 'charging'
+    ))
+
+def _idle_stations_query(session):
+    """查找空闲充电桩的查询，使用idx_stations_status索引"""
+    return session.query(ChargingStation).filter_by(status='idle')
+
+def _order_hour_slices(start_time, end_time):
+    """将充电时段按整点切分，返回 [(小时起始时间, 该小时内的秒数)]"""
+    slices = []
+    hour = start_time.replace(minute=0, second=0, microsecond=0)
+    while hour < end_time:
+        next_hour = hour + timedelta(hours=1)
+        seconds = (min(end_time, next_hour) - max(start_time, hour)).total_seconds()
+        if seconds > 0:
+            slices.append((hour, seconds))
+        hour = next_hour
+    return slices
+
+def _add_order_to_rollup(rollup, station_id, start_time, end_time, energy, efficiency):
+    """将一个已完成订单累加到 {(station_id, hour): [energy, session_count, busy_seconds, efficiency_sum, efficiency_count]}
+
+    充电量按各小时内的时长比例分摊，充电次数和效率计入开始时间所在的小时
+    """
+    start_hour = start_time.replace(minute=0, second=0, microsecond=0)
+    slices = _order_hour_slices(start_time, end_time)
+    total_seconds = sum(seconds for _, seconds in slices)
+    for hour, seconds in slices:
+        values = rollup.setdefault((station_id, hour), [0.0, 0, 0.0, 0.0, 0])
+        values[0] += (energy or 0) * seconds / total_seconds
+        values[2] += seconds
+    values = rollup.setdefault((station_id, start_hour), [0.0, 0, 0.0, 0.0, 0])
+    if not slices:
+        values[0] += energy or 0
+    values[1] += 1
+    if efficiency is not None:
+        values[3] += efficiency
+        values[4] += 1
+
+def _update_station_rollup(session, orders):
+    """订单完成时在同一事务中累加充电站小时汇总，涉及的汇总行一次查询加载"""
+    rollup = {}
+    for order in orders:
+        if order.start_time is None or order.end_time is None:
+            continue
+        _add_order_to_rollup(rollup, order.station_id, order.start_time, order.end_time,
+                             order.charge_amount, order.charging_efficiency)
+    if not rollup:
+        return
+    
+    station_ids = {station_id for station_id, _ in rollup}
+    hours = {hour for _, hour in rollup}
+    existing = {
+        (row.station_id, row.hour): row
+        for row in session.query(StationHourlyRollup).filter(
+            StationHourlyRollup.station_id.in_(station_ids),
+            StationHourlyRollup.hour.in_(hours)
+        )
+    }
+    for key, (energy, session_count, busy_seconds, efficiency_sum, efficiency_count) in rollup.items():
+        row = existing.get(key)
+        if row is None:
+            row = StationHourlyRollup(station_id=key[0], hour=key[1], energy=0.0, session_count=0,
+                                      busy_seconds=0.0, efficiency_sum=0.0, efficiency_count=0)
+            session.add(row)
+        row.energy += energy
+        row.session_count += session_count
+        row.busy_seconds += busy_seconds
+        row.efficiency_sum += efficiency_sum
+        row.efficiency_count += efficiency_count
+
+def _complete_order(order, station, end_time=None):
+    """将充电订单标记为完成并计算充电量和充电效率"""
+    order.status = 'completed'
+    order.end_time = end_time or datetime.utcnow()
+    # 计算充电量和充电效率
+    hours = (order.end_time - order.start_time).total_seconds() / 3600
+    station_power = 10  # 默认功率
+    if station:
+        station_power = station.power_output if hasattr(station, 'power_output') else station.power_rating
+    
+    order.charge_amount = station_power * hours * 0.9  # 假设90%的效率
+    order.charging_efficiency = 90  # 默认效率
+
+def _complete_active_order(session, robot, station):
+    """将机器人未完成的充电订单标记为完成，计算充电量并更新小时汇总，返回订单（没有时返回None）"""
+    order = _active_order_query(session, robot.id).first()
+    if not order:
+        return None
+    
+    _complete_order(order, station)
+    _update_station_rollup(session, [order])
+    return order
+
+def rebuild_station_rollup(batch_size=5000):
+    """根据历史已完成订单重建充电站小时汇总表，返回 (处理订单数, 汇总行数)"""
+    session = _get_db_session()
+    try:
+        station_index = get_station_index()
+        rollup = {}
+        processed = 0
+        query = session.query(
+            ChargingOrder.station_id,
+            ChargingOrder.start_time,
+            ChargingOrder.end_time,
+            ChargingOrder.charge_amount,
+            ChargingOrder.charging_efficiency
+        ).filter(
+            ChargingOrder.status == 'completed',
+            ChargingOrder.start_time.isnot(None),
+            ChargingOrder.end_time.isnot(None)
+        ).order_by(ChargingOrder.id).yield_per(batch_size)
+        
+        for station_id, start_time, end_time, charge_amount, efficiency in query:
+            if efficiency is None and charge_amount:
+                # 与能效分析一致：没有效率字段时按充电量、时长和功率计算
+                hours = (end_time - start_time).total_seconds() / 3600
+                station = station_index.get(station_id)
+                power = 10 if station is None else station['power']
+                if hours > 0 and power:
+                    efficiency = charge_amount / hours / power * 100
+            _add_order_to_rollup(rollup, station_id, start_time, end_time, charge_amount, efficiency)
+            processed += 1
+        
+        now = datetime.utcnow()
+        session.query(StationHourlyRollup).delete(synchronize_session=False)
+        mappings = [
+            {
+                'station_id': station_id,
+                'hour': hour,
+                'energy': values[0],
+                'session_count': values[1],
+                'busy_seconds': values[2],
+                'efficiency_sum': values[3],
+                'efficiency_count': values[4],
+                'updated_at': now
+            }
+            for (station_id, hour), values in rollup.items()
+        ]
+        for i in range(0, len(mappings), batch_size):
+            session.bulk_insert_mappings(StationHourlyRollup, mappings[i:i + batch_size])
+        session.commit()
+        return processed, len(mappings)
+    except Exception:
+        session.rollback()
+        raise
+
+def get_station_rollup(start=None, end=None, station_ids=None):
+    """按小时范围和充电站读取小时汇总数据"""
+    try:
+        session = _get_db_session()
+        query = session.query(StationHourlyRollup)
+        if start is not None:
+            query = query.filter(StationHourlyRollup.hour >= start.replace(minute=0, second=0, microsecond=0))
+        if end is not None:
+            query = query.filter(StationHourlyRollup.hour <= end)
+        if station_ids:
+            query = query.filter(StationHourlyRollup.station_id.in_(station_ids))
+        return [_to_dict(row) for row in query.order_by(StationHourlyRollup.hour).all()]
+    except Exception as e:
+        logger.exception("查询充电站小时汇总数据时出错: %s", e)
+        return []
+
+def _schedule_low_battery_robots(candidates, idle_stations):
+    """按电量从低到高为低电量机器人匹配空闲充电桩
+
+    candidates为 (id, name, battery_level, station_id) 列表，idle_stations为 (id, name) 列表。
+    已分配充电桩的机器人只在其充电桩空闲时开始充电；未分配的机器人依次获得剩余空闲充电桩，
+    优先使用没有被其他低电量机器人预先分配的充电桩。返回 [(机器人, 充电桩或None, action)]。
+    """
+    idle_by_id = {station[0]: station for station in idle_stations}
+    reserved = {robot[3] for robot in candidates if robot[3]}
+    free = deque(sorted((station for station in idle_stations if station[0] not in reserved), key=lambda s: s[0]))
+    spare = deque(sorted((station for station in idle_stations if station[0] in reserved), key=lambda s: s[0]))
+    
+    # 优先队列：电量最低的机器人最先分配
+    queue = [(robot[2], robot[0], robot) for robot in candidates]
+    heapq.heapify(queue)
+    
+    plan = []
+    while queue:
+        _, _, robot = heapq.heappop(queue)
+        if robot[3]:
+            # 已分配充电桩：充电桩仍空闲时直接开始充电
+            station = idle_by_id.pop(robot[3], None)
+            if station:
+                plan.append((robot, station, 'start_charging'))
+            continue
+        
+        station = None
+        while (free or spare) and station is None:
+            candidate = free.popleft() if free else spare.popleft()
+            station = idle_by_id.pop(candidate[0], None)
+        plan.append((robot, station, 'assign_and_start_charging' if station else 'no_idle_station'))
+    return plan
+
 # 新增：检查低电量机器人并自动充电
 def check_low_battery_robots():
-    """检查低电量机器人并自动安排充电"""
+    """检查低电量机器人并自动安排充电
+
+    候选机器人和空闲充电桩各一次查询加载，在内存中按电量优先级匹配，
+    分配结果和充电订单在同一事务中批量写入。
+    """
     try:
         session = _get_db_session()
+        begin_write(session)
+        now = datetime.utcnow()
+        results = []
         
-        # 查找电量低于20%的空闲机器人
-        low_battery_robots = session.query(Robot).filter(
-            Robot.battery_level < 20,
-            Robot.status == 'idle'
-        ).all()
+        # 先一次锁定本次检查涉及的全部机器人（电量低于20%的空闲机器人和正在充电的机器人），再锁定空闲充电桩。
+        # 与分配接口先机器人后充电桩的加锁顺序一致，锁定充电桩后不再锁定机器人，避免死锁
+        robots = _charging_sweep_robots_query(session).with_entities(
+            Robot.id, Robot.name, Robot.battery_level, Robot.station_id, Robot.status
+        ).with_for_update().all()
+        candidates = [robot[:4] for robot in robots if robot[4] == 'idle']
+        idle_stations = _idle_stations_query(session).with_entities(
+            ChargingStation.id, ChargingStation.name
+        ).with_for_update().all() if candidates else []
         
-        results = []
+        # 排除仍有进行中充电订单的充电桩，避免违反uq_orders_active_station
+        if idle_stations:
+            busy_station_ids = {
+                station_id for station_id, in session.query(ChargingOrder.station_id).filter(
+                    ChargingOrder.status == 'charging',
+                    ChargingOrder.station_id.in_([station[0] for station in idle_stations])
+                )
+            }
+            idle_stations = [station for station in idle_stations if station[0] not in busy_station_ids]
         
-        for robot in low_battery_robots:
-            # 如果机器人已经分配了充电桩
-            if robot.station_id:
-                station = session.query(ChargingStation).filter_by(id=robot.station_id).first()
-                
-                # 如果充电桩存在且空闲
-                if station and station.status == 'idle':
-                    # 开始充电
-                    robot.status = 'charging'
-                    station.status = 'charging'
-                    
-                    # 创建充电订单
-                    now = datetime.utcnow()
-                    order = ChargingOrder(
-                        robot_id=robot.id,
-                        station_id=station.id,
-                        start_time=now,
-                        status='charging'
-                    )
-                    
-                    session.add(order)
-                    results.append({
-                        'robot_id': robot.id,
-                        'robot_name': robot.name,
-                        'station_id': station.id,
-                        'station_name': station.name,
-                        'action': 'start_charging',
-                        'message': f"机器人 {robot.name} 开始在充电桩 {station.name} 充电"
-                    })
+        robot_updates = []
+        new_orders = []
+        charging_station_ids = []
+        for robot, station, action in _schedule_low_battery_robots(candidates, idle_stations):
+            robot_id, robot_name = robot[0], robot[1]
+            if station is None:
+                results.append({
+                    'robot_id': robot_id,
+                    'robot_name': robot_name,
+                    'action': 'no_idle_station',
+                    'message': f"机器人 {robot_name} 电量低但没有空闲充电桩"
+                })
+                continue
+            
+            station_id, station_name = station[0], station[1]
+            robot_updates.append({'id': robot_id, 'station_id': station_id, 'status': 'charging', 'updated_at': now})
+            charging_station_ids.append(station_id)
+            new_orders.append({
+                'robot_id': robot_id,
+                'station_id': station_id,
+                'start_time': now,
+                'status': 'charging',
+                'created_at': now,
+                'updated_at': now
+            })
+            if action == 'start_charging':
+                message = f"机器人 {robot_name} 开始在充电桩 {station_name} 充电"
             else:
-                # 查找空闲的充电桩
-                idle_station = session.query(ChargingStation).filter_by(status='idle').first()
-                
-                if idle_station:
-                    # 分配充电桩并开始充电
-                    robot.station_id = idle_station.id
-                    robot.status = 'charging'
-                    idle_station.status = 'charging'
-                    
-                    # 创建充电订单
-                    now = datetime.utcnow()
-                    order = ChargingOrder(
-                        robot_id=robot.id,
-                        station_id=idle_station.id,
-                        start_time=now,
-                        status='charging'
-                    )
-                    
-                    session.add(order)
-                    results.append({
-                        'robot_id': robot.id,
-                        'robot_name': robot.name,
-                        'station_id': idle_station.id,
-                        'station_name': idle_station.name,
-                        'action': 'assign_and_start_charging',
-                        'message': f"机器人 {robot.name} 被分配到充电桩 {idle_station.name} 并开始充电"
-                    })
-                else:
-                    results.append({
-                        'robot_id': robot.id,
-                        'robot_name': robot.name,
-                        'action': 'no_idle_station',
-                        'message': f"机器人 {robot.name} 电量低但没有空闲充电桩"
-                    })
-        
-        # 检查正在充电且电量已满的机器人，自动完成充电
-        charging_robots = session.query(Robot).filter_by(status='charging').all()
-        for robot in charging_robots:
+                message = f"机器人 {robot_name} 被分配到充电桩 {station_name} 并开始充电"
+            results.append({
+                'robot_id': robot_id,
+                'robot_name': robot_name,
+                'station_id': station_id,
+                'station_name': station_name,
+                'action': action,
+                'message': message
+            })
+        
+        # 批量写入分配结果和充电订单
+        if robot_updates:
+            session.bulk_update_mappings(Robot, robot_updates)
+            session.query(ChargingStation).filter(ChargingStation.id.in_(charging_station_ids)).update(
+                {'status': 'charging', 'updated_at': now}, synchronize_session=False
+            )
+            session.bulk_insert_mappings(ChargingOrder, new_orders)
+        
+        # 检查正在充电（包括本次刚开始充电）且电量已满的机器人，自动完成充电
+        assigned = {update['id']: update['station_id'] for update in robot_updates}
+        charging_robots = [
+            (robot[0], robot[1], robot[2], assigned.get(robot[0], robot[3]))
+            for robot in robots if robot[4] == 'charging' or robot[0] in assigned
+        ]
+        
+        battery_updates = []
+        completed = []
+        for robot_id, robot_name, battery_level, station_id in charging_robots:
             # 模拟充电进度，实际应用中可能需要更复杂的逻辑
             # 这里简单地随机增加电量，如果超过95%就认为充满了
-            robot.battery_level += random.uniform(5, 15)  # 每次检查增加5-15%的电量
+            battery_level = (battery_level or 0) + random.uniform(5, 15)  # 每次检查增加5-15%的电量
             
-            if robot.battery_level >= 100:
-                robot.battery_level = 100
-                robot.status = 'idle'
-                robot.last_charging = datetime.utcnow()
-                
-                # 找到对应的充电桩并释放
-                if robot.station_id:
-                    station = session.query(ChargingStation).filter_by(id=robot.station_id).first()
-                    if station:
-                        station.status = 'idle'
-                
-                # 找到未完成的充电订单并标记为完成
-                order = session.query(ChargingOrder).filter_by(
-                    robot_id=robot.id,
-                    status='charging'
-                ).order_by(ChargingOrder.start_time.desc()).first()
-                
-                if order:
-                    order.status = 'completed'
-                    order.end_time = datetime.utcnow()
-                    # 计算充电量和充电效率
-                    hours = (order.end_time - order.start_time).total_seconds() / 3600
-                    station_power = 10  # 默认功率
-                    if station:
-                        station_power = station.power_output if hasattr(station, 'power_output') else station.power_rating
-                    
-                    order.charge_amount = station_power * hours * 0.9  # 假设90%的效率
-                    order.charging_efficiency = 90  # 默认效率
-                
+            if battery_level >= 100:
+                battery_updates.append({'id': robot_id, 'battery_level': 100, 'status': 'idle', 'last_charging': now, 'updated_at': now})
+                completed.append((robot_id, station_id))
                 results.append({
-                    'robot_id': robot.id,
-                    'robot_name': robot.name,
+                    'robot_id': robot_id,
+                    'robot_name': robot_name,
                     'action': 'charging_completed',
-                    'message': f"机器人 {robot.name} 充电完成，电量已满"
+                    'message': f"机器人 {robot_name} 充电完成，电量已满"
                 })
+            else:
+                battery_updates.append({'id': robot_id, 'battery_level': battery_level, 'updated_at': now})
+        
+        if battery_updates:
+            session.bulk_update_mappings(Robot, battery_updates)
+        
+        if completed:
+            # 释放充电桩，并将未完成的充电订单标记为完成（每个机器人取最近一条）
+            completed_robot_ids = [robot_id for robot_id, _ in completed]
+            station_ids = {station_id for _, station_id in completed if station_id}
+            stations = {
+                station.id: station
+                for station in session.query(ChargingStation).filter(ChargingStation.id.in_(station_ids))
+            } if station_ids else {}
+            for station in stations.values():
+                station.status = 'idle'
+            
+            active_orders = {}
+            for order in session.query(ChargingOrder).filter(
+                ChargingOrder.robot_id.in_(completed_robot_ids),
+                ChargingOrder.status == 'charging'
+            ).order_by(ChargingOrder.start_time.desc()):
+                active_orders.setdefault(order.robot_id, order)
+            
+            for robot_id, station_id in completed:
+                order = active_orders.get(robot_id)
+                if order:
+                    _complete_order(order, stations.get(station_id), now)
+            _update_station_rollup(session, active_orders.values())
         
         session.commit()
+        
+        # 只有本次变化的字段推送给订阅者
+        robot_changes = {update['id']: {'id': update['id'], 'station_id': update['station_id'], 'status': 'charging'}
+                         for update in robot_updates}
+        for update in battery_updates:
+            change = robot_changes.setdefault(update['id'], {'id': update['id']})
+            change['battery_level'] = update['battery_level']
+            if 'status' in update:
+                change['status'] = update['status']
+        station_changes = [{'id': station_id, 'status': 'charging'} for station_id in charging_station_ids]
+        station_changes += [{'id': station_id, 'status': 'idle'} for station_id in stations] if completed else []
+        _notify_changes(robots=robot_changes.values(), stations=station_changes, new_orders=len(new_orders))
         return results
     except Exception as e:
         session.rollback()
-        print(f"检查低电量机器人时出错: {str(e)}")
-        traceback.print_exc(file=sys.stdout)
+        logger.exception("检查低电量机器人时出错: %s", e)
         return []
 
 # 新增：将机器人分配到充电桩
@@ -481,52 +1091,60 @@ def assign_robot_to_station(robot_id, station_id):
     """将机器人分配到充电桩"""
     try:
         session = _get_db_session()
+        begin_write(session)
         
-        print(f"开始分配机器人 {robot_id} 到充电桩 {station_id}")
+        logger.debug("开始分配机器人 %s 到充电桩 %s", robot_id, station_id)
         
-        # 获取机器人和充电桩
-        robot = session.query(Robot).filter_by(id=robot_id).first()
-        station = session.query(ChargingStation).filter_by(id=station_id).first()
+        # 获取并锁定机器人和充电桩（SELECT ... FOR UPDATE），加锁顺序固定为先机器人后充电桩，
+        # 多个worker同时分配同一充电桩时后到的请求会等待前一个事务提交后再检查状态
+        robot = session.query(Robot).filter_by(id=robot_id).with_for_update().first()
+        station = session.query(ChargingStation).filter_by(id=station_id).with_for_update().first()
         
         # 验证机器人和充电桩是否存在
         if not robot:
-            print(f"错误：机器人ID {robot_id} 不存在")
+            logger.warning("错误：机器人ID %s 不存在", robot_id)
             return False, f"机器人ID {robot_id} 不存在"
         
         if not station:
-            print(f"错误：充电桩ID {station_id} 不存在")
+            logger.warning("错误：充电桩ID %s 不存在", station_id)
             return False, f"充电桩ID {station_id} 不存在"
         
-        print(f"找到机器人：{robot.name}，状态：{robot.status}")
-        print(f"找到充电桩：{station.name}，状态：{station.status}")
+        logger.debug("找到机器人：%s，状态：%s", robot.name, robot.status)
+        logger.debug("找到充电桩：%s，状态：%s", station.name, station.status)
         
         # 验证充电桩是否空闲
         if station.status != 'idle':
-            print(f"错误：充电桩 {station.name} 不是空闲状态，当前状态: {station.status}")
+            logger.warning("错误：充电桩 %s 不是空闲状态，当前状态: %s", station.name, station.status)
             return False, f"充电桩 {station.name} 不是空闲状态，当前状态: {station.status}"
         
         # 检查是否有其他机器人正在使用该充电桩
         other_robot = session.query(Robot).filter(Robot.station_id == station_id, Robot.id != robot_id).first()
         if other_robot:
-            print(f"错误：充电桩 {station.name} 已被机器人 {other_robot.name} 占用")
+            logger.warning("错误：充电桩 %s 已被机器人 %s 占用", station.name, other_robot.name)
             return False, f"充电桩 {station.name} 已被机器人 {other_robot.name} 占用"
         
         # 如果机器人之前分配了其他充电桩，先解除关联
+        station_changes = [{'id': station_id, 'status': 'charging'}]
         if robot.station_id and robot.station_id != station_id:
-            print(f"机器人 {robot.name} 之前分配了充电桩ID {robot.station_id}，现在解除关联")
-            old_station = session.query(ChargingStation).filter_by(id=robot.station_id).first()
+            logger.debug("机器人 %s 之前分配了充电桩ID %s，现在解除关联", robot.name, robot.station_id)
+            old_station = session.query(ChargingStation).filter_by(id=robot.station_id).with_for_update().first()
             if old_station:
-                print(f"找到旧充电桩：{old_station.name}，状态：{old_station.status}")
+                logger.debug("找到旧充电桩：%s，状态：%s", old_station.name, old_station.status)
                 if old_station.status == 'charging':
                     old_station.status = 'idle'
-                    print(f"将旧充电桩 {old_station.name} 状态设置为空闲")
+                    station_changes.append({'id': old_station.id, 'status': 'idle'})
+                    logger.debug("将旧充电桩 %s 状态设置为空闲", old_station.name)
+            
+            # 结束在旧充电桩上未完成的充电订单
+            if _complete_active_order(session, robot, old_station):
+                logger.debug("已结束机器人 %s 在旧充电桩上的充电订单", robot.name)
         
         # 更新机器人的充电桩ID和状态
         robot.station_id = station_id
         robot.status = 'charging'  # 始终将状态设为充电中
         station.status = 'charging'  # 更新充电桩状态为充电中
         
-        print(f"已更新机器人 {robot.name} 状态为充电中，关联到充电桩 {station.name}")
+        logger.debug("已更新机器人 %s 状态为充电中，关联到充电桩 %s", robot.name, station.name)
         
         # 创建充电订单
         now = datetime.utcnow()
@@ -537,16 +1155,22 @@ def assign_robot_to_station(robot_id, station_id):
             status='charging'
         )
         session.add(order)
-        print(f"已创建充电订单，订单ID: {order.id if hasattr(order, 'id') else '未知'}")
+        logger.debug("已创建充电订单，订单ID: %s", order.id if hasattr(order, 'id') else '未知')
         
         session.commit()
-        print(f"成功提交事务，机器人 {robot.name} 已分配到充电桩 {station.name}")
+        logger.info("成功提交事务，机器人 %s 已分配到充电桩 %s", robot.name, station.name)
+        _notify_changes(robots=[{'id': robot_id, 'station_id': station_id, 'status': 'charging'}],
+                        stations=station_changes, new_orders=1)
         return True, f"机器人 {robot.name} 已分配到充电桩 {station.name} 并开始充电"
-            
+    
+    except IntegrityError as e:
+        # uq_orders_active_station：该充电桩已有进行中的充电订单
+        session.rollback()
+        logger.warning("分配机器人到充电桩冲突: %s", e)
+        return False, f"充电桩ID {station_id} 已有进行中的充电订单"
     except Exception as e:
         session.rollback()
-        print(f"分配机器人到充电桩出错: {str(e)}")
-        traceback.print_exc(file=sys.stdout)
+        logger.exception("分配机器人到充电桩出错: %s", e)
         return False, f"服务器错误: {str(e)}"
 
 # 新增：解除机器人与充电桩的关联
@@ -554,9 +1178,10 @@ def release_robot_from_station(robot_id):
     """解除机器人与充电桩的关联"""
     try:
         session = _get_db_session()
+        begin_write(session)
         
-        # 获取机器人
-        robot = session.query(Robot).filter_by(id=robot_id).first()
+        # 获取并锁定机器人
+        robot = session.query(Robot).filter_by(id=robot_id).with_for_update().first()
         
         # 验证机器人是否存在
         if not robot:
@@ -566,8 +1191,8 @@ def release_robot_from_station(robot_id):
         if not robot.station_id:
             return False, f"机器人 {robot.name} 未关联任何充电桩"
         
-        # 获取关联的充电桩
-        station = session.query(ChargingStation).filter_by(id=robot.station_id).first()
+        # 获取并锁定关联的充电桩
+        station = session.query(ChargingStation).filter_by(id=robot.station_id).with_for_update().first()
         
         # 解除关联
         old_station_id = robot.station_id
@@ -581,42 +1206,93 @@ def release_robot_from_station(robot_id):
             station.status = 'idle'
         
         # 查找未完成的充电订单并标记为完成
-        order = session.query(ChargingOrder).filter_by(
-            robot_id=robot.id,
-            status='charging'
-        ).order_by(ChargingOrder.start_time.desc()).first()
-        
-        if order:
-            order.status = 'completed'
-            order.end_time = datetime.utcnow()
-            # 计算充电量和充电效率
-            hours = (order.end_time - order.start_time).total_seconds() / 3600
-            station_power = 10  # 默认功率
-            if station:
-                station_power = station.power_output if hasattr(station, 'power_output') else station.power_rating
-            
-            order.charge_amount = station_power * hours * 0.9  # 假设90%的效率
-            order.charging_efficiency = 90  # 默认效率
+        _complete_active_order(session, robot, station)
         
         # 更新机器人的最后充电时间
         robot.last_charging = datetime.utcnow()
         
         session.commit()
+        _notify_changes(robots=[{'id': robot_id, 'station_id': None, 'status': 'idle'}],
+                        stations=[{'id': station.id, 'status': 'idle'}] if station else [])
         return True, f"机器人 {robot.name} 已与充电桩 {old_station_name} 解除关联"
             
     except Exception as e:
         session.rollback()
-        print(f"解除机器人与充电桩关联时出错: {str(e)}")
-        traceback.print_exc(file=sys.stdout)
+        logger.exception("解除机器人与充电桩关联时出错: %s", e)
         return False, f"服务器错误: {str(e)}"
 
+# 增量同步相关数据访问函数
+_SYNC_MODELS = {'stations': ChargingStation, 'robots': Robot, 'orders': ChargingOrder}
+
+def encode_sync_cursor(cursor):
+    """将游标 (updated_at, id) 编码为字符串"""
+    updated_at, record_id = cursor
+    return f"{updated_at.strftime('%Y%m%d%H%M%S%f')}-{record_id}"
+
+def decode_sync_cursor(value):
+    """解析游标字符串，空字符串或0表示从头全量同步（返回None），格式错误时抛出ValueError"""
+    if value in ('', '0'):
+        return None
+    updated_at, _, record_id = value.partition('-')
+    return datetime.strptime(updated_at, '%Y%m%d%H%M%S%f'), int(record_id)
+
+def _changed_rows_query(session, model, since, after_id=0):
+    """updated_at在游标之后的行，按 (updated_at, id) 排序，使用idx_*_updated_at"""
+    return session.query(model).filter(
+        model.updated_at >= since,
+        or_(model.updated_at > since, model.id > after_id)
+    ).order_by(model.updated_at, model.id)
+
+def _sync_row(kind, obj):
+    row = _to_dict(obj)
+    # 字段名称与列表接口（get_charging_stations / get_charging_orders）一致
+    if kind == 'stations':
+        row['power_rating'] = row['power_output']
+    elif kind == 'orders':
+        row['amount'] = row['charge_amount']
+    return row
+
+def get_changes(kind, cursor=None, limit=1000, lag_seconds=5):
+    """增量同步：获取游标之后变化的行和被删除的ID
+
+    kind为stations/robots/orders；cursor为None时返回全部行。
+    返回 {'rows', 'deleted', 'cursor', 'has_more'}，has_more为True时应立即用新游标继续读取。
+    updated_at由各事务在提交前设置，提交较晚的事务可能写入比已返回的行更早的时间，
+    因此没有更多数据时游标最多推进到lag_seconds之前，最近的变化在下次同步时会重复返回，客户端按ID覆盖即可。
+    """
+    model = _SYNC_MODELS[kind]
+    session = _get_db_session()
+    settled = (datetime.utcnow() - timedelta(seconds=lag_seconds), 0)
+    
+    if cursor is None:
+        rows = session.query(model).order_by(model.id).all()
+        return {'rows': [_sync_row(kind, row) for row in rows], 'deleted': [], 'cursor': settled, 'has_more': False}
+    
+    since, after_id = cursor
+    rows = _changed_rows_query(session, model, since, after_id).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if has_more:
+        next_cursor = (rows[-1].updated_at, rows[-1].id)
+    else:
+        last = (rows[-1].updated_at, rows[-1].id) if rows else cursor
+        next_cursor = max(cursor, min(last, settled))
+    
+    deleted = sorted({
+        record_id for record_id, in session.query(DeletedRecord.record_id).filter(
+            DeletedRecord.table_name == model.__tablename__,
+            DeletedRecord.deleted_at >= since
+        )
+    })
+    return {'rows': [_sync_row(kind, row) for row in rows], 'deleted': deleted, 'cursor': next_cursor, 'has_more': has_more}
+
 # 初始化时打印连接信息
 def print_connection_info():
     """打印数据库连接信息"""
     try:
-        print("数据访问模块已初始化，使用MySQL数据库连接")
-        print(f"数据库URI: {current_app.config['SQLALCHEMY_DATABASE_URI'] if current_app else '未设置'}")
+        logger.info('数据访问模块已初始化，使用%s数据库连接', db.engine.dialect.name)
+        logger.info("数据库URI: %s", display_uri(current_app.config['SQLALCHEMY_DATABASE_URI']) if current_app else '未设置')
     except Exception as e:
-        print(f"打印数据库连接信息时出错: {e}")
+        logger.error("打印数据库连接信息时出错: %s", e)
 
-print("数据访问模块已加载，使用MySQL数据库连接") 
\ No newline at end of file
+logger.debug('数据访问模块已加载')
\ No newline at end of file
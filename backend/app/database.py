@@ -0,0 +1,145 @@
+import functools
+import os
+
+from flask import g, has_app_context
+from flask_sqlalchemy import SQLAlchemy, SignallingSession, get_state
+from sqlalchemy import event, orm
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+# 数据库引擎与会话：连接池参数由配置（环境变量）决定，按数据库类型分别应用；
+# 配置了只读副本（SQLALCHEMY_BINDS['replica']）时，标记为只读的请求中的查询路由到副本，写操作始终在主库。
+# SQLite（单文件嵌入式部署）的连接在建立时设置WAL日志模式和缓存等PRAGMA
+
+REPLICA_BIND = 'replica'
+
+def _is_sqlite_memory(sa_url):
+    return sa_url.database in (None, '', ':memory:')
+
+def engine_options(config, sa_url):
+    """根据配置生成某个数据库URL的引擎参数"""
+    options = {'pool_pre_ping': config.get('DB_POOL_PRE_PING', True)}
+    pool = {
+        'pool_size': config.get('DB_POOL_SIZE', 10),
+        'max_overflow': config.get('DB_MAX_OVERFLOW', 20),
+        'pool_timeout': config.get('DB_POOL_TIMEOUT', 30),
+    }
+    if sa_url.drivername.startswith('sqlite'):
+        if _is_sqlite_memory(sa_url):
+            # 内存数据库由Flask-SQLAlchemy使用StaticPool共享唯一的连接
+            return options
+        # pysqlite默认对文件数据库使用NullPool，每次取连接都要重新打开文件并设置PRAGMA，这里改为连接池；
+        # 连接池保证同一连接同时只被一个线程使用，可以关闭check_same_thread
+        options.update(pool, poolclass=QueuePool, connect_args={'check_same_thread': False})
+        return options
+
+    options.update(pool, pool_recycle=config.get('DB_POOL_RECYCLE', 1800))
+    timeout_ms = config.get('DB_STATEMENT_TIMEOUT_MS', 0)
+    if timeout_ms and sa_url.drivername.startswith('mysql'):
+        # MAX_EXECUTION_TIME只限制SELECT，写事务不会被中断
+        options['connect_args'] = {'init_command': f'SET SESSION MAX_EXECUTION_TIME={int(timeout_ms)}'}
+    return options
+
+def sqlite_pragmas(config, sa_url):
+    """SQLite连接建立时执行的PRAGMA列表 [(名称, 值)]"""
+    pragmas = []
+    if not _is_sqlite_memory(sa_url):
+        # WAL模式下读不阻塞写、写不阻塞读，能效分析查询不会被调度写事务挡住
+        pragmas.append(('journal_mode', config.get('SQLITE_JOURNAL_MODE', 'WAL')))
+    pragmas += [
+        # WAL模式下NORMAL只在检查点时同步磁盘，断电最多丢失最近的事务，不会损坏数据库
+        ('synchronous', config.get('SQLITE_SYNCHRONOUS', 'NORMAL')),
+        # 负数表示以KiB为单位的页缓存大小
+        ('cache_size', -int(config.get('SQLITE_CACHE_SIZE_KB', 65536))),
+        ('busy_timeout', int(config.get('SQLITE_BUSY_TIMEOUT_MS', 5000))),
+        ('temp_store', 'MEMORY'),
+    ]
+    return pragmas
+
+def _apply_pragmas(pragmas, dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas:
+            cursor.execute(f'PRAGMA {name}={value}')
+    finally:
+        cursor.close()
+
+def display_uri(uri):
+    """用于日志输出的数据库URI，隐藏密码"""
+    if not uri:
+        return uri
+    return make_url(uri).render_as_string(hide_password=True)
+
+def prepare_sqlite_file(app):
+    """SQLite文件数据库所在目录不存在时先创建，返回数据库文件路径（非SQLite文件数据库返回None）"""
+    sa_url = make_url(app.config['SQLALCHEMY_DATABASE_URI'])
+    if not sa_url.drivername.startswith('sqlite') or _is_sqlite_memory(sa_url):
+        return None
+    # 与Flask-SQLAlchemy一致，相对路径基于app目录
+    path = os.path.join(app.root_path, sa_url.database)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+def begin_write(session):
+    """开始需要加锁的读-改-写事务
+
+    MySQL依靠随后的SELECT ... FOR UPDATE行锁；SQLite会忽略FOR UPDATE，
+    这里用BEGIN IMMEDIATE提前获取数据库写锁，并发的检查和写入按顺序执行，
+    其他写事务最多等待busy_timeout。
+    """
+    conn = session.connection()
+    if conn.dialect.name == 'sqlite' and not conn.connection.in_transaction:
+        conn.exec_driver_sql('BEGIN IMMEDIATE')
+
+def use_read_replica():
+    """将当前请求标记为只读，之后的查询在配置了副本时路由到副本（可用作before_request钩子）"""
+    g._use_read_replica = True
+
+def read_replica(view):
+    """只读接口的装饰器，见use_read_replica"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        use_read_replica()
+        return view(*args, **kwargs)
+    return wrapper
+
+class RoutingSession(SignallingSession):
+    """只读请求中的查询使用副本引擎，flush（写操作）以及未配置副本时使用主库"""
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (not self._flushing and has_app_context() and g.get('_use_read_replica')
+                and REPLICA_BIND in (self.app.config.get('SQLALCHEMY_BINDS') or {})):
+            return get_state(self.app).db.get_engine(self.app, bind=REPLICA_BIND)
+        return super().get_bind(mapper, clause)
+
+class RoutingSQLAlchemy(SQLAlchemy):
+    """使用RoutingSession，并按数据库类型应用配置的连接池参数和SQLite PRAGMA"""
+
+    def create_session(self, options):
+        return orm.sessionmaker(class_=RoutingSession, db=self, **options)
+
+    def apply_driver_hacks(self, app, sa_url, options):
+        sa_url, options = super().apply_driver_hacks(app, sa_url, options)
+        options.update(engine_options(app.config, sa_url))
+        return sa_url, options
+
+    def create_engine(self, sa_url, engine_opts):
+        engine = super().create_engine(sa_url, engine_opts)
+        if engine.dialect.name == 'sqlite':
+            pragmas = sqlite_pragmas(self.get_app().config, sa_url)
+            event.listen(engine, 'connect', functools.partial(_apply_pragmas, pragmas))
+        return engine
+
+    def get_pool_stats(self, app=None):
+        """获取主库和各bind的连接池使用情况 {bind: {'size', 'checked_out', 'overflow'}}"""
+        app = self.get_app(app)
+        stats = {}
+        for bind in [None] + list(app.config.get('SQLALCHEMY_BINDS') or ()):
+            pool = self.get_engine(app, bind=bind).pool
+            if isinstance(pool, QueuePool):
+                stats[bind or 'primary'] = {
+                    'size': pool.size(),
+                    'checked_out': pool.checkedout(),
+                    'overflow': max(pool.overflow(), 0)
+                }
+        return stats
@@ -0,0 +1,245 @@
+import itertools
+import json
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+
+from . import data_access
+
+# 实时推送（Server-Sent Events）：data_access的写操作提交后通知变化的行，
+# 这里维护机器人和充电桩的最新状态以及仪表盘计数，每次提交只按变化的行计算计数增量，
+# 生成一条change事件放入环形缓冲区；各SSE连接从缓冲区读取自己尚未发送的事件。
+# 状态保存在进程内，只包含本进程的写操作：多进程部署时其他进程（包括自动充电任务所在进程）的写操作
+# 不会推送，计数也会与数据库不一致，客户端应按delta更新并定期用条件请求读取仪表盘接口校正。
+# 每个连接在整个连接期间占用一个请求线程；gunicorn同步worker下一个连接会独占一个worker，
+# 需要使用多线程（--threads）或gevent worker，并让SSE_MAX_CLIENTS小于可用线程数。
+
+logger = logging.getLogger(__name__)
+
+_BUFFER_SIZE = 1000   # 缓冲区保留的事件数，断线重连时可从中补发
+_ROBOT_FIELDS = ('status', 'battery_level', 'station_id')
+_STATION_FIELDS = ('status', 'name', 'location', 'power_rating', 'efficiency')
+
+_cond = threading.Condition()
+_buffer = deque(maxlen=_BUFFER_SIZE)  # (序号, 事件名, JSON数据)
+_seq = 0
+_robots = None     # {robot_id: {字段: 值}}，None表示尚未有订阅者，不跟踪变更
+_stations = None   # {station_id: {字段: 值}}
+_counters = None
+_today = None
+_clients = 0
+_stats = {'events': 0, 'connections': 0, 'rejected': 0}
+
+COUNTER_KEYS = ('stationCount', 'onlineStations', 'offlineStations', 'robotCount', 'chargingRobots',
+                'waitingRobots', 'errorStations', 'errorRobots', 'todayOrders')
+
+def _station_counts(station):
+    online = station.get('status') in ('idle', 'charging')
+    return {
+        'stationCount': 1,
+        'onlineStations': int(online),
+        'offlineStations': int(not online),
+        'errorStations': int(station.get('status') == 'error')
+    }
+
+def _robot_counts(robot):
+    charging = robot.get('status') == 'charging'
+    battery_level = robot.get('battery_level')
+    return {
+        'robotCount': 1,
+        'chargingRobots': int(charging),
+        'waitingRobots': int((battery_level if battery_level is not None else 100) < 30 and not charging),
+        'errorRobots': int(robot.get('status') == 'error')
+    }
+
+def dashboard_counters(stations, robots):
+    """按仪表盘口径统计充电桩和机器人数量"""
+    counters = dict.fromkeys(COUNTER_KEYS, 0)
+    for station in stations:
+        for key, value in _station_counts(station).items():
+            counters[key] += value
+    for robot in robots:
+        for key, value in _robot_counts(robot).items():
+            counters[key] += value
+    return counters
+
+def system_status(error_stations, error_robots):
+    """根据错误状态的充电桩和机器人数量返回 (系统状态, 说明)"""
+    if error_stations > 0 or error_robots > 0:
+        return '警告', f'发现异常: {error_stations}个充电站, {error_robots}个机器人处于错误状态'
+    return '正常', '所有系统运行正常'
+
+def count_today_orders(orders, today=None):
+    """统计开始时间在今天的订单数"""
+    today = today or datetime.now().strftime('%Y-%m-%d')
+    return sum(1 for order in orders
+               if isinstance(order.get('start_time'), str) and order['start_time'].startswith(today))
+
+def _dashboard_payload():
+    counters = dict(_counters)
+    counters['systemStatus'], counters['systemMessage'] = system_status(counters['errorStations'], counters['errorRobots'])
+    return counters
+
+def _seed():
+    """首个订阅者连接时从缓存数据初始化状态（需要应用上下文）"""
+    global _robots, _stations, _counters, _today
+    stations = data_access.get_charging_stations()
+    robots = data_access.get_robots()
+    today = datetime.now().strftime('%Y-%m-%d')
+    counters = dashboard_counters(stations, robots)
+    counters['todayOrders'] = count_today_orders(data_access.get_charging_orders(), today)
+    with _cond:
+        if _robots is not None:
+            return
+        _stations = {station['id']: {key: station.get(key) for key in _STATION_FIELDS} for station in stations}
+        _robots = {robot['id']: {key: robot.get(key) for key in _ROBOT_FIELDS} for robot in robots}
+        _counters = counters
+        _today = today
+    logger.info("实时推送状态已初始化: %s个充电桩, %s个机器人", len(stations), len(robots))
+
+def _apply(state, change, fields, counts, delta):
+    """把一行的变化合并到状态中，返回实际变化的字段（无变化返回None），并累加计数增量"""
+    old = state.get(change['id'])
+    new = dict(old) if old is not None else dict.fromkeys(fields)
+    new.update((key, change[key]) for key in fields if key in change)
+    if old is not None and new == old:
+        return None
+    if old is not None:
+        for key, value in counts(old).items():
+            delta[key] = delta.get(key, 0) - value
+    for key, value in counts(new).items():
+        delta[key] = delta.get(key, 0) + value
+    state[change['id']] = new
+    return {'id': change['id'], **{key: value for key, value in new.items() if old is None or old.get(key) != value}}
+
+def _on_changes(changes):
+    """data_access数据变更回调，只处理本次变化的行"""
+    global _seq, _today
+    with _cond:
+        if _robots is None:
+            return
+        delta = {}
+        robots = [diff for diff in (_apply(_robots, change, _ROBOT_FIELDS, _robot_counts, delta)
+                                    for change in changes['robots']) if diff]
+        stations = [diff for diff in (_apply(_stations, change, _STATION_FIELDS, _station_counts, delta)
+                                      for change in changes['stations']) if diff]
+        deleted = []
+        for station_id in changes['deleted_stations']:
+            old = _stations.pop(station_id, None)
+            if old is not None:
+                deleted.append(station_id)
+                for key, value in _station_counts(old).items():
+                    delta[key] = delta.get(key, 0) - value
+
+        today = datetime.now().strftime('%Y-%m-%d')
+        if today != _today:
+            # 跨天后今日订单数从0开始
+            delta['todayOrders'] = -_counters['todayOrders']
+            _today = today
+        if changes['new_orders']:
+            delta['todayOrders'] = delta.get('todayOrders', 0) + changes['new_orders']
+
+        delta = {key: value for key, value in delta.items() if value}
+        if not (robots or stations or deleted or delta):
+            return
+        for key, value in delta.items():
+            _counters[key] += value
+
+        payload = {
+            'robots': robots,
+            'stations': stations,
+            'deletedStations': deleted,
+            'dashboard': {'delta': delta, 'counters': _dashboard_payload()}
+        }
+        _seq += 1
+        _buffer.append((_seq, 'change', json.dumps(payload, ensure_ascii=False, default=str)))
+        _stats['events'] += 1
+        _cond.notify_all()
+
+data_access.add_change_listener(_on_changes)
+
+def _format(seq, event, data):
+    return f'id: {seq}\nevent: {event}\ndata: {data}\n\n'
+
+def _snapshot():
+    return _format(_seq, 'snapshot', json.dumps({'dashboard': _dashboard_payload()}, ensure_ascii=False))
+
+def _pending(cursor):
+    """取序号大于cursor的事件，cursor早于缓冲区中最早的事件或大于当前序号（服务重启）时
+    返回None，需要重新发送快照"""
+    if cursor == _seq:
+        return []
+    if cursor > _seq:
+        return None
+    first = _buffer[0][0] if _buffer else _seq + 1
+    if cursor < first - 1:
+        return None
+    return list(itertools.islice(_buffer, cursor - first + 1, None))
+
+def open_stream(last_event_id=None, max_clients=100, heartbeat=15):
+    """打开一个SSE连接，返回 (消息生成器, 释放连接的函数)；连接数已达上限时返回None
+
+    last_event_id为浏览器重连时带上的Last-Event-ID，缓冲区中仍有其后的事件时只补发这些事件，
+    否则先发送仪表盘计数快照。没有事件时每heartbeat秒发送一次注释行，以便及时发现已断开的连接。
+    连接名额在打开时占用，调用方需要在响应关闭时调用释放函数：HEAD请求或客户端在首次读取前断开时
+    生成器从未开始执行，其finally不会运行。释放函数可以重复调用。
+    """
+    global _clients
+    if _robots is None:
+        _seed()
+    with _cond:
+        if _clients >= max_clients:
+            _stats['rejected'] += 1
+            return None
+        _clients += 1
+        _stats['connections'] += 1
+        try:
+            cursor = int(last_event_id)
+        except (TypeError, ValueError):
+            cursor = None
+        first = None
+        if cursor is None or _pending(cursor) is None:
+            first = _snapshot()
+            cursor = _seq
+
+    released = False
+
+    def release():
+        global _clients
+        nonlocal released
+        with _cond:
+            if not released:
+                released = True
+                _clients -= 1
+
+    def generate():
+        nonlocal cursor
+        try:
+            # 浏览器断线后等待5秒重连
+            yield 'retry: 5000\n' + (first or '\n')
+            while True:
+                with _cond:
+                    if cursor >= _seq:
+                        _cond.wait(heartbeat)
+                    events = _pending(cursor)
+                    if events is None:
+                        # 连接过慢，缓冲区中的事件已被覆盖
+                        message = _snapshot()
+                        cursor = _seq
+                    else:
+                        message = ''.join(_format(*event) for event in events)
+                        cursor = events[-1][0] if events else cursor
+                yield message or ': keepalive\n\n'
+        finally:
+            release()
+
+    return generate(), release
+
+def get_stats():
+    """获取实时推送的连接数和事件数"""
+    with _cond:
+        stats = dict(_stats)
+        stats['clients'] = _clients
+        stats['last_event_id'] = _seq
+    return stats
@@ -0,0 +1,69 @@
+import functools
+import hashlib
+import logging
+import time
+from datetime import datetime, timezone
+
+from flask import current_app, request
+
+# HTTP条件请求：在执行视图前根据数据版本计算ETag和Last-Modified，
+# 与请求的If-None-Match / If-Modified-Since匹配时直接返回304，不再读取和序列化数据
+
+logger = logging.getLogger(__name__)
+
+def _as_utc(value):
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def time_bucket(seconds):
+    """按固定时间段变化的版本，用于依赖当前时间的数据（如进行中订单的时长），返回 (版本标识, 时间段开始时间)"""
+    start = int(time.time()) // seconds * seconds
+    return str(start), datetime.fromtimestamp(start, timezone.utc)
+
+def local_day():
+    """按本地日期变化的版本，用于按“今天”统计的数据，返回 (日期, 本地零点)"""
+    midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    return midnight.strftime('%Y-%m-%d'), midnight.astimezone(timezone.utc)
+
+def conditional(version_func):
+    """为GET接口添加ETag/Last-Modified响应头并处理条件请求
+
+    version_func返回数据版本列表 [(版本标识, 最后变化时间), ...]，
+    ETag由全部版本标识计算，Last-Modified取最后变化时间的最大值；返回None时不处理条件请求。
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != 'GET':
+                return view(*args, **kwargs)
+            try:
+                versions = version_func()
+                if versions is None:
+                    return view(*args, **kwargs)
+                etag = hashlib.blake2b('|'.join(token for token, _ in versions).encode('utf-8'),
+                                       digest_size=12).hexdigest()
+                last_modified = max(_as_utc(modified) for _, modified in versions).replace(microsecond=0)
+            except Exception as e:
+                logger.warning("计算数据版本失败，不处理条件请求: %s", e)
+                return view(*args, **kwargs)
+
+            # 同时带有两个条件时以If-None-Match为准
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains(etag)
+            else:
+                not_modified = request.if_modified_since is not None and last_modified <= request.if_modified_since
+
+            if not_modified:
+                response = current_app.response_class(status=304)
+            else:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            response.last_modified = last_modified
+            # 允许客户端缓存，但每次使用前都要向服务器确认
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
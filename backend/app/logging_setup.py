@@ -0,0 +1,143 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+
+from flask import has_request_context, request
+
+# 结构化日志：请求线程只把日志记录放入内存队列，由后台QueueListener线程统一写到标准输出，
+# 避免同步写stdout阻塞请求；支持按模块设置级别和按比例采样DEBUG日志
+
+_QUEUE_SIZE = 10000
+
+_listener = None
+_handler = None
+_init_lock = threading.Lock()
+
+class NonBlockingQueueHandler(QueueHandler):
+    """队列满时直接丢弃日志并计数，不阻塞请求线程"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # 在请求线程中完成消息格式化（参数可能在之后被修改），异常堆栈单独保存
+        record = logging.makeLogRecord(record.__dict__)
+        record.message = record.getMessage()
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class RequestContextFilter(logging.Filter):
+    """在请求线程中附加请求方法、路径和接口名，后台线程格式化时已没有请求上下文"""
+
+    def filter(self, record):
+        if has_request_context():
+            record.method = request.method
+            record.path = request.path
+            record.endpoint = request.endpoint
+        return True
+
+class DebugSampleFilter(logging.Filter):
+    """DEBUG日志按比例采样，INFO及以上全部保留"""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or self.rate >= 1:
+            return True
+        return random.random() < self.rate
+
+class JsonFormatter(logging.Formatter):
+    """每条日志输出一行JSON"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3],
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        for key in ('method', 'path', 'endpoint'):
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+        # logger.info(..., extra={'fields': {...}}) 传入的结构化字段
+        fields = getattr(record, 'fields', None)
+        if isinstance(fields, dict):
+            entry.update(fields)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class TextFormatter(logging.Formatter):
+    """便于本地开发阅读的单行文本格式"""
+
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+    def format(self, record):
+        text = super().format(record)
+        path = getattr(record, 'path', None)
+        if path:
+            text += f' [{getattr(record, "method", "")} {path}]'
+        return text
+
+def _parse_module_levels(spec):
+    """解析 'app.routes=DEBUG,app.data_access=WARNING' 形式的模块级别配置"""
+    levels = {}
+    for item in (spec or '').split(','):
+        if '=' not in item:
+            continue
+        name, level = item.split('=', 1)
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+def init_logging(app):
+    """为app包的日志配置队列处理器（每个进程只初始化一次）"""
+    global _listener, _handler
+    with _init_lock:
+        if _listener is not None:
+            return _handler
+
+        log_queue = queue.Queue(_QUEUE_SIZE)
+        output = logging.StreamHandler(sys.stdout)
+        output.setFormatter(JsonFormatter() if app.config.get('LOG_FORMAT') == 'json' else TextFormatter())
+
+        _handler = NonBlockingQueueHandler(log_queue)
+        _handler.addFilter(DebugSampleFilter(app.config.get('LOG_DEBUG_SAMPLE_RATE', 1.0)))
+        _handler.addFilter(RequestContextFilter())
+
+        package_logger = logging.getLogger('app')
+        package_logger.handlers = [_handler]
+        package_logger.setLevel(app.config.get('LOG_LEVEL', 'INFO').upper())
+        package_logger.propagate = False
+        for name, level in _parse_module_levels(app.config.get('LOG_MODULE_LEVELS')).items():
+            logging.getLogger(name).setLevel(level)
+
+        _listener = QueueListener(log_queue, output)
+        _listener.start()
+        atexit.register(_listener.stop)
+        return _handler
+
+def get_logging_stats():
+    """获取因队列已满被丢弃的日志条数"""
+    return {'dropped': _handler.dropped if _handler is not None else 0}
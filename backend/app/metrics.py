@@ -0,0 +1,184 @@
+import threading
+import time
+
+from flask import g, request, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# 请求级性能指标：按接口统计请求延迟直方图、进行中的请求数、响应大小以及SQL语句数和耗时，
+# 以Prometheus文本格式通过 /api/system/metrics 输出
+
+# 延迟直方图的桶上限（秒）
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_requests = {}    # (endpoint, method, status) -> 请求数
+_latency = {}     # (endpoint, method) -> {'buckets': [...], 'sum': 秒, 'count': 次数}
+_response_bytes = {}  # endpoint -> 响应字节数累计
+_sql = {}         # endpoint -> {'count': 语句数, 'seconds': 耗时}
+_in_flight = {}   # endpoint -> 进行中的请求数
+
+# 非请求线程（后台任务、脚本）执行的SQL归入该标签
+BACKGROUND = 'background'
+
+def _endpoint():
+    return request.endpoint or 'unmatched'
+
+def _before_request():
+    g._metrics_started = time.perf_counter()
+    g._metrics_sql_count = 0
+    g._metrics_sql_seconds = 0.0
+    endpoint = _endpoint()
+    with _lock:
+        _in_flight[endpoint] = _in_flight.get(endpoint, 0) + 1
+
+def _after_request(response):
+    g._metrics_status = response.status_code
+    # 流式响应没有确定的长度，不计入响应大小（calculate_content_length会把生成器读完，不能对其调用）
+    g._metrics_size = 0 if response.is_streamed else response.calculate_content_length() or 0
+    return response
+
+def _teardown_request(exc):
+    started = g.pop('_metrics_started', None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    endpoint = _endpoint()
+    status = g.pop('_metrics_status', 500)
+    size = g.pop('_metrics_size', 0)
+    sql_count = g.pop('_metrics_sql_count', 0)
+    sql_seconds = g.pop('_metrics_sql_seconds', 0.0)
+
+    with _lock:
+        _in_flight[endpoint] = _in_flight.get(endpoint, 1) - 1
+        key = (endpoint, request.method, status)
+        _requests[key] = _requests.get(key, 0) + 1
+
+        histogram = _latency.get((endpoint, request.method))
+        if histogram is None:
+            histogram = _latency[(endpoint, request.method)] = {
+                'buckets': [0] * len(LATENCY_BUCKETS), 'sum': 0.0, 'count': 0
+            }
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if elapsed <= bound:
+                histogram['buckets'][i] += 1
+        histogram['sum'] += elapsed
+        histogram['count'] += 1
+
+        _response_bytes[endpoint] = _response_bytes.get(endpoint, 0) + size
+        _add_sql(endpoint, sql_count, sql_seconds)
+
+def _add_sql(endpoint, count, seconds):
+    """累加SQL统计（调用方持有_lock）"""
+    stats = _sql.get(endpoint)
+    if stats is None:
+        stats = _sql[endpoint] = {'count': 0, 'seconds': 0.0}
+    stats['count'] += count
+    stats['seconds'] += seconds
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # 开始时间记录在本次执行的上下文上：语句出错时不会触发after_cursor_execute，记录随上下文一起丢弃
+    if context is not None:
+        context._metrics_query_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_metrics_query_started', None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    if has_request_context() and '_metrics_started' in g:
+        g._metrics_sql_count += 1
+        g._metrics_sql_seconds += elapsed
+    else:
+        with _lock:
+            _add_sql(BACKGROUND, 1, elapsed)
+
+def init_app(app):
+    """注册请求钩子和SQL事件（监听Engine类，覆盖应用创建的所有数据库连接）"""
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+def _labels(**labels):
+    parts = []
+    for name, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{name}="{value}"')
+    return '{' + ','.join(parts) + '}'
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def render_prometheus(extra=None):
+    """生成Prometheus文本格式的指标
+
+    extra: 额外指标列表，每项为 (名称, 类型, 说明, [(标签字典, 值), ...])
+    """
+    with _lock:
+        requests = dict(_requests)
+        latency = {key: {'buckets': list(value['buckets']), 'sum': value['sum'], 'count': value['count']}
+                   for key, value in _latency.items()}
+        response_bytes = dict(_response_bytes)
+        sql = {key: dict(value) for key, value in _sql.items()}
+        in_flight = dict(_in_flight)
+
+    lines = [
+        '# HELP http_requests_total 按接口、方法和状态码统计的请求数',
+        '# TYPE http_requests_total counter'
+    ]
+    for (endpoint, method, status), count in sorted(requests.items()):
+        lines.append(f'http_requests_total{_labels(endpoint=endpoint, method=method, status=status)} {count}')
+
+    lines += [
+        '# HELP http_request_duration_seconds 请求处理耗时',
+        '# TYPE http_request_duration_seconds histogram'
+    ]
+    for (endpoint, method), histogram in sorted(latency.items()):
+        # 记录时每个请求计入所有不小于其耗时的桶，桶计数已是累计值
+        for bound, count in zip(LATENCY_BUCKETS, histogram['buckets']):
+            lines.append(f'http_request_duration_seconds_bucket'
+                         f'{_labels(endpoint=endpoint, method=method, le=bound)} {count}')
+        lines.append(f'http_request_duration_seconds_bucket'
+                     f'{_labels(endpoint=endpoint, method=method, le="+Inf")} {histogram["count"]}')
+        lines.append(f'http_request_duration_seconds_sum{_labels(endpoint=endpoint, method=method)} '
+                     f'{_number(histogram["sum"])}')
+        lines.append(f'http_request_duration_seconds_count{_labels(endpoint=endpoint, method=method)} '
+                     f'{histogram["count"]}')
+
+    lines += [
+        '# HELP http_requests_in_flight 正在处理的请求数',
+        '# TYPE http_requests_in_flight gauge'
+    ]
+    for endpoint, count in sorted(in_flight.items()):
+        lines.append(f'http_requests_in_flight{_labels(endpoint=endpoint)} {count}')
+
+    lines += [
+        '# HELP http_response_size_bytes_total 响应体字节数累计',
+        '# TYPE http_response_size_bytes_total counter'
+    ]
+    for endpoint, size in sorted(response_bytes.items()):
+        lines.append(f'http_response_size_bytes_total{_labels(endpoint=endpoint)} {size}')
+
+    lines += [
+        '# HELP db_queries_total 按接口统计的SQL语句数（background为后台任务）',
+        '# TYPE db_queries_total counter'
+    ]
+    for endpoint, stats in sorted(sql.items()):
+        lines.append(f'db_queries_total{_labels(endpoint=endpoint)} {stats["count"]}')
+    lines += [
+        '# HELP db_query_duration_seconds_total 按接口统计的SQL执行耗时累计',
+        '# TYPE db_query_duration_seconds_total counter'
+    ]
+    for endpoint, stats in sorted(sql.items()):
+        lines.append(f'db_query_duration_seconds_total{_labels(endpoint=endpoint)} {_number(stats["seconds"])}')
+
+    for name, metric_type, description, samples in extra or []:
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {metric_type}')
+        for labels, value in samples:
+            lines.append(f'{name}{_labels(**labels) if labels else ""} {_number(value)}')
+
+    return '\n'.join(lines) + '\n'
@@ -31,6 +31,13 @@ class ChargingStation(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        # 自动充电：查找空闲充电桩
+        db.Index('idx_stations_status', status),
+        # 增量同步：按updated_at游标读取变化的充电桩
+        db.Index('idx_stations_updated_at', updated_at),
+    )
+
 class Robot(db.Model):
     __tablename__ = 'robots'
     
@@ -46,6 +53,13 @@ class Robot(db.Model):
     # 添加与充电桩的关系
     station = db.relationship('ChargingStation', backref='robots')
 
+    __table_args__ = (
+        # 低电量检查：status = 'idle' AND battery_level < 阈值
+        db.Index('idx_robots_status_battery', status, battery_level),
+        # 增量同步：按updated_at游标读取变化的机器人
+        db.Index('idx_robots_updated_at', updated_at),
+    )
+
 class ChargingOrder(db.Model):
     __tablename__ = 'charging_orders'
     
@@ -59,10 +73,65 @@ class ChargingOrder(db.Model):
     charging_efficiency = db.Column(db.Float, default=0.0)  # 充电效率
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # 数据库生成列：充电中的订单为station_id，其余为NULL，配合唯一索引保证每个充电桩只有一个进行中的订单
+    active_station_id = db.Column(db.Integer, db.Computed("CASE WHEN status = 'charging' THEN station_id END"))
 
     robot = db.relationship('Robot', backref='orders')
     station = db.relationship('ChargingStation', backref='orders')
 
+    __table_args__ = (
+        # 能效分析：按充电站 + 时间范围筛选
+        db.Index('idx_orders_station_start', station_id, start_time),
+        # 能效分析：仅按时间范围筛选（含状态，便于状态过滤走索引）
+        db.Index('idx_orders_start_status', start_time, status),
+        # 充电生命周期：查找机器人最近一条充电中的订单
+        db.Index('idx_orders_robot_status_start', robot_id, status, start_time.desc()),
+        # 内存列式订单存储：按updated_at高水位增量刷新
+        db.Index('idx_orders_updated_at', updated_at),
+        # 每个充电桩最多一个充电中的订单（NULL不参与唯一性比较）
+        db.Index('uq_orders_active_station', active_station_id, unique=True),
+    )
+
+class StationHourlyRollup(db.Model):
+    """充电站按小时汇总的充电数据，订单完成时增量更新，可由rebuild_station_rollup.py从历史订单重建"""
+    __tablename__ = 'station_hourly_rollup'
+    
+    station_id = db.Column(db.Integer, db.ForeignKey('charging_stations.id'), primary_key=True)
+    hour = db.Column(db.DateTime, primary_key=True)  # 小时起始时间
+    energy = db.Column(db.Float, nullable=False, default=0.0)  # 按时长比例分摊到该小时的充电量
+    session_count = db.Column(db.Integer, nullable=False, default=0)  # 在该小时开始的充电次数
+    busy_seconds = db.Column(db.Float, nullable=False, default=0.0)  # 该小时内的充电时长
+    efficiency_sum = db.Column(db.Float, nullable=False, default=0.0)  # 在该小时开始的订单效率之和
+    efficiency_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # 能效分析：按时间范围读取所有充电站的汇总数据
+        db.Index('idx_rollup_hour', hour),
+    )
+
+class DataVersion(db.Model):
+    """各类数据（stations/robots/orders）的写版本号，写操作提交后由data_access.clear_cache递增，用于HTTP条件请求"""
+    __tablename__ = 'data_versions'
+    
+    name = db.Column(db.String(32), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+class DeletedRecord(db.Model):
+    """已删除记录的墓碑，增量同步接口（?since=）据此通知客户端删除本地副本中的行"""
+    __tablename__ = 'deleted_records'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    table_name = db.Column(db.String(50), nullable=False)
+    record_id = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # 增量同步：按表和删除时间读取墓碑
+        db.Index('idx_deleted_records_table_time', table_name, deleted_at),
+    )
+
 class SystemAlert(db.Model):
     __tablename__ = 'system_alerts'
     
@@ -73,6 +142,11 @@ class SystemAlert(db.Model):
     is_read = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # 告警列表按时间倒序分页
+        db.Index('idx_alerts_time', time),
+    )
+
 class EfficiencyLog(db.Model):
     __tablename__ = 'efficiency_logs'
     
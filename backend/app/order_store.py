@@ -0,0 +1,258 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from . import data_access
+
+logger = logging.getLogger(__name__)
+
+# 内存列式订单存储：将charging_orders保存为NumPy数组，按updated_at高水位增量刷新
+
+MISSING_TIME = np.iinfo('int64').min  # 时间缺失值（与NaT的整数表示一致）
+STATUS_NAMES = ['charging', 'completed', 'failed']  # 状态编码表，遇到新状态时追加
+
+_REFRESH_INTERVAL = 5  # 距上次刷新超过该秒数时访问会触发增量刷新
+_FULL_RELOAD_INTERVAL = 600  # 定期全量重建，用于同步被删除的订单
+_HIGH_WATER_LAG = 5  # 高水位最多取到刷新开始前该秒数，应大于写事务的最长耗时（与SYNC_CURSOR_LAG_SECONDS含义相同）
+
+def to_epoch(values):
+    """将datetime列表转换为秒级时间戳数组，空值为MISSING_TIME"""
+    return np.array(values, dtype='datetime64[s]').astype('int64')
+
+def now_epoch():
+    """当前时间的秒级时间戳（与数据库中无时区的时间一样使用UTC）"""
+    return int(np.datetime64(datetime.utcnow().replace(microsecond=0), 's').astype('int64'))
+
+def format_epoch(values):
+    """将秒级时间戳数组格式化为 'YYYY-MM-DD HH:MM:SS' 字符串列表，缺失值为None"""
+    values = np.asarray(values, dtype='int64')
+    texts = np.datetime_as_string(values.astype('datetime64[s]'), unit='s')
+    return [None if value == MISSING_TIME else text.replace('T', ' ') for value, text in zip(values.tolist(), texts)]
+
+class OrderFrame:
+    """一组订单的列式视图，所有列长度相同"""
+
+    COLUMNS = ('id', 'robot_id', 'station_id', 'start', 'end', 'created', 'status', 'charge_amount', 'efficiency')
+
+    def __init__(self, id, robot_id, station_id, start, end, created, status, charge_amount, efficiency, status_names):
+        self.id = id
+        self.robot_id = robot_id
+        self.station_id = station_id
+        self.start = start
+        self.end = end
+        self.created = created
+        self.status = status
+        self.charge_amount = charge_amount  # 缺失值为NaN
+        self.efficiency = efficiency  # 缺失值为NaN
+        self.status_names = status_names
+
+    def __len__(self):
+        return len(self.id)
+
+    @classmethod
+    def empty(cls):
+        ints = np.zeros(0, dtype='int64')
+        floats = np.zeros(0, dtype='float64')
+        return cls(ints, ints, ints, ints, ints, ints, np.zeros(0, dtype='int16'), floats, floats, list(STATUS_NAMES))
+
+    def take(self, index):
+        """按布尔掩码或下标数组选取子集"""
+        return OrderFrame(*(getattr(self, name)[index] for name in self.COLUMNS), self.status_names)
+
+    def status_code(self, status):
+        """获取状态编码，不存在的状态返回-1"""
+        return self.status_names.index(status) if status in self.status_names else -1
+
+    def status_is(self, *statuses):
+        """按状态生成布尔掩码"""
+        codes = [self.status_code(status) for status in statuses]
+        return np.isin(self.status, codes)
+
+    def status_text(self):
+        """状态编码转换为字符串列表"""
+        return [self.status_names[code] for code in self.status.tolist()]
+
+    def records(self):
+        """转换为订单字典列表，时间格式化为 'YYYY-MM-DD HH:MM:SS'"""
+        start_times = format_epoch(self.start)
+        end_times = format_epoch(self.end)
+        created_times = format_epoch(self.created)
+        statuses = self.status_text()
+        charge_amounts = [None if np.isnan(value) else value for value in self.charge_amount.tolist()]
+        efficiencies = [None if np.isnan(value) else value for value in self.efficiency.tolist()]
+        return [
+            {
+                'id': order_id,
+                'robot_id': robot_id,
+                'station_id': station_id,
+                'start_time': start_times[i],
+                'end_time': end_times[i],
+                'created_at': created_times[i],
+                'status': statuses[i],
+                'charge_amount': charge_amounts[i],
+                'amount': charge_amounts[i],
+                'charging_efficiency': efficiencies[i]
+            }
+            for i, (order_id, robot_id, station_id) in enumerate(zip(
+                self.id.tolist(), self.robot_id.tolist(), self.station_id.tolist()
+            ))
+        ]
+
+    def select(self, start=None, end=None, station_ids=None, robot_ids=None, status=None):
+        """按开始时间范围、充电站、机器人和状态筛选订单，指定时间范围时开始时间缺失的订单不满足条件"""
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None:
+            mask &= (self.start != MISSING_TIME) & (self.start >= to_epoch([start])[0])
+        if end is not None:
+            mask &= (self.start != MISSING_TIME) & (self.start <= to_epoch([end])[0])
+        if station_ids:
+            mask &= np.isin(self.station_id, list(station_ids))
+        if robot_ids:
+            mask &= np.isin(self.robot_id, list(robot_ids))
+        if status:
+            statuses = status if isinstance(status, (list, tuple, set)) else [status]
+            mask &= self.status_is(*statuses)
+        return self.take(mask)
+
+class OrderStore:
+    """进程内的充电订单列式存储，按updated_at高水位增量刷新"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._frame = OrderFrame.empty()
+        self._high_water = None
+        self._last_refresh = 0
+        self._last_full_reload = 0
+        self._dirty = True
+        self._version = None  # 最近一次刷新前读到的订单数据版本
+        self.stats = {'full_reloads': 0, 'incremental_refreshes': 0, 'rows_merged': 0}
+
+    def invalidate(self, full=False):
+        """标记存储需要刷新（本进程写操作后调用），full为True时下次访问全量重新加载"""
+        self._dirty = True
+        if full:
+            self._last_full_reload = 0
+
+    def loaded_version(self):
+        """当前快照对应的订单数据版本，下次访问需要刷新时返回None"""
+        if self._dirty or time.time() - self._last_refresh >= _REFRESH_INTERVAL:
+            return None
+        return self._version
+
+    def frame(self):
+        """获取当前订单快照，必要时先增量刷新"""
+        now = time.time()
+        if self._dirty or now - self._last_refresh >= _REFRESH_INTERVAL:
+            with self._lock:
+                if self._dirty or now - self._last_refresh >= _REFRESH_INTERVAL:
+                    try:
+                        self._refresh(full=now - self._last_full_reload >= _FULL_RELOAD_INTERVAL)
+                    except Exception as e:
+                        logger.exception("刷新列式订单存储时出错: %s", e)
+        return self._frame
+
+    def _refresh(self, full=False):
+        """全量加载或按高水位增量合并变更的订单"""
+        # 先清除标记，刷新期间发生的写操作会在下次访问时再次刷新
+        self._dirty = False
+        # updated_at在事务提交前生成，提交较晚的订单可能早于已读到的最大值；
+        # 高水位不超过本次查询开始前_HIGH_WATER_LAG秒，下次刷新重新读取这段时间内的订单
+        settled = datetime.utcnow() - timedelta(seconds=_HIGH_WATER_LAG)
+        # 在查询订单前读取版本，快照中的数据不会早于该版本；读取失败时为None，条件请求改为读取数据库中的版本
+        version = data_access.loading_data_version('orders')
+        if full or self._high_water is None:
+            rows = data_access.get_order_columns()
+            self._frame = self._build(rows, list(STATUS_NAMES))
+            self._last_full_reload = time.time()
+            self.stats['full_reloads'] += 1
+        else:
+            rows = data_access.get_order_columns(self._high_water)
+            if rows:
+                self._frame = self._merge(self._frame, self._build(rows, list(self._frame.status_names)))
+            self.stats['incremental_refreshes'] += 1
+        self.stats['rows_merged'] += len(rows)
+
+        updated = [row.updated_at for row in rows if row.updated_at is not None]
+        if updated:
+            latest = max(updated)
+            # 使用 >= 高水位查询，重复读取的订单按ID去重
+            high_water = latest if self._high_water is None else max(self._high_water, latest)
+            self._high_water = min(high_water, settled)
+        elif self._high_water is None:
+            self._high_water = datetime.min
+        self._version = version
+        self._last_refresh = time.time()
+
+    @staticmethod
+    def _build(rows, status_names):
+        """将查询结果行转换为列式数组"""
+        if not rows:
+            frame = OrderFrame.empty()
+            frame.status_names = status_names
+            return frame
+        columns = list(zip(*rows))
+        statuses = []
+        for value in columns[7]:
+            if value not in status_names:
+                status_names.append(value)
+            statuses.append(status_names.index(value))
+        return OrderFrame(
+            np.array(columns[0], dtype='int64'),
+            np.array(columns[1], dtype='int64'),
+            np.array(columns[2], dtype='int64'),
+            to_epoch(columns[3]),
+            to_epoch(columns[4]),
+            to_epoch(columns[5]),
+            np.array(statuses, dtype='int16'),
+            np.array(columns[8], dtype='float64'),
+            np.array(columns[9], dtype='float64'),
+            status_names
+        )
+
+    @staticmethod
+    def _merge(current, changes):
+        """合并变更的订单：已存在的按ID覆盖，新订单追加，结果按ID有序"""
+        if len(current) == 0:
+            return changes
+        # 变更中的状态编码表包含当前编码表，直接沿用
+        positions = np.searchsorted(current.id, changes.id)
+        positions = np.minimum(positions, len(current) - 1)
+        existing = current.id[positions] == changes.id
+
+        merged = {}
+        for name in OrderFrame.COLUMNS:
+            column = getattr(current, name).copy()  # 复制后修改，已发出的快照保持不变
+            column[positions[existing]] = getattr(changes, name)[existing]
+            merged[name] = np.concatenate([column, getattr(changes, name)[~existing]])
+        frame = OrderFrame(*(merged[name] for name in OrderFrame.COLUMNS), changes.status_names)
+        if not np.all(frame.id[1:] >= frame.id[:-1]):
+            frame = frame.take(np.argsort(frame.id, kind='stable'))
+        return frame
+
+_store = OrderStore()
+
+def _on_cache_cleared(key):
+    """数据缓存清除时同步标记订单存储需要刷新"""
+    if key in (None, 'orders'):
+        _store.invalidate()
+
+data_access.add_invalidation_listener(_on_cache_cleared)
+data_access.add_version_source('orders', _store.loaded_version)
+
+def get_order_frame():
+    """获取当前进程的订单列式快照"""
+    return _store.frame()
+
+def invalidate(full=False):
+    """通知订单存储有写操作发生"""
+    _store.invalidate(full)
+
+def get_store_stats():
+    """获取订单存储的刷新统计"""
+    stats = dict(_store.stats)
+    stats['rows'] = len(_store._frame)
+    stats['high_water'] = _store._high_water.strftime('%Y-%m-%d %H:%M:%S') if _store._high_water not in (None, datetime.min) else None
+    return stats
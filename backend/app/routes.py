@@ -1,8 +1,19 @@
-from flask import Blueprint, request, jsonify, render_template_string, current_app, send_from_directory
+from flask import Blueprint, request, jsonify, render_template_string, current_app, send_from_directory, Response
 from flask_jwt_extended import jwt_required, get_jwt_identity, create_access_token
 from datetime import datetime, timedelta
-from . import data_access
+from . import db, data_access, order_store, charging_worker, metrics, logging_setup, slow_query, event_stream
+from .database import use_read_replica, read_replica
+from .http_cache import conditional, time_bucket, local_day
+from .order_store import OrderFrame
+from .analytics import (
+    parse_datetime, station_powers, kpi_metrics, daily_efficiency_table, energy_distribution_matrix,
+    energy_distribution_points, station_busy_hours, robot_charging_stats, peak_analysis,
+    rollup_daily_efficiency_table, rollup_energy_matrix
+)
 import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # 创建蓝图
@@ -14,22 +25,47 @@ system_bp = Blueprint('system', __name__)
 robot_bp = Blueprint('robots', __name__)  # 机器人蓝图
 energy_efficiency_bp = Blueprint('energy_efficiency', __name__)  # 能效分析蓝图
 
+# 能效分析接口只读数据，配置了只读副本时查询路由到副本，不与调度写事务争用主库
+energy_efficiency_bp.before_request(use_read_replica)
+
+logger = logging.getLogger(__name__)
+
+# 条件请求（ETag / Last-Modified）使用的数据版本，数据未变化时接口直接返回304
+# 增量同步请求（?since=）只读取变化的行，不计算全量数据的版本
+def stations_version():
+    return None if 'since' in request.args else [data_access.get_data_version('stations')]
+
+def robots_version():
+    return None if 'since' in request.args else [data_access.get_data_version('robots')]
+
+def orders_version():
+    return None if 'since' in request.args else [data_access.get_data_version('orders')]
+
+def dashboard_version():
+    # 今日充电次数按本地日期统计，日期变化时版本也随之变化
+    return [data_access.get_data_version(key) for key in ('stations', 'robots', 'orders')] + [local_day()]
+
+def energy_efficiency_version():
+    # 进行中订单的时长和默认时间范围依赖当前时间，版本每分钟变化一次
+    return [data_access.get_data_version(key) for key in ('orders', 'stations', 'robots')] + [time_bucket(60)]
+
 # 认证相关路由
 @auth_bp.route('/login', methods=['POST'])
 def login():
     data = request.get_json()
-    print(f"接收到的登录请求数据: {data}")
+    # 请求体包含明文密码，只记录用户名
+    logger.debug("接收到登录请求: 用户名=%s", data.get('username'))
     username = data.get('username')
     password = data.get('password')
 
     user = data_access.get_user_by_username(username)
-    print(f"从数据库查找用户: {user}")
+    logger.debug("从数据库查找用户: %s", user['id'] if user else None)
 
     if user and data_access.check_password(user, password):
-        print("密码验证成功")
+        logger.debug('密码验证成功')
         # 确保用户ID是字符串类型
         user_id = str(user['id'])
-        print(f"创建令牌，用户ID: {user_id}, 类型: {type(user_id)}")
+        logger.debug("创建令牌，用户ID: %s, 类型: %s", user_id, type(user_id))
         
         # 创建JWT令牌，使用额外参数
         access_token = create_access_token(
@@ -49,7 +85,7 @@ def login():
             }
         })
 
-    print("密码验证失败")
+    logger.warning('密码验证失败')
     return jsonify({'error': 'Invalid credentials'}), 401
 
 @auth_bp.route('/me', methods=['GET'])
@@ -166,21 +202,17 @@ def create_user():
 
 # 充电桩管理路由 - 移除JWT认证以便测试
 @station_bp.route('/', methods=['GET'], strict_slashes=False)
+@conditional(stations_version)
 def get_stations():
+    if 'since' in request.args:
+        return delta_sync_response('stations', station_item)
     try:
         stations = data_access.get_charging_stations()
-        print(f"获取到的充电站数据: {len(stations)} 条")
-        result = [{
-            'id': station['id'],
-            'name': station['name'],
-            'location': station['location'],
-            'status': station['status'],
-            'power_rating': station.get('power_rating', station.get('power_output', 0)),
-            'efficiency': station.get('efficiency', 100)
-        } for station in stations]
+        logger.debug("获取到的充电站数据: %s 条", len(stations))
+        result = [station_item(station) for station in stations]
         return jsonify(result)
     except Exception as e:
-        print(f"获取充电站数据出错: {str(e)}")
+        logger.error("获取充电站数据出错: %s", e)
         # 返回空数组而不是错误对象
         return jsonify([])
 
@@ -205,11 +237,11 @@ def create_station():
             
         # 获取请求数据
         data = request.get_json()
-        print(f"接收到添加充电站请求: {data}")
+        logger.debug("接收到添加充电站请求: %s", data)
         
         # 验证必要字段
         if not data or not isinstance(data, dict):
-            print("请求数据无效")
+            logger.warning('请求数据无效')
             return jsonify({'error': '请求数据无效'}), 400
         
         # 验证必填字段
@@ -218,7 +250,7 @@ def create_station():
         
         if missing_fields:
             error_msg = f"缺少必填字段: {', '.join(missing_fields)}"
-            print(error_msg)
+            logger.warning(error_msg)
             return jsonify({'error': error_msg}), 422
             
         # 验证数值字段
@@ -226,7 +258,7 @@ def create_station():
             try:
                 data['power_rating'] = float(data['power_rating'])
             except (ValueError, TypeError):
-                print("功率值无效")
+                logger.warning('功率值无效')
                 return jsonify({'error': '功率值必须是有效的数字'}), 422
                 
         if 'efficiency' in data:
@@ -235,24 +267,22 @@ def create_station():
                 if data['efficiency'] < 0 or data['efficiency'] > 100:
                     raise ValueError("效率值必须在0-100之间")
             except (ValueError, TypeError) as e:
-                print(f"效率值无效: {str(e)}")
+                logger.warning("效率值无效: %s", e)
                 return jsonify({'error': '效率值必须是0-100之间的有效数字'}), 422
         
         # 调用数据访问函数添加充电站
         new_station = data_access.add_charging_station(data)
         
         if new_station:
-            print(f"成功添加充电站: {new_station}")
+            logger.info("成功添加充电站: %s", new_station)
             # 清除缓存，确保下次获取最新数据
             data_access.clear_cache()
             return jsonify(new_station), 201
         else:
-            print("添加充电站失败")
+            logger.warning('添加充电站失败')
             return jsonify({'error': '添加充电站失败，可能是数据存储问题'}), 500
     except Exception as e:
-        print(f"添加充电站出错: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("添加充电站出错: %s", e)
         return jsonify({'error': f'服务器错误: {str(e)}'}), 500
 
 @station_bp.route('/<int:station_id>/', methods=['PUT'], strict_slashes=False)
@@ -276,28 +306,26 @@ def update_station(station_id):
             
         # 获取请求数据
         data = request.get_json()
-        print(f"接收到更新充电站请求: ID={station_id}, 数据={data}")
+        logger.debug("接收到更新充电站请求: ID=%s, 数据=%s", station_id, data)
         
         # 验证必要字段
         if not data or not isinstance(data, dict):
-            print("请求数据无效")
+            logger.warning('请求数据无效')
             return jsonify({'error': '请求数据无效'}), 400
         
         # 调用数据访问函数更新充电站
         updated_station = data_access.update_charging_station(station_id, data)
         
         if updated_station:
-            print(f"成功更新充电站: {updated_station}")
+            logger.info("成功更新充电站: %s", updated_station)
             # 清除缓存，确保下次获取最新数据
             data_access.clear_cache()
             return jsonify(updated_station)
         else:
-            print(f"更新充电站失败: ID={station_id}")
+            logger.warning("更新充电站失败: ID=%s", station_id)
             return jsonify({'error': '更新充电站失败，可能未找到指定ID的充电站'}), 404
     except Exception as e:
-        print(f"更新充电站出错: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("更新充电站出错: %s", e)
         return jsonify({'error': f'服务器错误: {str(e)}'}), 500
 
 @station_bp.route('/<int:station_id>/', methods=['DELETE'], strict_slashes=False)
@@ -319,63 +347,54 @@ def delete_station(station_id):
         if not user or user['role'] != 'admin':
             return jsonify({'error': '无权限执行此操作'}), 403
             
-        print(f"接收到删除充电站请求: ID={station_id}")
+        logger.debug("接收到删除充电站请求: ID=%s", station_id)
         
         # 调用数据访问函数删除充电站
         success = data_access.delete_charging_station(station_id)
         
         if success:
-            print(f"成功删除充电站: ID={station_id}")
+            logger.info("成功删除充电站: ID=%s", station_id)
             # 清除缓存，确保下次获取最新数据
             data_access.clear_cache()
             return jsonify({'message': f'成功删除充电站: ID={station_id}'})
         else:
-            print(f"删除充电站失败: ID={station_id}")
+            logger.warning("删除充电站失败: ID=%s", station_id)
             return jsonify({'error': '删除充电站失败，可能未找到指定ID的充电站'}), 404
     except Exception as e:
-        print(f"删除充电站出错: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("删除充电站出错: %s", e)
         return jsonify({'error': f'服务器错误: {str(e)}'}), 500
 
 # 机器人管理路由 - 移除JWT认证以便测试
 @robot_bp.route('/', methods=['GET'])
+@conditional(robots_version)
 def get_robots():
+    if 'since' in request.args:
+        return delta_sync_response('robots', robot_item)
     try:
         robots = data_access.get_robots()
-        print(f"获取到的机器人数据: {len(robots)} 条")
-        print(f"机器人数据类型: {type(robots)}")
+        logger.debug("获取到的机器人数据: %s 条", len(robots))
+        logger.debug("机器人数据类型: %s", type(robots))
         
         # 确保robots是列表
         if not isinstance(robots, list):
-            print(f"警告: 机器人数据不是列表，而是 {type(robots)}")
+            logger.warning("警告: 机器人数据不是列表，而是 %s", type(robots))
             robots = []
         
         result = []
         for robot in robots:
             try:
-                robot_item = {
-                    'id': robot['id'],
-                    'name': robot['name'],
-                    'battery_level': robot['battery_level'],
-                    'status': robot['status'],
-                    'last_charging': robot.get('last_charging', None),
-                    'station_id': robot.get('station_id', None)  # 添加充电桩ID字段
-                }
-                result.append(robot_item)
+                result.append(robot_item(robot))
             except Exception as e:
-                print(f"处理机器人数据时出错: {str(e)}, 机器人数据: {robot}")
+                logger.error("处理机器人数据时出错: %s, 机器人数据: %s", e, robot)
         
-        print(f"处理后的机器人数据: {len(result)} 条")
+        logger.debug("处理后的机器人数据: %s 条", len(result))
         
         # 明确设置响应的内容类型
         response = jsonify(result)
         response.headers['Content-Type'] = 'application/json; charset=utf-8'
         return response
     except Exception as e:
-        print(f"获取机器人数据出错: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("获取机器人数据出错: %s", e)
         # 返回空数组而不是错误对象
         response = jsonify([])
         response.headers['Content-Type'] = 'application/json; charset=utf-8'
@@ -388,28 +407,43 @@ def update_robot(robot_id):
     try:
         # 获取请求数据
         data = request.get_json()
-        print(f"接收到更新机器人请求: ID={robot_id}, 数据={data}")
+        logger.debug("接收到更新机器人请求: ID=%s, 数据=%s", robot_id, data)
         
         # 验证必要字段
         if not data or not isinstance(data, dict):
-            print("请求数据无效")
+            logger.warning('请求数据无效')
             return jsonify({'error': '请求数据无效'}), 400
         
         # 调用数据访问函数更新机器人
         updated_robot = data_access.update_robot(robot_id, data)
         
         if updated_robot:
-            print(f"成功更新机器人: {updated_robot}")
+            logger.info("成功更新机器人: %s", updated_robot)
             # 清除缓存，确保下次获取最新数据
             data_access.clear_cache()
             return jsonify(updated_robot)
         else:
-            print(f"更新机器人失败: ID={robot_id}")
+            logger.warning("更新机器人失败: ID=%s", robot_id)
             return jsonify({'error': '更新机器人失败，可能未找到指定ID的机器人'}), 404
     except Exception as e:
-        print(f"更新机器人出错: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("更新机器人出错: %s", e)
+        return jsonify({'error': f'服务器错误: {str(e)}'}), 500
+
+# 批量上报机器人遥测数据
+@robot_bp.route('/telemetry', methods=['POST'])
+def report_robot_telemetry():
+    """批量更新机器人电量和状态，请求体为 [{id, battery_level, status}, ...] 或 {"records": [...]}"""
+    try:
+        data = request.get_json(silent=True)
+        records = data.get('records') if isinstance(data, dict) else data
+        if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+            return jsonify({'error': '请求数据无效，应为遥测记录列表'}), 400
+        
+        summary = data_access.apply_robot_telemetry(records)
+        logger.debug("遥测数据: 收到 %s 条，更新 %s 条，未变化 %s 条", summary['received'], summary['updated'], summary['unchanged'])
+        return jsonify(summary)
+    except Exception as e:
+        logger.exception("写入机器人遥测数据出错: %s", e)
         return jsonify({'error': f'服务器错误: {str(e)}'}), 500
 
 # 新增：将机器人分配到充电桩
@@ -417,23 +451,21 @@ def update_robot(robot_id):
 def assign_robot_to_station(robot_id, station_id):
     """将机器人分配到充电桩"""
     try:
-        print(f"接收到分配机器人请求: 机器人ID={robot_id}, 充电桩ID={station_id}")
+        logger.debug("接收到分配机器人请求: 机器人ID=%s, 充电桩ID=%s", robot_id, station_id)
         
         # 调用数据访问函数分配机器人到充电桩
         success, message = data_access.assign_robot_to_station(robot_id, station_id)
         
         if success:
-            print(f"成功分配机器人: {message}")
+            logger.info("成功分配机器人: %s", message)
             # 清除缓存，确保下次获取最新数据
             data_access.clear_cache()
             return jsonify({'message': message})
         else:
-            print(f"分配机器人失败: {message}")
+            logger.warning("分配机器人失败: %s", message)
             return jsonify({'error': message}), 400
     except Exception as e:
-        print(f"分配机器人出错: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("分配机器人出错: %s", e)
         return jsonify({'error': f'服务器错误: {str(e)}'}), 500
 
 # 新增：开始充电
@@ -441,23 +473,21 @@ def assign_robot_to_station(robot_id, station_id):
 def start_charging(robot_id):
     """开始给机器人充电"""
     try:
-        print(f"接收到开始充电请求: 机器人ID={robot_id}")
+        logger.debug("接收到开始充电请求: 机器人ID=%s", robot_id)
         
         # 调用数据访问函数开始充电
         success, message = data_access.start_charging(robot_id)
         
         if success:
-            print(f"成功开始充电: {message}")
+            logger.info("成功开始充电: %s", message)
             # 清除缓存，确保下次获取最新数据
             data_access.clear_cache()
             return jsonify({'message': message})
         else:
-            print(f"开始充电失败: {message}")
+            logger.warning("开始充电失败: %s", message)
             return jsonify({'error': message}), 400
     except Exception as e:
-        print(f"开始充电出错: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("开始充电出错: %s", e)
         return jsonify({'error': f'服务器错误: {str(e)}'}), 500
 
 # 新增：完成充电
@@ -465,94 +495,67 @@ def start_charging(robot_id):
 def complete_charging(robot_id):
     """完成机器人充电"""
     try:
-        print(f"接收到完成充电请求: 机器人ID={robot_id}")
+        logger.debug("接收到完成充电请求: 机器人ID=%s", robot_id)
         
         # 调用数据访问函数完成充电
         success, message = data_access.complete_charging(robot_id)
         
         if success:
-            print(f"成功完成充电: {message}")
+            logger.info("成功完成充电: %s", message)
             # 清除缓存，确保下次获取最新数据
             data_access.clear_cache()
             return jsonify({'message': message})
         else:
-            print(f"完成充电失败: {message}")
+            logger.warning("完成充电失败: %s", message)
             return jsonify({'error': message}), 400
     except Exception as e:
-        print(f"完成充电出错: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("完成充电出错: %s", e)
         return jsonify({'error': f'服务器错误: {str(e)}'}), 500
 
 # 新增：检查低电量机器人并自动充电
-@robot_bp.route('/check-low-battery', methods=['GET'])
+# 启用自动充电后台任务后无需手动调用；保留GET以兼容旧版前端
+@robot_bp.route('/check-low-battery', methods=['GET', 'POST'])
 def check_low_battery_robots():
-    """检查低电量机器人并自动安排充电"""
+    """手动触发一次低电量检查并自动安排充电"""
     try:
-        print("接收到检查低电量机器人请求")
+        logger.debug('接收到检查低电量机器人请求')
         
         # 调用数据访问函数检查低电量机器人
         results = data_access.check_low_battery_robots()
         
-        print(f"检查结果: {len(results)} 条记录")
+        logger.debug("检查结果: %s 条记录", len(results))
         # 清除缓存，确保下次获取最新数据
         data_access.clear_cache()
         return jsonify(results)
     except Exception as e:
-        print(f"检查低电量机器人出错: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("检查低电量机器人出错: %s", e)
         return jsonify({'error': f'服务器错误: {str(e)}'}), 500
 
 # 订单管理路由 - 移除JWT认证以便测试
 @order_bp.route('/', methods=['GET'])
+@conditional(orders_version)
 def get_orders():
+    if 'since' in request.args:
+        return delta_sync_response('orders', order_item)
     try:
         orders = data_access.get_charging_orders()
-        print(f"获取到的订单数据: {len(orders)} 条")
+        logger.debug("获取到的订单数据: %s 条", len(orders))
         
         result = []
         for order in orders:
             try:
-                order_item = {
-                    'id': order['id'],
-                    'robot_id': order['robot_id'],
-                    'station_id': order['station_id'],
-                    'start_time': order['start_time'],
-                    'status': order['status']
-                }
-                
-                # 处理可能的NaN值
-                if 'end_time' in order and order['end_time'] is not None:
-                    order_item['end_time'] = order['end_time']
-                else:
-                    order_item['end_time'] = None
-                
-                # 处理金额，避免NaN值
-                amount = order.get('amount', order.get('charge_amount', None))
-                if amount is not None and not isinstance(amount, str):
-                    try:
-                        float(amount)  # 尝试转换为浮点数，检查是否是NaN
-                        order_item['amount'] = amount
-                    except (ValueError, TypeError):
-                        order_item['amount'] = None
-                else:
-                    order_item['amount'] = amount
-                    
-                result.append(order_item)
+                result.append(order_item(order))
             except Exception as e:
-                print(f"处理订单数据时出错: {str(e)}, 订单数据: {order}")
+                logger.error("处理订单数据时出错: %s, 订单数据: %s", e, order)
         
-        print(f"处理后的订单数据: {len(result)} 条")
+        logger.debug("处理后的订单数据: %s 条", len(result))
         
         # 明确设置响应的内容类型
         response = jsonify(result)
         response.headers['Content-Type'] = 'application/json; charset=utf-8'
         return response
     except Exception as e:
-        print(f"获取订单数据出错: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("获取订单数据出错: %s", e)
         # 返回空数组而不是错误对象
         response = jsonify([])
         response.headers['Content-Type'] = 'application/json; charset=utf-8'
@@ -585,21 +588,12 @@ def get_alerts():
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 7, type=int)
         
-        # 获取所有告警
-        alerts = data_access.get_system_alerts()
-        
-        # 按时间倒序排序
-        alerts = sorted(alerts, key=lambda x: x['time'], reverse=True)
+        # 按时间倒序分页获取告警（在数据库中排序和分页）
+        paged_alerts, total_items = data_access.get_system_alerts_page(page, per_page)
         
         # 计算总页数
-        total_items = len(alerts)
         total_pages = (total_items + per_page - 1) // per_page  # 向上取整
         
-        # 分页
-        start_idx = (page - 1) * per_page
-        end_idx = min(start_idx + per_page, total_items)
-        paged_alerts = alerts[start_idx:end_idx]
-        
         # 格式化响应数据
         result = {
             'items': [{
@@ -619,9 +613,7 @@ def get_alerts():
         
         return jsonify(result)
     except Exception as e:
-        print(f"获取系统告警数据出错: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("获取系统告警数据出错: %s", e)
         return jsonify({
             'items': [],
             'pagination': {
@@ -641,6 +633,67 @@ def get_settings():
         result[setting['setting_key']] = setting['setting_value']
     return jsonify(result)
 
+@system_bp.route('/cache-stats', methods=['GET'])
+@jwt_required()
+def get_cache_stats():
+    """获取数据缓存命中统计及内存列式订单存储的刷新统计（需要登录）"""
+    stats = data_access.get_cache_stats()
+    stats['orderStore'] = order_store.get_store_stats()
+    return jsonify(stats)
+
+@system_bp.route('/charging-worker', methods=['GET'])
+@jwt_required()
+def get_charging_worker_stats():
+    """获取自动充电后台任务的运行指标（tick耗时、处理结果计数、是否为leader，需要登录）"""
+    return jsonify(charging_worker.get_worker_stats())
+
+@system_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus文本格式的性能指标：接口延迟、SQL统计，以及缓存、订单存储和自动充电任务的运行状态"""
+    cache = data_access.get_cache_stats()
+    store = order_store.get_store_stats()
+    worker = charging_worker.get_worker_stats()
+    pools = db.get_pool_stats()
+    stream = event_stream.get_stats()
+    extra = [
+        ('data_cache_hits_total', 'counter', '数据缓存命中次数', [({}, cache['hits'])]),
+        ('data_cache_misses_total', 'counter', '数据缓存未命中次数', [({}, cache['misses'])]),
+        ('data_cache_entries', 'gauge', '数据缓存条目数', [({}, cache['entries'])]),
+        ('order_store_rows', 'gauge', '内存列式订单存储的订单数', [({}, store['rows'])]),
+        ('order_store_full_reloads_total', 'counter', '订单存储全量加载次数', [({}, store['full_reloads'])]),
+        ('order_store_incremental_refreshes_total', 'counter', '订单存储增量刷新次数',
+         [({}, store['incremental_refreshes'])]),
+        ('log_records_dropped_total', 'counter', '日志队列已满时丢弃的日志条数',
+         [({}, logging_setup.get_logging_stats()['dropped'])]),
+        ('db_pool_size', 'gauge', '数据库连接池大小', [({'bind': bind}, p['size']) for bind, p in sorted(pools.items())]),
+        ('db_pool_checked_out', 'gauge', '已借出的数据库连接数',
+         [({'bind': bind}, p['checked_out']) for bind, p in sorted(pools.items())]),
+        ('db_pool_overflow', 'gauge', '超出连接池大小的额外连接数',
+         [({'bind': bind}, p['overflow']) for bind, p in sorted(pools.items())]),
+        ('event_stream_clients', 'gauge', '实时推送的连接数', [({}, stream['clients'])]),
+        ('event_stream_events_total', 'counter', '实时推送的变更事件数', [({}, stream['events'])]),
+        ('event_stream_rejected_total', 'counter', '连接数达到上限被拒绝的实时推送连接数', [({}, stream['rejected'])]),
+        ('charging_worker_enabled', 'gauge', '自动充电后台任务是否启用', [({}, int(worker['enabled']))]),
+    ]
+    if worker['enabled']:
+        extra += [
+            ('charging_worker_is_leader', 'gauge', '当前进程是否为自动充电任务leader', [({}, int(worker['is_leader']))]),
+            ('charging_worker_ticks_total', 'counter', '自动充电检查执行次数', [({}, worker['ticks'])]),
+            ('charging_worker_errors_total', 'counter', '自动充电检查出错次数', [({}, worker['errors'])]),
+            ('charging_worker_last_tick_seconds', 'gauge', '最近一次自动充电检查耗时', [({}, worker['last_tick_seconds'])]),
+            ('charging_worker_max_tick_seconds', 'gauge', '自动充电检查最大耗时', [({}, worker['max_tick_seconds'])]),
+            ('charging_worker_actions_total', 'counter', '自动充电各类处理结果累计次数',
+             [({'action': action}, count) for action, count in sorted(worker['actions'].items())]),
+        ]
+    return Response(metrics.render_prometheus(extra), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@system_bp.route('/slow-queries', methods=['GET'])
+@jwt_required()
+def get_slow_queries():
+    """获取最近的慢查询及其执行计划，按SQL汇总总耗时（包含SQL参数，需要登录）"""
+    limit = request.args.get('limit', 50, type=int)
+    return jsonify(slow_query.get_slow_queries(limit))
+
 @system_bp.route('/efficiency', methods=['GET'])
 @jwt_required()
 def get_efficiency_logs():
@@ -649,87 +702,64 @@ def get_efficiency_logs():
 
 # 仪表盘数据路由 - 移除JWT认证以便测试
 @system_bp.route('/dashboard', methods=['GET'])
+@read_replica
+@conditional(dashboard_version)
 def get_dashboard_data():
     """获取仪表盘所需的统计数据"""
     try:
-        # 清除缓存以确保获取最新数据
-        data_access.clear_cache()
-        
+        # 数据由缓存提供，写操作会通过clear_cache()使缓存失效
         # 获取数据，每个步骤单独处理异常
         try:
             stations = data_access.get_charging_stations()
-            print(f"成功获取充电站数据: {len(stations)}个")
+            logger.debug("成功获取充电站数据: %s个", len(stations))
         except Exception as e:
-            print(f"获取充电站数据出错: {e}")
+            logger.error("获取充电站数据出错: %s", e)
             stations = []
             
         try:
             robots = data_access.get_robots()
-            print(f"成功获取机器人数据: {len(robots)}个")
+            logger.debug("成功获取机器人数据: %s个", len(robots))
         except Exception as e:
-            print(f"获取机器人数据出错: {e}")
+            logger.error("获取机器人数据出错: %s", e)
             robots = []
             
         try:
             orders = data_access.get_charging_orders()
-            print(f"成功获取订单数据: {len(orders)}个")
+            logger.debug("成功获取订单数据: %s个", len(orders))
         except Exception as e:
-            print(f"获取订单数据出错: {e}")
+            logger.error("获取订单数据出错: %s", e)
             orders = []
         
-        # 计算充电桩统计数据
-        total_stations = len(stations)
-        online_stations = sum(1 for s in stations if s.get('status') in ['idle', 'charging'])
-        offline_stations = total_stations - online_stations
-        
-        # 计算机器人统计数据
-        total_robots = len(robots)
-        charging_robots = sum(1 for r in robots if r.get('status') == 'charging')
-        waiting_robots = sum(1 for r in robots if r.get('battery_level', 100) < 30 and r.get('status') != 'charging')
+        # 充电桩和机器人统计与实时推送（/api/system/stream）的计数口径一致
+        counters = event_stream.dashboard_counters(stations, robots)
         
         # 计算今日充电次数
-        today = datetime.now().strftime('%Y-%m-%d')
-        today_orders = 0
-        for o in orders:
-            start_time = o.get('start_time')
-            if start_time and isinstance(start_time, str) and start_time.startswith(today):
-                today_orders += 1
+        today_orders = event_stream.count_today_orders(orders)
         
         # 计算同比增长率（模拟数据）
         # 在实际应用中，这应该与昨日数据比较
         order_change_rate = 12  # 示例数据：12%的增长率
         
-        # 确定系统状态
-        system_status = '正常'
-        system_message = '所有系统运行正常'
-        
-        # 如果有错误状态的充电站或机器人，系统状态为警告
-        error_stations = sum(1 for s in stations if s.get('status') == 'error')
-        error_robots = sum(1 for r in robots if r.get('status') == 'error')
-        
-        if error_stations > 0 or error_robots > 0:
-            system_status = '警告'
-            system_message = f'发现异常: {error_stations}个充电站, {error_robots}个机器人处于错误状态'
+        # 确定系统状态：有错误状态的充电站或机器人时为警告
+        system_status, system_message = event_stream.system_status(counters['errorStations'], counters['errorRobots'])
         
         result = {
-            'stationCount': total_stations,
-            'onlineStations': online_stations,
-            'offlineStations': offline_stations,
-            'robotCount': total_robots,
-            'chargingRobots': charging_robots,
-            'waitingRobots': waiting_robots,
+            'stationCount': counters['stationCount'],
+            'onlineStations': counters['onlineStations'],
+            'offlineStations': counters['offlineStations'],
+            'robotCount': counters['robotCount'],
+            'chargingRobots': counters['chargingRobots'],
+            'waitingRobots': counters['waitingRobots'],
             'todayOrders': today_orders,
             'orderChangeRate': order_change_rate,
             'systemStatus': system_status,
             'systemMessage': system_message
         }
         
-        print(f"获取到的仪表盘数据: {result}")
+        logger.debug("获取到的仪表盘数据: %s", result)
         return jsonify(result)
     except Exception as e:
-        print(f"获取仪表盘数据出错: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("获取仪表盘数据出错: %s", e)
         # 返回一个默认的仪表盘数据结构
         default_result = {
             'stationCount': 0,
@@ -745,7 +775,41 @@ def get_dashboard_data():
         }
         return jsonify(default_result)
 
+@system_bp.route('/stream', methods=['GET'])
+def get_event_stream():
+    """Server-Sent Events推送：机器人和充电桩的状态变化、仪表盘计数增量
+
+    连接建立时先发送snapshot事件（仪表盘计数），之后每次写操作提交发送一条change事件，
+    包含变化的机器人、充电桩字段、被删除的充电桩和计数增量（delta）及增量后的计数（counters）。
+    只推送处理该连接的进程内的写操作，连接期间占用一个请求线程，见event_stream模块说明。
+    """
+    try:
+        stream = event_stream.open_stream(
+            request.headers.get('Last-Event-ID') or request.args.get('lastEventId'),
+            max_clients=current_app.config.get('SSE_MAX_CLIENTS', 100),
+            heartbeat=current_app.config.get('SSE_HEARTBEAT_SECONDS', 15)
+        )
+    except Exception as e:
+        logger.exception("打开实时推送连接出错: %s", e)
+        return jsonify({'error': f'服务器错误: {str(e)}'}), 500
+    if stream is None:
+        logger.warning('实时推送连接数已达上限')
+        response = jsonify({'error': '实时推送连接数已达上限，请稍后重试'})
+        response.status_code = 503
+        response.headers['Retry-After'] = '30'
+        return response
+    messages, release = stream
+    response = Response(messages, mimetype='text/event-stream')
+    # 生成器未开始迭代（HEAD请求、提前断开）时由响应关闭回调释放连接名额
+    response.call_on_close(release)
+    response.headers['Cache-Control'] = 'no-cache'
+    # 禁止Nginx等反向代理缓冲事件
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
 @system_bp.route('/charging-efficiency', methods=['GET'])
+@read_replica
+@conditional(stations_version)
 # 移除JWT认证要求，确保前端可以获取数据
 # @jwt_required()
 def get_charging_efficiency():
@@ -770,9 +834,7 @@ def get_charging_efficiency():
         
         return jsonify(result)
     except Exception as e:
-        print(f"获取充电效率趋势数据出错: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("获取充电效率趋势数据出错: %s", e)
         return jsonify([]), 500
 
 # 添加一个测试路由，用于检查Excel数据是否正确加载
@@ -852,13 +914,12 @@ def test_data():
             'efficiency_logs_count': efficiency_logs_count
         }
         
-        print(f"测试数据结果: {result}")
+        logger.debug("测试数据结果: %s", result)
         return jsonify(result)
     except Exception as e:
         import traceback
         error_traceback = traceback.format_exc()
-        print(f"测试数据路由出错: {str(e)}")
-        print(error_traceback)
+        logger.exception("测试数据路由出错: %s", e)
         return jsonify({
             'error': str(e),
             'traceback': error_traceback,
@@ -874,6 +935,7 @@ def test_api_page():
 # 能效分析相关路由
 @energy_efficiency_bp.route('/kpi', methods=['GET', 'OPTIONS'])
 @energy_efficiency_bp.route('/kpi/', methods=['GET', 'OPTIONS'])
+@conditional(energy_efficiency_version)
 def get_kpi_data():
     """获取能效分析KPI指标数据"""
     # 处理OPTIONS请求
@@ -897,175 +959,25 @@ def get_kpi_data():
         if robot_ids:
             robot_ids = [int(id) for id in robot_ids.split(',')]
         
-        # 获取充电订单数据
-        orders = data_access.get_charging_orders()
-        
-        # 根据筛选条件过滤
-        filtered_orders = filter_orders(orders, start_date, end_date, station_ids, robot_ids)
+        # 从内存列式订单存储中按条件筛选充电订单
+        filtered_orders = select_orders(start_date, end_date, station_ids, robot_ids)
         
         # 计算比较期间的数据（前一个相同时间段）
-        if start_date and end_date:
-            start = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-            end = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-            
-            # 计算时间跨度
-            delta = end - start
-            
-            # 前一个相同时间段
-            prev_end = start
-            prev_start = prev_end - delta
-            
-            # 获取前一个时间段的订单
-            prev_filtered_orders = filter_orders(
-                orders, 
-                prev_start.isoformat(), 
-                prev_end.isoformat(), 
-                station_ids, 
-                robot_ids
-            )
-        else:
-            prev_filtered_orders = []
+        prev_filtered_orders, hours_in_period = previous_period_orders(start_date, end_date, station_ids, robot_ids)
         
-        # 计算KPI指标
-        # 1. 平均充电效率
-        current_efficiency_values = []
-        for order in filtered_orders:
-            if order.get('status') == 'completed':
-                # 优先使用订单中的充电效率字段
-                if 'charging_efficiency' in order and order.get('charging_efficiency') is not None:
-                    current_efficiency_values.append(order.get('charging_efficiency'))
-                # 如果没有充电效率字段，则计算
-                elif order.get('charge_amount') and order.get('end_time'):
-                    efficiency = (
-                        order.get('charge_amount', 0) / 
-                        ((parse_datetime(order.get('end_time')) - parse_datetime(order.get('start_time'))).total_seconds() / 3600) / 
-                        get_station_power(order.get('station_id')) * 100
-                    )
-                    current_efficiency_values.append(efficiency)
-        
-        avg_efficiency = sum(current_efficiency_values) / len(current_efficiency_values) if current_efficiency_values else 0
-        
-        prev_efficiency_values = []
-        for order in prev_filtered_orders:
-            if order.get('status') == 'completed':
-                # 优先使用订单中的充电效率字段
-                if 'charging_efficiency' in order and order.get('charging_efficiency') is not None:
-                    prev_efficiency_values.append(order.get('charging_efficiency'))
-                # 如果没有充电效率字段，则计算
-                elif order.get('charge_amount') and order.get('end_time'):
-                    efficiency = (
-                        order.get('charge_amount', 0) / 
-                        ((parse_datetime(order.get('end_time')) - parse_datetime(order.get('start_time'))).total_seconds() / 3600) / 
-                        get_station_power(order.get('station_id')) * 100
-                    )
-                    prev_efficiency_values.append(efficiency)
-        
-        prev_avg_efficiency = sum(prev_efficiency_values) / len(prev_efficiency_values) if prev_efficiency_values else 0
-        
-        efficiency_change = ((avg_efficiency - prev_avg_efficiency) / prev_avg_efficiency * 100) if prev_avg_efficiency else 0
-        
-        # 2. 总能耗
-        total_energy = sum([order.get('charge_amount', 0) for order in filtered_orders if order.get('status') == 'completed'])
-        prev_total_energy = sum([order.get('charge_amount', 0) for order in prev_filtered_orders if order.get('status') == 'completed'])
-        
-        energy_change = ((total_energy - prev_total_energy) / prev_total_energy * 100) if prev_total_energy else 0
-        
-        # 3. 充电器利用率
-        # 获取充电站数据
+        # 计算总可用时间（站点数 * 时间段小时数）
         stations = data_access.get_charging_stations()
-        
-        # 筛选充电站
         if station_ids:
-            filtered_stations = [s for s in stations if s['id'] in station_ids]
-        else:
-            filtered_stations = stations
-        
-        # 计算总可用时间（站点数 * 时间段小时数）
-        if start_date and end_date:
-            start = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-            end = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-            hours_in_period = (end - start).total_seconds() / 3600
-        else:
-            hours_in_period = 24 * 30  # 默认为30天
-        
-        total_available_hours = len(filtered_stations) * hours_in_period
-        
-        # 计算充电时间总和
-        total_charging_hours = sum([
-            (parse_datetime(order.get('end_time', datetime.now().isoformat())) - parse_datetime(order.get('start_time'))).total_seconds() / 3600
-            for order in filtered_orders
-        ])
-        
-        utilization = (total_charging_hours / total_available_hours * 100) if total_available_hours else 0
-        
-        # 计算前一时段的利用率
-        prev_total_charging_hours = sum([
-            (parse_datetime(order.get('end_time', datetime.now().isoformat())) - parse_datetime(order.get('start_time'))).total_seconds() / 3600
-            for order in prev_filtered_orders
-        ])
-        
-        prev_utilization = (prev_total_charging_hours / total_available_hours * 100) if total_available_hours else 0
-        utilization_change = ((utilization - prev_utilization) / prev_utilization * 100) if prev_utilization else 0
-        
-        # 4. 平均等待时间 (这里用订单创建时间到开始充电时间的差值作为等待时间)
-        wait_times = [
-            (parse_datetime(order.get('start_time')) - parse_datetime(order.get('created_at'))).total_seconds() / 60
-            for order in filtered_orders
-            if order.get('start_time') and order.get('created_at') and 
-            parse_datetime(order.get('start_time')) > parse_datetime(order.get('created_at'))
-        ]
-        
-        avg_wait_time = sum(wait_times) / len(wait_times) if wait_times else 0
-        
-        prev_wait_times = [
-            (parse_datetime(order.get('start_time')) - parse_datetime(order.get('created_at'))).total_seconds() / 60
-            for order in prev_filtered_orders
-            if order.get('start_time') and order.get('created_at') and 
-            parse_datetime(order.get('start_time')) > parse_datetime(order.get('created_at'))
-        ]
-        
-        prev_avg_wait_time = sum(prev_wait_times) / len(prev_wait_times) if prev_wait_times else 0
-        wait_time_change = ((avg_wait_time - prev_avg_wait_time) / prev_avg_wait_time * 100) if prev_avg_wait_time else 0
-        
-        # 5. 充电成功率
-        total_orders = len([order for order in filtered_orders if order.get('status') in ['completed', 'failed']])
-        successful_orders = len([order for order in filtered_orders if order.get('status') == 'completed'])
-        
-        success_rate = (successful_orders / total_orders * 100) if total_orders else 0
-        
-        prev_total_orders = len([order for order in prev_filtered_orders if order.get('status') in ['completed', 'failed']])
-        prev_successful_orders = len([order for order in prev_filtered_orders if order.get('status') == 'completed'])
-        
-        prev_success_rate = (prev_successful_orders / prev_total_orders * 100) if prev_total_orders else 0
-        success_rate_change = ((success_rate - prev_success_rate) / prev_success_rate * 100) if prev_success_rate else 0
-        
-        # 6. 总充电次数
-        total_charging_orders = len([order for order in filtered_orders if order.get('status') == 'completed'])
-        prev_total_charging_orders = len([order for order in prev_filtered_orders if order.get('status') == 'completed'])
-        
-        orders_change = ((total_charging_orders - prev_total_charging_orders) / prev_total_charging_orders * 100) if prev_total_charging_orders else 0
+            stations = [s for s in stations if s['id'] in station_ids]
         
-        # 构建返回数据
-        result = {
-            'avgEfficiency': avg_efficiency,
-            'efficiencyChange': efficiency_change,
-            'totalEnergy': total_energy,
-            'energyChange': energy_change,
-            'utilization': utilization,
-            'utilizationChange': utilization_change,
-            'avgWaitTime': avg_wait_time,
-            'waitTimeChange': wait_time_change,
-            'successRate': success_rate,
-            'successRateChange': success_rate_change,
-            'totalOrders': total_charging_orders,
-            'ordersChange': orders_change
-        }
+        # 计算KPI指标：平均充电效率、总能耗、充电器利用率、平均等待时间、充电成功率、总充电次数
+        result = kpi_panel(
+            filtered_orders, prev_filtered_orders, len(stations), hours_in_period, data_access.get_station_index()
+        )
         
         return jsonify(result)
     except Exception as e:
-        print(f"获取KPI数据失败: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("获取KPI数据失败: %s", e)
         return jsonify({
             'avgEfficiency': 0,
             'efficiencyChange': 0,
@@ -1083,6 +995,7 @@ def get_kpi_data():
 
 @energy_efficiency_bp.route('/efficiency-trend', methods=['GET', 'OPTIONS'])
 @energy_efficiency_bp.route('/efficiency-trend/', methods=['GET', 'OPTIONS'])
+@conditional(energy_efficiency_version)
 def get_efficiency_trend():
     """获取充电效率趋势数据"""
     # 处理OPTIONS请求
@@ -1113,86 +1026,27 @@ def get_efficiency_trend():
         if station_ids:
             stations_data = [s for s in stations_data if s['id'] in station_ids]
         
-        # 获取充电订单数据
-        orders = data_access.get_charging_orders()
-        
-        # 筛选订单
-        filtered_orders = filter_orders(orders, start_date, end_date, station_ids, robot_ids)
-        
         # 生成时间轴（每天一个点）
-        if start_date and end_date:
-            start = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-            end = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
+        dates = efficiency_trend_dates(start_date, end_date)
+        
+        # 按 (充电站, 日期) 汇总效率，长时间范围读取充电站小时汇总表
+        rollup_rows = None
+        if use_station_rollup(len(dates), robot_ids):
+            rollup_rows = data_access.get_station_rollup(parse_datetime(start_date), parse_datetime(end_date), station_ids)
+        if rollup_rows:
+            daily_table = rollup_daily_efficiency_table(rollup_rows)
         else:
-            # 默认最近30天
-            end = datetime.now()
-            start = end - timedelta(days=30)
+            # 汇总表没有该时间范围的数据（如导入数据后尚未重建）时仍从订单计算
+            # 从内存列式订单存储中筛选已完成的充电订单
+            filtered_orders = select_orders(start_date, end_date, station_ids, robot_ids, status='completed')
+            daily_table = daily_efficiency_table(filtered_orders, station_powers(filtered_orders, data_access.get_station_index()))
         
-        # 生成日期序列
-        delta = end - start
-        dates = [(start + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(delta.days + 1)]
-        
-        # 为每个充电站计算每日效率
-        station_efficiencies = []
-        
-        for station in stations_data:
-            station_id = station['id']
-            station_name = station['name']
-            daily_efficiencies = []
-            
-            for date in dates:
-                # 获取当天该充电站的订单
-                day_start = f"{date} 00:00:00"
-                day_end = f"{date} 23:59:59"
-                
-                day_orders = [
-                    order for order in filtered_orders
-                    if order.get('station_id') == station_id and
-                    order.get('status') == 'completed' and
-                    parse_datetime(order.get('start_time')).strftime('%Y-%m-%d') == date
-                ]
-                
-                # 计算平均效率
-                if day_orders:
-                    efficiencies = []
-                    for order in day_orders:
-                        # 优先使用订单中的充电效率字段
-                        if 'charging_efficiency' in order and order.get('charging_efficiency') is not None:
-                            efficiencies.append(order.get('charging_efficiency'))
-                        # 如果没有充电效率字段，则计算
-                        elif order.get('charge_amount') and order.get('end_time'):
-                            efficiency = (
-                                order.get('charge_amount', 0) / 
-                                ((parse_datetime(order.get('end_time')) - parse_datetime(order.get('start_time'))).total_seconds() / 3600) / 
-                                get_station_power(station_id) * 100
-                            )
-                            efficiencies.append(efficiency)
-                    
-                    avg_efficiency = sum(efficiencies) / len(efficiencies) if efficiencies else round(station.get('efficiency', 90), 2)
-                    daily_efficiencies.append(round(avg_efficiency, 2))
-                else:
-                    # 如果当天没有订单，使用前一天的效率或默认值
-                    if daily_efficiencies:
-                        daily_efficiencies.append(daily_efficiencies[-1])
-                    else:
-                        daily_efficiencies.append(round(station.get('efficiency', 90), 2))
-            
-            station_efficiencies.append({
-                'id': station_id,
-                'name': station_name,
-                'efficiencyData': daily_efficiencies
-            })
-        
-        result = {
-            'timeline': dates,
-            'stations': station_efficiencies
-        }
+        # 为每个充电站生成每日效率序列
+        result = efficiency_trend_panel(stations_data, dates, daily_table)
         
         return jsonify(result)
     except Exception as e:
-        print(f"获取充电效率趋势数据失败: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("获取充电效率趋势数据失败: %s", e)
         return jsonify({
             'timeline': [],
             'stations': []
@@ -1200,6 +1054,7 @@ def get_efficiency_trend():
 
 @energy_efficiency_bp.route('/energy-distribution', methods=['GET', 'OPTIONS'])
 @energy_efficiency_bp.route('/energy-distribution/', methods=['GET', 'OPTIONS'])
+@conditional(energy_efficiency_version)
 def get_energy_distribution():
     """获取能耗分布数据"""
     # 处理OPTIONS请求
@@ -1218,7 +1073,7 @@ def get_energy_distribution():
         robot_ids = request.args.get('robotIds')
         
         # 调试信息
-        print(f"能耗分布热力图请求参数: startDate={start_date}, endDate={end_date}, stationIds={station_ids}, robotIds={robot_ids}")
+        logger.debug("能耗分布热力图请求参数: startDate=%s, endDate=%s, stationIds=%s, robotIds=%s", start_date, end_date, station_ids, robot_ids)
         
         # 转换参数格式
         if station_ids:
@@ -1226,121 +1081,33 @@ def get_energy_distribution():
         if robot_ids:
             robot_ids = [int(id) for id in robot_ids.split(',')]
         
-        # 获取充电订单数据
-        orders = data_access.get_charging_orders()
-        print(f"获取到的订单总数: {len(orders)}")
-        
-        # 筛选订单
-        filtered_orders = filter_orders(orders, start_date, end_date, station_ids, robot_ids)
-        print(f"筛选后的订单数: {len(filtered_orders)}")
-        
-        # 检查筛选后的订单中有多少完成状态的订单
-        completed_orders = [order for order in filtered_orders if order.get('status') == 'completed']
-        print(f"筛选后的已完成订单数: {len(completed_orders)}")
-        
         # 生成日期序列
-        if start_date and end_date:
-            start = parse_datetime(start_date)
-            end = parse_datetime(end_date)
+        start, end, dates = energy_distribution_range(start_date, end_date)
+        logger.debug("生成的日期序列: %s", dates)
+        
+        rollup_rows = None
+        if use_station_rollup(len(dates), robot_ids):
+            # 长时间范围直接读取充电站小时汇总表
+            rollup_rows = data_access.get_station_rollup(start, end, station_ids)
+            logger.debug("读取的小时汇总行数: %s", len(rollup_rows))
+        if rollup_rows:
+            energy, counts = rollup_energy_matrix(rollup_rows, start, len(dates))
         else:
-            # 默认最近7天
-            end = datetime.now()
-            start = end - timedelta(days=7)
-        
-        # 生成日期序列
-        delta = end - start
-        dates = [(start + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(delta.days + 1)]
-        print(f"生成的日期序列: {dates}")
-        
-        # 初始化热力图数据
-        heatmap_data = []
-        max_value = 0
-        
-        # 计算每个时间点的能耗
-        for date in dates:
-            for hour in range(24):
-                # 当前小时的开始和结束
-                hour_start = f"{date} {hour:02d}:00:00"
-                hour_end = f"{date} {hour:02d}:59:59"
-                
-                # 获取该小时内的订单
-                hour_orders = [
-                    order for order in filtered_orders
-                    if order.get('status') == 'completed' and
-                    parse_datetime(order.get('start_time')) <= parse_datetime(hour_end) and
-                    (not order.get('end_time') or parse_datetime(order.get('end_time')) >= parse_datetime(hour_start))
-                ]
-                
-                # 计算总能耗
-                if hour_orders:
-                    # 对于跨越多个小时的订单，按时间比例分配能耗
-                    total_energy = 0
-                    
-                    for order in hour_orders:
-                        # 如果订单没有充电量数据，则使用估算值
-                        charge_amount = order.get('charge_amount')
-                        if charge_amount is None:
-                            # 使用充电效率和充电时间估算充电量
-                            if order.get('charging_efficiency') and order.get('end_time'):
-                                station_id = order.get('station_id')
-                                station_power = get_station_power(station_id)
-                                duration_hours = (parse_datetime(order.get('end_time')) - parse_datetime(order.get('start_time'))).total_seconds() / 3600
-                                charge_amount = (station_power * duration_hours * order.get('charging_efficiency', 85)) / 100
-                            else:
-                                # 如果无法估算，使用平均值 5 kWh
-                                charge_amount = 5.0
-                        else:
-                            # 确保是浮点数
-                            try:
-                                charge_amount = float(charge_amount)
-                            except (ValueError, TypeError):
-                                charge_amount = 5.0  # 转换失败时使用默认值
-                        
-                        start_time = max(parse_datetime(order.get('start_time')), parse_datetime(hour_start))
-                        end_time = min(parse_datetime(order.get('end_time', datetime.now().isoformat())), parse_datetime(hour_end))
-                        
-                        # 计算在当前小时内的时间比例
-                        total_duration = (parse_datetime(order.get('end_time', datetime.now().isoformat())) - parse_datetime(order.get('start_time'))).total_seconds()
-                        hour_duration = (end_time - start_time).total_seconds()
-                        
-                        if total_duration > 0:
-                            proportion = hour_duration / total_duration
-                            energy = charge_amount * proportion
-                            total_energy += energy
-                    
-                    # 确保数据格式正确 - 使用字符串表示小时
-                    data_point = [date, str(hour), round(total_energy, 2)]
-                    heatmap_data.append(data_point)
-                    max_value = max(max_value, total_energy)
-                else:
-                    # 即使没有数据，也添加零值点，确保热力图完整
-                    heatmap_data.append([date, str(hour), 0])
-        
-        print(f"生成的热力图数据点数: {len(heatmap_data)}")
-        print(f"最大能耗值: {max_value}")
-        
-        # 确保最大值不为0，避免热力图显示异常
-        if max_value == 0:
-            max_value = 1.0
-        
-        # 检查数据格式
-        for i, point in enumerate(heatmap_data[:5]):
-            print(f"示例数据点 {i}: {point}")
-        
-        # 固定最大值为120，与前端保持一致
-        max_value = 120
+            # 从内存列式订单存储中筛选已完成的充电订单（汇总表没有该时间范围的数据时也走这里）
+            filtered_orders = select_orders(start_date, end_date, station_ids, robot_ids, status='completed')
+            logger.debug("筛选后的已完成订单数: %s", len(filtered_orders))
+            
+            # 按时长比例将充电量分摊到各小时区间
+            powers = station_powers(filtered_orders, data_access.get_station_index())
+            energy, counts = energy_distribution_matrix(filtered_orders, powers, start, len(dates))
+        result = energy_distribution_panel(dates, energy, counts)
         
-        result = {
-            'days': dates,
-            'data': heatmap_data,
-            'maxValue': max_value
-        }
+        logger.debug("生成的热力图数据点数: %s", len(result['data']))
+        logger.debug("最大能耗值: %s", float(energy.max()) if energy.size else 0)
         
         return jsonify(result)
     except Exception as e:
-        print(f"获取能耗分布数据失败: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("获取能耗分布数据失败: %s", e)
         return jsonify({
             'days': [],
             'data': [],
@@ -1349,6 +1116,7 @@ def get_energy_distribution():
 
 @energy_efficiency_bp.route('/station-utilization', methods=['GET', 'OPTIONS'])
 @energy_efficiency_bp.route('/station-utilization/', methods=['GET', 'OPTIONS'])
+@conditional(energy_efficiency_version)
 def get_station_utilization():
     """获取充电站利用率数据"""
     # 处理OPTIONS请求
@@ -1369,6 +1137,8 @@ def get_station_utilization():
         # 转换参数格式
         if station_ids:
             station_ids = [int(id) for id in station_ids.split(',')]
+        if robot_ids:
+            robot_ids = [int(id) for id in robot_ids.split(',')]
         
         # 获取充电站数据
         stations = data_access.get_charging_stations()
@@ -1377,71 +1147,20 @@ def get_station_utilization():
         if station_ids:
             stations = [s for s in stations if s['id'] in station_ids]
         
-        # 获取充电订单数据
-        orders = data_access.get_charging_orders()
-        
-        # 筛选订单
-        filtered_orders = filter_orders(orders, start_date, end_date, station_ids, robot_ids)
-        
-        # 计算时间范围（小时）
-        if start_date and end_date:
-            start = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-            end = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-            total_hours = (end - start).total_seconds() / 3600
-        else:
-            # 默认24小时
-            total_hours = 24
+        # 从内存列式订单存储中筛选充电订单，按充电站汇总充电时间（忙碌时间）
+        filtered_orders = select_orders(start_date, end_date, station_ids, robot_ids)
         
         # 计算每个充电站的利用情况
-        result = []
-        
-        for station in stations:
-            station_id = station['id']
-            station_name = station['name']
-            
-            # 获取该充电站的订单
-            station_orders = [order for order in filtered_orders if order.get('station_id') == station_id]
-            
-            # 计算充电时间（忙碌时间）
-            busy_hours = sum([
-                (parse_datetime(order.get('end_time', datetime.now().isoformat())) - parse_datetime(order.get('start_time'))).total_seconds() / 3600
-                for order in station_orders
-            ])
-            
-            # 根据状态计算其他时间
-            station_status = station.get('status', 'idle')
-            
-            if station_status == 'maintenance':
-                maintenance_hours = total_hours - busy_hours
-                idle_hours = 0
-                error_hours = 0
-            elif station_status == 'error':
-                maintenance_hours = 0
-                idle_hours = 0
-                error_hours = total_hours - busy_hours
-            else:
-                maintenance_hours = 0
-                idle_hours = total_hours - busy_hours
-                error_hours = 0
-            
-            result.append({
-                'stationId': station_id,
-                'stationName': station_name,
-                'busyHours': round(busy_hours, 2),
-                'idleHours': round(idle_hours, 2),
-                'maintenanceHours': round(maintenance_hours, 2),
-                'errorHours': round(error_hours, 2)
-            })
+        result = station_utilization_panel(stations, filtered_orders, utilization_hours(start_date, end_date))
         
         return jsonify(result)
     except Exception as e:
-        print(f"获取充电站利用率数据失败: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("获取充电站利用率数据失败: %s", e)
         return jsonify([])
 
 @energy_efficiency_bp.route('/robot-charging-behavior', methods=['GET', 'OPTIONS'])
 @energy_efficiency_bp.route('/robot-charging-behavior/', methods=['GET', 'OPTIONS'])
+@conditional(energy_efficiency_version)
 def get_robot_charging_behavior():
     """获取机器人充电行为分析数据"""
     # 处理OPTIONS请求
@@ -1472,67 +1191,22 @@ def get_robot_charging_behavior():
         if robot_ids:
             robots_data = [r for r in robots_data if r['id'] in robot_ids]
         
-        # 获取充电订单数据
-        orders = data_access.get_charging_orders()
-        
-        # 筛选订单
-        filtered_orders = filter_orders(orders, start_date, end_date, station_ids, robot_ids)
+        # 从内存列式订单存储中筛选充电订单，按机器人汇总充电行为
+        filtered_orders = select_orders(start_date, end_date, station_ids, robot_ids)
         
         # 为每个机器人分析充电行为
-        robot_analysis = []
-        
-        for robot in robots_data:
-            robot_id = robot['id']
-            robot_name = robot['name']
-            
-            # 获取该机器人的订单
-            robot_orders = [order for order in filtered_orders if order.get('robot_id') == robot_id]
-            
-            # 充电次数
-            charging_count = len(robot_orders)
-            
-            # 平均充电时长（分钟）
-            charging_durations = [
-                (parse_datetime(order.get('end_time')) - parse_datetime(order.get('start_time'))).total_seconds() / 60
-                for order in robot_orders
-                if order.get('status') == 'completed' and order.get('end_time')
-            ]
-            
-            avg_charging_duration = sum(charging_durations) / len(charging_durations) if charging_durations else 0
-            
-            # 平均等待时间（分钟）
-            waiting_times = [
-                (parse_datetime(order.get('start_time')) - parse_datetime(order.get('created_at'))).total_seconds() / 60
-                for order in robot_orders
-                if order.get('created_at') and 
-                parse_datetime(order.get('start_time')) > parse_datetime(order.get('created_at'))
-            ]
-            
-            avg_waiting_time = sum(waiting_times) / len(waiting_times) if waiting_times else 0
-            
-            robot_analysis.append({
-                'id': robot_id,
-                'name': robot_name,
-                'chargingCount': charging_count,
-                'avgChargingDuration': round(avg_charging_duration, 2),
-                'avgWaitingTime': round(avg_waiting_time, 2)
-            })
-        
-        result = {
-            'robots': robot_analysis
-        }
+        result = robot_charging_behavior_panel(robots_data, filtered_orders)
         
         return jsonify(result)
     except Exception as e:
-        print(f"获取机器人充电行为数据失败: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("获取机器人充电行为数据失败: %s", e)
         return jsonify({
             'robots': []
         })
 
 @energy_efficiency_bp.route('/peak-analysis', methods=['GET', 'OPTIONS'])
 @energy_efficiency_bp.route('/peak-analysis/', methods=['GET', 'OPTIONS'])
+@conditional(energy_efficiency_version)
 def get_charging_peak_analysis():
     """获取充电高峰期分析数据"""
     # 处理OPTIONS请求
@@ -1556,50 +1230,13 @@ def get_charging_peak_analysis():
         if robot_ids:
             robot_ids = [int(id) for id in robot_ids.split(',')]
         
-        # 获取充电订单数据
-        orders = data_access.get_charging_orders()
-        
-        # 筛选订单
-        filtered_orders = filter_orders(orders, start_date, end_date, station_ids, robot_ids)
-        
-        # 初始化数据结构
-        hour_slots = ['0-2', '2-4', '4-6', '6-8', '8-10', '10-12', '12-14', '14-16', '16-18', '18-20', '20-22', '22-24']
-        request_counts = [0] * 12
-        waiting_times = [[] for _ in range(12)]
-        
-        # 分析每个订单
-        for order in filtered_orders:
-            created_time = parse_datetime(order.get('created_at'))
-            hour = created_time.hour
-            
-            # 确定时间段
-            slot_index = hour // 2
-            request_counts[slot_index] += 1
-            
-            # 计算等待时间
-            if order.get('start_time'):
-                start_time = parse_datetime(order.get('start_time'))
-                if start_time > created_time:
-                    wait_time = (start_time - created_time).total_seconds() / 60
-                    waiting_times[slot_index].append(wait_time)
-        
-        # 计算平均等待时间
-        avg_waiting_times = [
-            round(sum(times) / len(times), 2) if times else 0
-            for times in waiting_times
-        ]
-        
-        result = {
-            'timeSlots': hour_slots,
-            'requestCounts': request_counts,
-            'avgWaitingTimes': avg_waiting_times
-        }
+        # 从内存列式订单存储中筛选充电订单，按创建时间所在时段统计
+        filtered_orders = select_orders(start_date, end_date, station_ids, robot_ids)
+        result = peak_analysis(filtered_orders)
         
         return jsonify(result)
     except Exception as e:
-        print(f"获取充电高峰期分析数据失败: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("获取充电高峰期分析数据失败: %s", e)
         return jsonify({
             'timeSlots': [],
             'requestCounts': [],
@@ -1608,6 +1245,7 @@ def get_charging_peak_analysis():
 
 @energy_efficiency_bp.route('/charging-events', methods=['GET', 'OPTIONS'])
 @energy_efficiency_bp.route('/charging-events/', methods=['GET', 'OPTIONS'])
+@conditional(energy_efficiency_version)
 def get_charging_events():
     """获取充电事件列表数据"""
     # 处理OPTIONS请求
@@ -1634,85 +1272,17 @@ def get_charging_events():
         if robot_ids:
             robot_ids = [int(id) for id in robot_ids.split(',')]
         
-        # 获取充电订单数据
-        orders = data_access.get_charging_orders()
-        
-        # 筛选订单
-        filtered_orders = filter_orders(orders, start_date, end_date, station_ids, robot_ids)
+        # 从内存列式订单存储中筛选充电订单
+        filtered_orders = select_orders(start_date, end_date, station_ids, robot_ids)
         
-        # 获取机器人和充电站数据用于名称映射
-        robots = {r['id']: r['name'] for r in data_access.get_robots()}
-        stations = {s['id']: s['name'] for s in data_access.get_charging_stations()}
-        
-        # 转换为前端所需格式
-        events = []
-        for order in filtered_orders:
-            try:
-                robot_id = order.get('robot_id')
-                station_id = order.get('station_id')
-                
-                # 优先使用订单中的充电效率字段，如果不存在则计算
-                efficiency = None
-                if 'charging_efficiency' in order and order.get('charging_efficiency') is not None:
-                    efficiency = order.get('charging_efficiency')
-                elif order.get('status') == 'completed' and order.get('charge_amount') and order.get('end_time'):
-                    duration_hours = (parse_datetime(order.get('end_time')) - parse_datetime(order.get('start_time'))).total_seconds() / 3600
-                    station_power = get_station_power(station_id)
-                    if duration_hours > 0 and station_power > 0:
-                        efficiency = (order.get('charge_amount', 0) / (duration_hours * station_power)) * 100
-                
-                # 创建事件数据
-                event = {
-                    'id': order.get('id'),
-                    'robotId': robot_id,
-                    'robotName': robots.get(robot_id, f'机器人 {robot_id}'),
-                    'stationId': station_id,
-                    'stationName': stations.get(station_id, f'充电站 {station_id}'),
-                    'startTime': order.get('start_time'),
-                    'endTime': order.get('end_time'),
-                    'energyConsumed': order.get('charge_amount'),
-                    'efficiency': efficiency,
-                    'status': order.get('status', 'unknown')
-                }
-                
-                # 搜索过滤
-                if query:
-                    query = query.lower()
-                    if (str(event['id']).lower().find(query) >= 0 or
-                        event['robotName'].lower().find(query) >= 0 or
-                        event['stationName'].lower().find(query) >= 0 or
-                        event['status'].lower().find(query) >= 0):
-                        events.append(event)
-                else:
-                    events.append(event)
-            except Exception as e:
-                print(f"处理订单数据失败: {str(e)}, 订单: {order}")
-        
-        # 按开始时间倒序排序
-        events = sorted(events, key=lambda x: parse_datetime(x['startTime']), reverse=True)
-        
-        # 分页
-        total_items = len(events)
-        total_pages = (total_items + page_size - 1) // page_size
-        start_idx = (page - 1) * page_size
-        end_idx = min(start_idx + page_size, total_items)
-        paged_events = events[start_idx:end_idx]
-        
-        result = {
-            'items': paged_events,
-            'pagination': {
-                'totalItems': total_items,
-                'totalPages': total_pages,
-                'currentPage': page,
-                'pageSize': page_size
-            }
-        }
+        # 获取机器人和充电站数据用于名称映射，转换为前端所需格式并分页
+        result = charging_events_panel(
+            filtered_orders, data_access.get_robots(), data_access.get_station_index(), page, page_size, query
+        )
         
         return jsonify(result)
     except Exception as e:
-        print(f"获取充电事件列表失败: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("获取充电事件列表失败: %s", e)
         return jsonify({
             'items': [],
             'pagination': {
@@ -1749,15 +1319,12 @@ def export_energy_data():
         if robot_ids:
             robot_ids = [int(id) for id in robot_ids.split(',')]
         
-        # 获取充电订单数据
-        orders = data_access.get_charging_orders()
-        
-        # 筛选订单
-        filtered_orders = filter_orders(orders, start_date, end_date, station_ids, robot_ids)
+        # 从内存列式订单存储中筛选充电订单
+        filtered_orders = select_orders(start_date, end_date, station_ids, robot_ids).records()
         
         # 获取机器人和充电站数据用于名称映射
         robots = {r['id']: r['name'] for r in data_access.get_robots()}
-        stations = {s['id']: s['name'] for s in data_access.get_charging_stations()}
+        stations = {station_id: station['name'] for station_id, station in data_access.get_station_index().items()}
         
         # 转换为导出格式
         export_data = []
@@ -1808,7 +1375,7 @@ def export_energy_data():
                 
                 export_data.append(export_row)
             except Exception as e:
-                print(f"处理导出数据失败: {str(e)}, 订单: {order}")
+                logger.error("处理导出数据失败: %s, 订单: %s", e, order)
         
         # 生成CSV或Excel文件
         if export_type == 'csv':
@@ -1857,62 +1424,497 @@ def export_energy_data():
             )
             return response
     except Exception as e:
-        print(f"导出能效分析数据失败: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("导出能效分析数据失败: %s", e)
         return jsonify({'error': '导出数据失败'}), 500
 
+# 能效分析汇总接口的面板及计算出错时的默认数据（与各单独接口出错时的返回一致）
+BUNDLE_PANEL_DEFAULTS = {
+    'kpi': {
+        'avgEfficiency': 0,
+        'efficiencyChange': 0,
+        'totalEnergy': 0,
+        'energyChange': 0,
+        'utilization': 0,
+        'utilizationChange': 0,
+        'avgWaitTime': 0,
+        'waitTimeChange': 0,
+        'successRate': 0,
+        'successRateChange': 0,
+        'totalOrders': 0,
+        'ordersChange': 0
+    },
+    'efficiencyTrend': {'timeline': [], 'stations': []},
+    'energyDistribution': {'days': [], 'data': [], 'maxValue': 0},
+    'stationUtilization': [],
+    'robotChargingBehavior': {'robots': []},
+    'peakAnalysis': {'timeSlots': [], 'requestCounts': [], 'avgWaitingTimes': []},
+    'chargingEvents': {
+        'items': [],
+        'pagination': {'totalItems': 0, 'totalPages': 0, 'currentPage': 1, 'pageSize': 20}
+    }
+}
+
+_bundle_executor = None
+_bundle_executor_lock = threading.Lock()
+
+def _get_bundle_executor(workers):
+    """获取计算面板的线程池（进程内共享，首次使用时创建）"""
+    global _bundle_executor
+    with _bundle_executor_lock:
+        if _bundle_executor is None:
+            _bundle_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='energy-bundle')
+        return _bundle_executor
+
+def _compute_panel(name, compute):
+    """计算单个面板，出错时只该面板返回默认数据"""
+    try:
+        return compute()
+    except Exception as e:
+        logger.exception("计算能效分析面板 %s 失败: %s", name, e)
+        return BUNDLE_PANEL_DEFAULTS[name]
+
+@energy_efficiency_bp.route('/bundle', methods=['GET', 'OPTIONS'])
+@energy_efficiency_bp.route('/bundle/', methods=['GET', 'OPTIONS'])
+@conditional(energy_efficiency_version)
+def get_energy_efficiency_bundle():
+    """一次返回能效分析页面的全部面板数据
+
+    订单只从内存列式订单存储中筛选一次，充电站、机器人和小时汇总数据也只读取一次，
+    各面板基于同一份数据计算；ENERGY_BUNDLE_WORKERS大于1时面板在线程池中并行计算。
+    panels参数（逗号分隔）可只返回部分面板，充电事件的分页和搜索参数与 /charging-events 相同。
+    """
+    # 处理OPTIONS请求
+    if request.method == 'OPTIONS':
+        response = jsonify({})
+        response.headers.add('Access-Control-Allow-Origin', '*')
+        response.headers.add('Access-Control-Allow-Headers', '*')
+        response.headers.add('Access-Control-Allow-Methods', 'GET, OPTIONS')
+        return response
+
+    try:
+        # 获取筛选参数
+        start_date = request.args.get('startDate')
+        end_date = request.args.get('endDate')
+        station_ids = request.args.get('stationIds')
+        robot_ids = request.args.get('robotIds')
+        page = request.args.get('page', 1, type=int)
+        page_size = request.args.get('pageSize', 20, type=int)
+        query = request.args.get('query', '')
+        panels = request.args.get('panels')
+        names = [name for name in BUNDLE_PANEL_DEFAULTS if not panels or name in panels.split(',')]
+        
+        # 转换参数格式
+        if station_ids:
+            station_ids = [int(id) for id in station_ids.split(',')]
+        if robot_ids:
+            robot_ids = [int(id) for id in robot_ids.split(',')]
+        
+        # 公共数据在请求线程中读取，面板计算不再访问数据库
+        orders = select_orders(start_date, end_date, station_ids, robot_ids)
+        completed = orders.select(status='completed')
+        station_index = data_access.get_station_index()
+        stations = data_access.get_charging_stations()
+        if station_ids:
+            stations = [s for s in stations if s['id'] in station_ids]
+        robots = data_access.get_robots()
+        
+        rollups = {}
+        def station_rollup(start, end):
+            # 效率趋势和能耗分布的时间范围相同时共用一次小时汇总表查询；
+            # 汇总表没有该时间范围的数据（如导入数据后尚未重建）时面板改为从订单计算
+            if (start, end) not in rollups:
+                rollups[(start, end)] = data_access.get_station_rollup(start, end, station_ids)
+            return rollups[(start, end)]
+        
+        tasks = {}
+        if 'kpi' in names:
+            prev_orders, hours_in_period = previous_period_orders(start_date, end_date, station_ids, robot_ids)
+            tasks['kpi'] = lambda: kpi_panel(orders, prev_orders, len(stations), hours_in_period, station_index)
+        
+        if 'efficiencyTrend' in names:
+            trend_dates = efficiency_trend_dates(start_date, end_date)
+            trend_rollup = None
+            if use_station_rollup(len(trend_dates), robot_ids):
+                trend_rollup = station_rollup(parse_datetime(start_date), parse_datetime(end_date))
+            
+            def efficiency_trend():
+                if trend_rollup:
+                    daily_table = rollup_daily_efficiency_table(trend_rollup)
+                else:
+                    daily_table = daily_efficiency_table(completed, station_powers(completed, station_index))
+                return efficiency_trend_panel(stations, trend_dates, daily_table)
+            tasks['efficiencyTrend'] = efficiency_trend
+        
+        if 'energyDistribution' in names:
+            distribution_start, distribution_end, distribution_dates = energy_distribution_range(start_date, end_date)
+            distribution_rollup = None
+            if use_station_rollup(len(distribution_dates), robot_ids):
+                distribution_rollup = station_rollup(distribution_start, distribution_end)
+            
+            def energy_distribution():
+                if distribution_rollup:
+                    energy, counts = rollup_energy_matrix(distribution_rollup, distribution_start, len(distribution_dates))
+                else:
+                    energy, counts = energy_distribution_matrix(
+                        completed, station_powers(completed, station_index), distribution_start, len(distribution_dates)
+                    )
+                return energy_distribution_panel(distribution_dates, energy, counts)
+            tasks['energyDistribution'] = energy_distribution
+        
+        if 'stationUtilization' in names:
+            total_hours = utilization_hours(start_date, end_date)
+            tasks['stationUtilization'] = lambda: station_utilization_panel(stations, orders, total_hours)
+        
+        if 'robotChargingBehavior' in names:
+            selected_robots = [r for r in robots if r['id'] in robot_ids] if robot_ids else robots
+            tasks['robotChargingBehavior'] = lambda: robot_charging_behavior_panel(selected_robots, orders)
+        
+        if 'peakAnalysis' in names:
+            tasks['peakAnalysis'] = lambda: peak_analysis(orders)
+        
+        if 'chargingEvents' in names:
+            tasks['chargingEvents'] = lambda: charging_events_panel(orders, robots, station_index, page, page_size, query)
+        
+        workers = current_app.config.get('ENERGY_BUNDLE_WORKERS', 4)
+        if workers > 1 and len(tasks) > 1:
+            executor = _get_bundle_executor(workers)
+            futures = {name: executor.submit(_compute_panel, name, compute) for name, compute in tasks.items()}
+            result = {name: future.result() for name, future in futures.items()}
+        else:
+            result = {name: _compute_panel(name, compute) for name, compute in tasks.items()}
+        
+        return jsonify(result)
+    except Exception as e:
+        logger.exception("获取能效分析汇总数据失败: %s", e)
+        return jsonify(BUNDLE_PANEL_DEFAULTS)
+
 # 辅助函数
+def station_item(station):
+    """充电桩列表接口返回的字段"""
+    return {
+        'id': station['id'],
+        'name': station['name'],
+        'location': station['location'],
+        'status': station['status'],
+        'power_rating': station.get('power_rating', station.get('power_output', 0)),
+        'efficiency': station.get('efficiency', 100)
+    }
 
-def parse_datetime(datetime_str):
-    """解析日期时间字符串"""
-    if not datetime_str:
-        return datetime.now().replace(tzinfo=None)
+def robot_item(robot):
+    """机器人列表接口返回的字段"""
+    return {
+        'id': robot['id'],
+        'name': robot['name'],
+        'battery_level': robot['battery_level'],
+        'status': robot['status'],
+        'last_charging': robot.get('last_charging', None),
+        'station_id': robot.get('station_id', None)  # 添加充电桩ID字段
+    }
+
+def order_item(order):
+    """订单列表接口返回的字段"""
+    item = {
+        'id': order['id'],
+        'robot_id': order['robot_id'],
+        'station_id': order['station_id'],
+        'start_time': order['start_time'],
+        'status': order['status']
+    }
+    
+    # 处理可能的NaN值
+    if 'end_time' in order and order['end_time'] is not None:
+        item['end_time'] = order['end_time']
+    else:
+        item['end_time'] = None
     
+    # 处理金额，避免NaN值
+    amount = order.get('amount', order.get('charge_amount', None))
+    if amount is not None and not isinstance(amount, str):
+        try:
+            float(amount)  # 尝试转换为浮点数，检查是否是NaN
+            item['amount'] = amount
+        except (ValueError, TypeError):
+            item['amount'] = None
+    else:
+        item['amount'] = amount
+    return item
+
+def delta_sync_response(kind, format_item):
+    """列表接口的增量同步（?since=游标）
+
+    since为空或0时返回全部数据，否则只返回游标之后变化的行（items）和被删除的ID（deleted）；
+    响应中的cursor用于下一次同步，hasMore为true时应立即用新游标继续读取。
+    """
+    try:
+        cursor = data_access.decode_sync_cursor(request.args.get('since', ''))
+    except ValueError:
+        return jsonify({'error': 'since游标格式无效'}), 400
+    limit = min(max(request.args.get('limit', current_app.config.get('SYNC_PAGE_SIZE', 1000), type=int), 1), 10000)
     try:
-        # 尝试解析ISO格式
-        dt = datetime.fromisoformat(datetime_str.replace('Z', '+00:00'))
-        # 去除时区信息，确保所有日期时间都是offset-naive的
-        return dt.replace(tzinfo=None)
-    except:
+        changes = data_access.get_changes(kind, cursor, limit, current_app.config.get('SYNC_CURSOR_LAG_SECONDS', 5))
+    except Exception as e:
+        logger.exception("增量同步%s出错: %s", kind, e)
+        return jsonify({'error': f'服务器错误: {str(e)}'}), 500
+    
+    items = []
+    for row in changes['rows']:
         try:
-            # 尝试解析其他格式
-            return datetime.strptime(datetime_str, '%Y-%m-%d %H:%M:%S')
-        except:
-            return datetime.now().replace(tzinfo=None)
+            items.append(format_item(row))
+        except Exception as e:
+            logger.error("处理增量同步数据时出错: %s, 数据: %s", e, row)
+    return jsonify({
+        'items': items,
+        'deleted': changes['deleted'],
+        'cursor': data_access.encode_sync_cursor(changes['cursor']),
+        'hasMore': changes['has_more'],
+        'full': cursor is None
+    })
+
 
-def get_station_power(station_id):
+def get_station_power(station_id, station_index=None):
     """获取充电站的功率"""
-    stations = data_access.get_charging_stations()
+    if station_index is None:
+        station_index = data_access.get_station_index()
+    station = station_index.get(station_id)
+    if station is None:
+        return 10  # 默认值
+    return station['power']
+
+def use_station_rollup(num_days, robot_ids=None):
+    """时间范围较长且未按机器人筛选时使用充电站小时汇总表（汇总表不区分机器人）"""
+    return not robot_ids and num_days > current_app.config.get('STATION_ROLLUP_MIN_DAYS', 31)
+
+def select_orders(start_date=None, end_date=None, station_ids=None, robot_ids=None, status=None):
+    """根据条件从内存列式订单存储中筛选订单"""
+    # 确保时间参数是无时区的
+    start = parse_datetime(start_date) if start_date else None
+    end = parse_datetime(end_date) if end_date else None
+    return order_store.get_order_frame().select(start, end, station_ids, robot_ids, status)
+
+def previous_period_orders(start_date, end_date, station_ids=None, robot_ids=None):
+    """KPI比较期间（前一个相同长度的时间段）的订单和当前时间段的小时数"""
+    if not (start_date and end_date):
+        return OrderFrame.empty(), 24 * 30  # 默认为30天
+
+    start = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
+    end = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
+    delta = end - start
+    prev_orders = select_orders((start - delta).isoformat(), start.isoformat(), station_ids, robot_ids)
+    return prev_orders, delta.total_seconds() / 3600
+
+def efficiency_trend_dates(start_date, end_date):
+    """充电效率趋势的时间轴（每天一个点），默认最近30天"""
+    if start_date and end_date:
+        start = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
+        end = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
+    else:
+        end = datetime.now()
+        start = end - timedelta(days=30)
+    delta = end - start
+    return [(start + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(delta.days + 1)]
+
+def energy_distribution_range(start_date, end_date):
+    """能耗分布的时间范围和日期序列 (开始, 结束, 日期列表)，默认最近7天"""
+    if start_date and end_date:
+        start = parse_datetime(start_date)
+        end = parse_datetime(end_date)
+    else:
+        end = datetime.now()
+        start = end - timedelta(days=7)
+    delta = end - start
+    return start, end, [(start + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(delta.days + 1)]
+
+def utilization_hours(start_date, end_date):
+    """充电站利用率的时间范围（小时），默认24小时"""
+    if start_date and end_date:
+        start = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
+        end = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
+        return (end - start).total_seconds() / 3600
+    return 24
+
+# 以下面板函数只基于传入的订单快照和基础数据计算，不访问数据库和请求上下文，可在线程池中执行
+
+def kpi_panel(orders, prev_orders, station_count, hours_in_period, station_index):
+    """KPI指标：平均充电效率、总能耗、充电器利用率、平均等待时间、充电成功率、总充电次数"""
+    return kpi_metrics(
+        orders,
+        station_powers(orders, station_index),
+        prev_orders,
+        station_powers(prev_orders, station_index),
+        station_count * hours_in_period
+    )
+
+def efficiency_trend_panel(stations, dates, daily_table):
+    """由 (充电站, 日期) 效率汇总表生成每个充电站的每日效率序列"""
+    station_efficiencies = []
+    
     for station in stations:
-        if station['id'] == station_id:
-            return station.get('power_output', station.get('power_rating', 10))
-    return 10  # 默认值
+        station_id = station['id']
+        station_name = station['name']
+        default_efficiency = round(station['efficiency'] if station.get('efficiency') is not None else 90, 2)
+        daily_efficiencies = []
+        
+        for date in dates:
+            stats = daily_table.get((station_id, date))
+            if stats:
+                # 当天有订单时计算平均效率，没有可用效率时使用充电站默认效率
+                order_count, efficiency_sum, efficiency_count = stats
+                avg_efficiency = efficiency_sum / efficiency_count if efficiency_count else default_efficiency
+                daily_efficiencies.append(round(avg_efficiency, 2))
+            elif daily_efficiencies:
+                # 如果当天没有订单，使用前一天的效率
+                daily_efficiencies.append(daily_efficiencies[-1])
+            else:
+                daily_efficiencies.append(default_efficiency)
+        
+        station_efficiencies.append({
+            'id': station_id,
+            'name': station_name,
+            'efficiencyData': daily_efficiencies
+        })
+    
+    return {
+        'timeline': dates,
+        'stations': station_efficiencies
+    }
+
+def energy_distribution_panel(dates, energy, counts):
+    """能耗分布热力图数据"""
+    return {
+        'days': dates,
+        'data': energy_distribution_points(dates, energy, counts),
+        'maxValue': 120  # 固定最大值为120，与前端保持一致
+    }
 
-def filter_orders(orders, start_date=None, end_date=None, station_ids=None, robot_ids=None):
-    """根据条件筛选订单"""
-    filtered = orders.copy()
+def station_utilization_panel(stations, orders, total_hours):
+    """按充电站汇总忙碌时间，其余时间按充电站状态计为空闲、维护或故障"""
+    station_busy = station_busy_hours(orders)
+    result = []
     
-    # 按时间筛选
-    if start_date:
-        # 确保start是无时区的
-        start = parse_datetime(start_date)
-        filtered = [order for order in filtered if parse_datetime(order.get('start_time')) >= start]
+    for station in stations:
+        station_id = station['id']
+        station_name = station['name']
+        
+        busy_hours = station_busy.get(station_id, 0)
+        
+        # 根据状态计算其他时间
+        station_status = station.get('status', 'idle')
+        
+        if station_status == 'maintenance':
+            maintenance_hours = total_hours - busy_hours
+            idle_hours = 0
+            error_hours = 0
+        elif station_status == 'error':
+            maintenance_hours = 0
+            idle_hours = 0
+            error_hours = total_hours - busy_hours
+        else:
+            maintenance_hours = 0
+            idle_hours = total_hours - busy_hours
+            error_hours = 0
+        
+        result.append({
+            'stationId': station_id,
+            'stationName': station_name,
+            'busyHours': round(busy_hours, 2),
+            'idleHours': round(idle_hours, 2),
+            'maintenanceHours': round(maintenance_hours, 2),
+            'errorHours': round(error_hours, 2)
+        })
     
-    if end_date:
-        # 确保end是无时区的
-        end = parse_datetime(end_date)
-        filtered = [order for order in filtered if parse_datetime(order.get('start_time')) <= end]
+    return result
+
+def robot_charging_behavior_panel(robots, orders):
+    """每个机器人的充电次数、平均充电时长（分钟）和平均等待时间（分钟）"""
+    robot_stats = robot_charging_stats(orders)
+    robot_analysis = []
+    
+    for robot in robots:
+        robot_id = robot['id']
+        stats = robot_stats.get(robot_id, {'count': 0, 'avg_duration': 0, 'avg_wait': 0})
+        robot_analysis.append({
+            'id': robot_id,
+            'name': robot['name'],
+            'chargingCount': stats['count'],
+            'avgChargingDuration': round(stats['avg_duration'], 2),
+            'avgWaitingTime': round(stats['avg_wait'], 2)
+        })
+    
+    return {
+        'robots': robot_analysis
+    }
+
+def charging_events_panel(orders, robots, station_index, page=1, page_size=20, query=''):
+    """充电事件列表：按关键字过滤、按开始时间倒序排序后分页"""
+    # 机器人和充电站名称映射
+    robot_names = {r['id']: r['name'] for r in robots}
+    stations = {station_id: station['name'] for station_id, station in station_index.items()}
+    
+    # 转换为前端所需格式
+    events = []
+    for order in orders.records():
+        try:
+            robot_id = order.get('robot_id')
+            station_id = order.get('station_id')
+    
+            # 优先使用订单中的充电效率字段，如果不存在则计算
+            efficiency = None
+            if 'charging_efficiency' in order and order.get('charging_efficiency') is not None:
+                efficiency = order.get('charging_efficiency')
+            elif order.get('status') == 'completed' and order.get('charge_amount') and order.get('end_time'):
+                duration_hours = (parse_datetime(order.get('end_time')) - parse_datetime(order.get('start_time'))).total_seconds() / 3600
+                station_power = get_station_power(station_id, station_index)
+                if duration_hours > 0 and station_power > 0:
+                    efficiency = (order.get('charge_amount', 0) / (duration_hours * station_power)) * 100
     
-    # 按充电站筛选
-    if station_ids:
-        filtered = [order for order in filtered if order.get('station_id') in station_ids]
+            # 创建事件数据
+            event = {
+                'id': order.get('id'),
+                'robotId': robot_id,
+                'robotName': robot_names.get(robot_id, f'机器人 {robot_id}'),
+                'stationId': station_id,
+                'stationName': stations.get(station_id, f'充电站 {station_id}'),
+                'startTime': order.get('start_time'),
+                'endTime': order.get('end_time'),
+                'energyConsumed': order.get('charge_amount'),
+                'efficiency': efficiency,
+                'status': order.get('status', 'unknown')
+            }
+    
+            # 搜索过滤
+            if query:
+                query = query.lower()
+                if (str(event['id']).lower().find(query) >= 0 or
+                    event['robotName'].lower().find(query) >= 0 or
+                    event['stationName'].lower().find(query) >= 0 or
+                    event['status'].lower().find(query) >= 0):
+                    events.append(event)
+            else:
+                events.append(event)
+        except Exception as e:
+            logger.error("处理订单数据失败: %s, 订单: %s", e, order)
+    
+    # 按开始时间倒序排序
+    events = sorted(events, key=lambda x: parse_datetime(x['startTime']), reverse=True)
     
-    # 按机器人筛选
-    if robot_ids:
-        filtered = [order for order in filtered if order.get('robot_id') in robot_ids]
+    # 分页
+    total_items = len(events)
+    total_pages = (total_items + page_size - 1) // page_size
+    start_idx = (page - 1) * page_size
+    end_idx = min(start_idx + page_size, total_items)
+    paged_events = events[start_idx:end_idx]
     
-    return filtered
+    result = {
+        'items': paged_events,
+        'pagination': {
+            'totalItems': total_items,
+            'totalPages': total_pages,
+            'currentPage': page,
+            'pageSize': page_size
+        }
+    }
+    
+    return result
 
 # 处理OPTIONS请求的通用函数
 @energy_efficiency_bp.route('/<path:path>', methods=['OPTIONS'])
@@ -1937,21 +1939,19 @@ def handle_root_options_requests():
 def release_robot_from_station(robot_id):
     """解除机器人与充电桩的关联"""
     try:
-        print(f"接收到解除机器人关联请求: 机器人ID={robot_id}")
+        logger.debug("接收到解除机器人关联请求: 机器人ID=%s", robot_id)
         
         # 调用数据访问函数解除机器人与充电桩的关联
         success, message = data_access.release_robot_from_station(robot_id)
         
         if success:
-            print(f"成功解除机器人关联: {message}")
+            logger.info("成功解除机器人关联: %s", message)
             # 清除缓存，确保下次获取最新数据
             data_access.clear_cache()
             return jsonify({'message': message})
         else:
-            print(f"解除机器人关联失败: {message}")
+            logger.warning("解除机器人关联失败: %s", message)
             return jsonify({'error': message}), 400
     except Exception as e:
-        print(f"解除机器人关联出错: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("解除机器人关联出错: %s", e)
         return jsonify({'error': f'服务器错误: {str(e)}'}), 500
\ No newline at end of file
@@ -0,0 +1,212 @@
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque, OrderedDict
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+from flask import has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# 慢查询日志：耗时超过阈值的SQL连同参数、调用位置（接口和data_access函数）记录到内存和滚动日志文件，
+# SELECT语句的执行计划由后台线程另开连接执行EXPLAIN获取，不占用请求线程
+
+logger = logging.getLogger(__name__)
+
+_RECENT_SIZE = 200       # 内存中保留的最近慢查询条数
+_PLAN_CACHE_SIZE = 500   # 同一SQL只EXPLAIN一次
+_MAX_PARAM_LENGTH = 500  # 参数文本的最大长度
+
+_threshold = 0.2
+_explain_enabled = True
+_recent = deque(maxlen=_RECENT_SIZE)
+_plans = OrderedDict()   # SQL文本 -> 执行计划
+_lock = threading.Lock()
+_queue = queue.Queue(1000)
+_worker = None
+_file_logger = None
+_stats = {'slow_queries': 0, 'explained': 0, 'explain_errors': 0, 'dropped': 0}
+
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def _call_site():
+    """找出发起查询的data_access函数和最内层的应用代码位置"""
+    frame = sys._getframe(2)
+    data_access_frame = None
+    app_frame = None
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_APP_DIR) and not filename.endswith('slow_query.py'):
+            if app_frame is None:
+                app_frame = frame
+            if data_access_frame is None and filename.endswith('data_access.py'):
+                data_access_frame = frame
+        frame = frame.f_back
+
+    def describe(f):
+        if f is None:
+            return None
+        module = os.path.splitext(os.path.basename(f.f_code.co_filename))[0]
+        return f'{module}.{f.f_code.co_name}:{f.f_lineno}'
+
+    return describe(data_access_frame), describe(app_frame)
+
+def _format_params(parameters, executemany):
+    if executemany and isinstance(parameters, (list, tuple)):
+        text = repr(list(parameters[:3])) + (f' ... 共{len(parameters)}组' if len(parameters) > 3 else '')
+    else:
+        text = repr(parameters)
+    return text if len(text) <= _MAX_PARAM_LENGTH else text[:_MAX_PARAM_LENGTH] + '...'
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # 与metrics相同，开始时间记录在本次执行的上下文上，出错的语句不会留下记录
+    if context is not None:
+        context._slow_query_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_slow_query_started', None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    if elapsed < _threshold or threading.current_thread() is _worker:
+        return
+
+    data_access_func, app_site = _call_site()
+    entry = {
+        'time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'duration_ms': round(elapsed * 1000, 2),
+        'statement': statement,
+        'parameters': _format_params(parameters, executemany),
+        'route': request.endpoint if has_request_context() else None,
+        'path': request.path if has_request_context() else None,
+        'data_access': data_access_func,
+        'caller': app_site,
+        'plan': None,
+        'full_scan': None
+    }
+    with _lock:
+        _recent.append(entry)
+        _stats['slow_queries'] += 1
+    logger.warning("慢查询 %.1f ms [%s] %s", entry['duration_ms'], data_access_func or app_site, statement[:200])
+
+    # EXPLAIN和写文件交给后台线程
+    try:
+        _queue.put_nowait((conn.engine, statement, parameters if not executemany else None, entry))
+    except queue.Full:
+        with _lock:
+            _stats['dropped'] += 1
+
+def _explain(engine, statement, parameters):
+    """另开连接执行EXPLAIN，返回 (计划行列表, 是否全表扫描)"""
+    with engine.connect() as conn:
+        if engine.dialect.name == 'sqlite':
+            rows = conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters or ()).fetchall()
+            plan = [row[-1] for row in rows]
+            # SQLite中不带索引的 SCAN 表示全表扫描
+            full_scan = any(line.startswith('SCAN') and 'INDEX' not in line for line in plan)
+            return plan, full_scan
+
+        result = conn.exec_driver_sql('EXPLAIN ' + statement, parameters or ())
+        columns = list(result.keys())
+        plan = []
+        full_scan = False
+        for row in result.fetchall():
+            row = dict(zip(columns, row))
+            plan.append(f"table={row.get('table')} type={row.get('type')} key={row.get('key')} "
+                        f"rows={row.get('rows')} extra={row.get('Extra')}")
+            full_scan = full_scan or row.get('type') == 'ALL'
+        return plan, full_scan
+
+def _process(engine, statement, parameters, entry):
+    if _explain_enabled and statement.lstrip()[:6].upper() == 'SELECT':
+        with _lock:
+            cached = _plans.get(statement)
+        if cached is None:
+            try:
+                cached = _explain(engine, statement, parameters)
+                with _lock:
+                    _plans[statement] = cached
+                    while len(_plans) > _PLAN_CACHE_SIZE:
+                        _plans.popitem(last=False)
+                    _stats['explained'] += 1
+            except Exception as e:
+                cached = ([f'EXPLAIN失败: {e}'], None)
+                with _lock:
+                    _stats['explain_errors'] += 1
+        with _lock:
+            entry['plan'], entry['full_scan'] = cached
+    if _file_logger is not None:
+        _file_logger.info(json.dumps(entry, ensure_ascii=False, default=str))
+
+def _run():
+    while True:
+        item = _queue.get()
+        try:
+            _process(*item)
+        except Exception:
+            logger.exception("处理慢查询记录出错")
+
+def init_app(app):
+    """根据配置注册SQL事件、滚动日志文件和EXPLAIN后台线程"""
+    global _threshold, _explain_enabled, _worker, _file_logger
+    _threshold = app.config.get('SLOW_QUERY_THRESHOLD_MS', 200) / 1000
+    _explain_enabled = app.config.get('SLOW_QUERY_EXPLAIN', True)
+
+    with _lock:
+        log_file = app.config.get('SLOW_QUERY_LOG_FILE')
+        if _file_logger is None and log_file:
+            try:
+                os.makedirs(os.path.dirname(log_file), exist_ok=True)
+                handler = RotatingFileHandler(
+                    log_file,
+                    maxBytes=app.config.get('SLOW_QUERY_LOG_MAX_BYTES', 10 * 1024 * 1024),
+                    backupCount=app.config.get('SLOW_QUERY_LOG_BACKUP_COUNT', 5),
+                    encoding='utf-8'
+                )
+                handler.setFormatter(logging.Formatter('%(message)s'))
+                _file_logger = logging.getLogger('slow_queries')
+                _file_logger.handlers = [handler]
+                _file_logger.setLevel(logging.INFO)
+                _file_logger.propagate = False
+            except OSError as e:
+                logger.error("无法创建慢查询日志文件 %s: %s", log_file, e)
+
+        if _worker is None:
+            _worker = threading.Thread(target=_run, name='slow-query-explain', daemon=True)
+            _worker.start()
+
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+def get_slow_queries(limit=50):
+    """获取最近的慢查询（新的在前）和按SQL汇总的统计"""
+    with _lock:
+        entries = [dict(entry) for entry in _recent]
+        stats = dict(_stats)
+
+    summary = {}
+    for entry in entries:
+        item = summary.get(entry['statement'])
+        if item is None:
+            item = summary[entry['statement']] = {
+                'statement': entry['statement'], 'count': 0, 'total_ms': 0, 'max_ms': 0,
+                'data_access': entry['data_access'], 'full_scan': entry['full_scan']
+            }
+        item['count'] += 1
+        item['total_ms'] = round(item['total_ms'] + entry['duration_ms'], 2)
+        item['max_ms'] = max(item['max_ms'], entry['duration_ms'])
+        if entry['full_scan'] is not None:
+            item['full_scan'] = entry['full_scan']
+
+    return {
+        'threshold_ms': round(_threshold * 1000, 2),
+        'stats': stats,
+        'summary': sorted(summary.values(), key=lambda item: item['total_ms'], reverse=True),
+        'queries': entries[::-1][:limit]
+    }
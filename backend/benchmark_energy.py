@@ -0,0 +1,322 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import event
+
+import config
+
+# 能效分析接口基准测试：在SQLite（默认临时文件）或MySQL测试库中按不同订单规模生成数据，
+# 通过Flask测试客户端请求各能效接口，记录延迟分位数、SQL查询次数和内存峰值，结果保存为JSON便于跨提交对比
+
+ENDPOINTS = [
+    'kpi',
+    'efficiency-trend',
+    'energy-distribution',
+    'station-utilization',
+    'robot-charging-behavior',
+    'peak-analysis',
+    'charging-events',
+    'export',
+    'bundle',
+]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='能效分析接口基准测试')
+    parser.add_argument('--scales', default='1000,100000,1000000', help='订单规模，逗号分隔')
+    parser.add_argument('--robots', type=int, default=500, help='机器人数量')
+    parser.add_argument('--stations', type=int, default=50, help='充电桩数量')
+    parser.add_argument('--days', type=int, default=180, help='订单时间跨度（天）')
+    parser.add_argument('--repeat', type=int, default=20, help='每个用例的热请求次数')
+    parser.add_argument('--max-seconds', type=float, default=10.0, help='单个用例热请求的最长总耗时（秒）')
+    parser.add_argument('--endpoints', help='只测试指定接口，逗号分隔，默认全部')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--db', help='数据库URI，默认使用临时SQLite文件（MySQL请使用单独的测试库，数据会被清空）')
+    parser.add_argument('--json', help='将结果写入JSON文件')
+    parser.add_argument('--compare', help='与之前保存的JSON结果对比热请求p50延迟')
+    return parser.parse_args()
+
+def _create_app(database_uri):
+    """使用指定数据库创建应用（测试期间不启动自动充电后台任务）"""
+    config.Config.SQLALCHEMY_DATABASE_URI = database_uri
+    config.Config.CHARGING_WORKER_ENABLED = False
+    from app import create_app
+    return create_app()
+
+def seed_orders(db, args, orders, rng):
+    """重建表并按列批量写入充电桩、机器人和充电订单，每个充电桩最多一个充电中订单"""
+    from app.models import Robot, ChargingStation, ChargingOrder
+
+    db.drop_all()
+    db.create_all()
+    power = rng.choice([5.0, 7.5, 10.0, 12.0], size=args.stations)
+    db.session.bulk_insert_mappings(ChargingStation, [
+        {'id': i + 1, 'name': f'基准充电桩-{i + 1:03d}', 'location': f'区域-{i % 10}', 'status': 'idle',
+         'power_output': float(power[i]), 'power_rating': float(power[i]), 'efficiency': 90.0}
+        for i in range(args.stations)
+    ])
+    db.session.bulk_insert_mappings(Robot, [
+        {'id': i, 'name': f'基准机器人-{i:05d}', 'battery_level': 80.0, 'status': 'working'}
+        for i in range(1, args.robots + 1)
+    ])
+    db.session.commit()
+
+    now = datetime.now().replace(microsecond=0)
+    span_minutes = args.days * 24 * 60
+    order_table = ChargingOrder.__table__
+    chunk_size = 50000
+    for offset in range(0, orders, chunk_size):
+        n = min(chunk_size, orders - offset)
+        start_minutes = rng.integers(0, span_minutes, size=n)
+        durations = rng.integers(10, 240, size=n)
+        station_ids = rng.integers(1, args.stations + 1, size=n)
+        robot_ids = rng.integers(1, args.robots + 1, size=n)
+        completed = rng.random(n) < 0.85
+        efficiency = rng.uniform(80, 98, size=n).round(2)
+        amount = (power[station_ids - 1] * durations / 60 * efficiency / 100).round(2)
+        rows = []
+        for k in range(n):
+            start = now - timedelta(minutes=int(start_minutes[k]))
+            end = start + timedelta(minutes=int(durations[k]))
+            rows.append({
+                'id': offset + k + 1, 'robot_id': int(robot_ids[k]), 'station_id': int(station_ids[k]),
+                'start_time': start, 'end_time': end,
+                'status': 'completed' if completed[k] else 'failed',
+                'charge_amount': float(amount[k]) if completed[k] else None,
+                'charging_efficiency': float(efficiency[k]) if completed[k] else None,
+                'created_at': start, 'updated_at': end
+            })
+        db.session.execute(order_table.insert(), rows)
+        db.session.commit()
+
+    # 少量充电中的订单，使未结束订单的处理路径也被覆盖
+    active = min(args.stations, args.robots, orders) // 5
+    if active:
+        db.session.execute(order_table.insert(), [
+            {'id': orders + i + 1, 'robot_id': i + 1, 'station_id': i + 1,
+             'start_time': now - timedelta(minutes=30), 'status': 'charging',
+             'created_at': now - timedelta(minutes=30), 'updated_at': now - timedelta(minutes=30)}
+            for i in range(active)
+        ])
+        db.session.commit()
+
+def _cases(days):
+    """每个接口的查询用例：最近7天、最近30天、全部时间跨度（可走小时汇总表）、按充电桩筛选"""
+    now = datetime.now().replace(microsecond=0)
+
+    def window(num_days):
+        start = (now - timedelta(days=num_days)).strftime('%Y-%m-%dT%H:%M:%S')
+        return f'startDate={start}&endDate={now.strftime("%Y-%m-%dT%H:%M:%S")}'
+
+    return [
+        ('7d', window(7)),
+        ('30d', window(30)),
+        (f'{days}d', window(days)),
+        ('30d_stations', window(30) + '&stationIds=1,2,3,4,5'),
+    ]
+
+def _reset_caches(full=False):
+    """清除数据缓存；full为True时订单列式存储下次访问全量重新加载"""
+    from app import data_access, order_store
+    data_access.clear_cache()
+    if full:
+        order_store.invalidate(full=True)
+
+def _percentiles(values, points=(50, 90, 99)):
+    return {f'p{p}_ms': round(float(np.percentile(values, p)), 2) for p in points}
+
+class QueryCounter:
+    """统计数据库连接上执行的SQL语句数"""
+
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+def _request(client, counter, url):
+    queries = counter.count
+    started = time.perf_counter()
+    response = client.get(url)
+    elapsed = (time.perf_counter() - started) * 1000
+    if response.status_code != 200:
+        raise RuntimeError(f"{url} 返回 {response.status_code}")
+    return elapsed, counter.count - queries, len(response.data)
+
+def _peak_memory(func):
+    """执行期间Python分配内存的峰值（KB，包括NumPy数组）"""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+def benchmark_order_store(counter):
+    """订单列式存储全量加载的耗时、查询数和内存峰值（各接口冷启动时的主要开销）"""
+    from app import order_store
+    _reset_caches(full=True)
+    peak = _peak_memory(order_store.get_order_frame)
+    _reset_caches(full=True)
+    queries = counter.count
+    started = time.perf_counter()
+    frame = order_store.get_order_frame()
+    return {
+        'rows': len(frame),
+        'load_ms': round((time.perf_counter() - started) * 1000, 2),
+        'queries': counter.count - queries,
+        'peak_kb': peak
+    }
+
+def benchmark_endpoint(client, counter, endpoint, query, repeat, max_seconds):
+    url = f'/api/energy-efficiency/{endpoint}/?{query}'
+
+    # 冷请求：清空数据缓存后的第一次请求（订单存储做一次增量刷新）
+    _reset_caches()
+    cold_ms, cold_queries, size = _request(client, counter, url)
+
+    # 热请求：缓存已加载，代表常规访问；单个用例耗时超过max_seconds后提前结束（至少3次）
+    memory = _peak_memory(lambda: client.get(url))
+    latencies = []
+    queries = []
+    started = time.perf_counter()
+    for i in range(repeat):
+        elapsed, count, size = _request(client, counter, url)
+        latencies.append(elapsed)
+        queries.append(count)
+        if i >= 2 and time.perf_counter() - started > max_seconds:
+            break
+
+    return {
+        'cold_ms': round(cold_ms, 2),
+        'cold_queries': cold_queries,
+        'requests': len(latencies),
+        'mean_ms': round(float(np.mean(latencies)), 2),
+        **_percentiles(latencies),
+        'max_ms': round(float(np.max(latencies)), 2),
+        'avg_queries': round(float(np.mean(queries)), 2),
+        'peak_kb': memory,
+        'response_bytes': size
+    }
+
+def _max_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows没有resource模块
+        return None
+    # Linux下单位为KB，macOS下为字节
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(usage / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def _git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+def run_benchmark(args):
+    rng = np.random.default_rng(args.seed)
+    scales = [int(scale) for scale in args.scales.split(',') if scale.strip()]
+    endpoints = args.endpoints.split(',') if args.endpoints else ENDPOINTS
+
+    database_uri = args.db
+    temp_path = None
+    if not database_uri:
+        fd, temp_path = tempfile.mkstemp(suffix='.db', prefix='energy_bench_')
+        os.close(fd)
+        database_uri = 'sqlite:///' + temp_path
+
+    app = _create_app(database_uri)
+    from app import db, data_access
+
+    report = {
+        'commit': _git_commit(),
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'robots': args.robots,
+        'stations': args.stations,
+        'days': args.days,
+        'repeat': args.repeat,
+        'scales': []
+    }
+
+    with app.app_context():
+        report['database'] = db.engine.dialect.name
+        counter = QueryCounter(db.engine)
+        client = app.test_client()
+
+        for orders in scales:
+            print(f"生成 {orders} 条充电订单...")
+            started = time.perf_counter()
+            seed_orders(db, args, orders, rng)
+            seed_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            data_access.rebuild_station_rollup()
+            rollup_seconds = time.perf_counter() - started
+            db.session.remove()
+
+            store = benchmark_order_store(counter)
+            print(f"订单列式存储全量加载: {store['rows']} 行，{store['load_ms']:.1f} ms，"
+                  f"{store['queries']} 条SQL，峰值 {store['peak_kb']:.0f} KB")
+
+            results = {}
+            for endpoint in endpoints:
+                for case, query in _cases(args.days):
+                    result = benchmark_endpoint(client, counter, endpoint, query, args.repeat, args.max_seconds)
+                    results[f'{endpoint}[{case}]'] = result
+                    print(f"{orders:>9} {endpoint:<24} {case:<13} 冷 {result['cold_ms']:>9.1f} ms "
+                          f"({result['cold_queries']} 条SQL)  热 p50 {result['p50_ms']:>8.2f} ms "
+                          f"p99 {result['p99_ms']:>8.2f} ms  峰值 {result['peak_kb']:.0f} KB")
+            db.session.remove()
+
+            report['scales'].append({
+                'orders': orders,
+                'seed_seconds': round(seed_seconds, 2),
+                'rollup_seconds': round(rollup_seconds, 2),
+                'order_store': store,
+                'max_rss_mb': _max_rss_mb(),
+                'endpoints': results
+            })
+
+    if temp_path:
+        os.remove(temp_path)
+    return report
+
+def compare_reports(previous, current):
+    """按规模和用例对比热请求p50延迟"""
+    old = {
+        (scale['orders'], name): result
+        for scale in previous.get('scales', []) for name, result in scale['endpoints'].items()
+    }
+    print(f"\n与 {previous.get('commit')} 对比（热请求p50，ms）:")
+    for scale in current['scales']:
+        for name, result in scale['endpoints'].items():
+            before = old.get((scale['orders'], name))
+            if before is None:
+                continue
+            ratio = result['p50_ms'] / before['p50_ms'] if before['p50_ms'] else 0
+            print(f"{scale['orders']:>9} {name:<40} {before['p50_ms']:>9.2f} -> {result['p50_ms']:>9.2f} ({ratio:.2f}x)")
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = run_benchmark(args)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"基准测试结果已写入: {args.json}")
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare_reports(json.load(f), report)
+    sys.exit(0)
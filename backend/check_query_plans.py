@@ -0,0 +1,87 @@
+import sys
+from datetime import datetime, timedelta
+
+from app import create_app, db
+from app import data_access
+from app.models import Robot, ChargingStation, ChargingOrder
+
+# 需要检查的热点查询及其期望使用的索引
+# 每一项: (名称, 构建查询的函数, 期望索引)
+def _hot_queries(session):
+    now = datetime.utcnow()
+    start = now - timedelta(days=30)
+    return [
+        ('充电生命周期: 机器人当前充电订单',
+         data_access._active_order_query(session, 1).limit(1),
+         'idx_orders_robot_status_start'),
+        ('自动充电: 低电量空闲和正在充电的机器人',
+         data_access._charging_sweep_robots_query(session),
+         'idx_robots_status_battery'),
+        ('自动充电: 空闲充电桩',
+         data_access._idle_stations_query(session).limit(1),
+         'idx_stations_status'),
+        ('告警列表: 按时间倒序分页',
+         data_access._alerts_page_query(session, 1, 7),
+         'idx_alerts_time'),
+        ('增量同步: 变化的机器人',
+         data_access._changed_rows_query(session, Robot, start).limit(1000),
+         'idx_robots_updated_at'),
+        ('增量同步: 变化的充电桩',
+         data_access._changed_rows_query(session, ChargingStation, start).limit(1000),
+         'idx_stations_updated_at'),
+        ('增量同步: 变化的订单',
+         data_access._changed_rows_query(session, ChargingOrder, start).limit(1000),
+         'idx_orders_updated_at'),
+    ]
+
+def _explain(connection, query):
+    """对查询执行EXPLAIN，返回执行计划文本"""
+    dialect = connection.dialect
+    compiled = query.statement.compile(dialect=dialect, compile_kwargs={"render_postcompile": True})
+    if compiled.positional:
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+    else:
+        params = compiled.params
+    
+    if dialect.name == 'sqlite':
+        rows = connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + compiled.string, params).fetchall()
+        return [row[-1] for row in rows]
+    
+    result = connection.exec_driver_sql('EXPLAIN ' + compiled.string, params)
+    columns = list(result.keys())
+    plans = []
+    for row in result.fetchall():
+        row = dict(zip(columns, row))
+        plans.append(f"table={row.get('table')} type={row.get('type')} key={row.get('key')} rows={row.get('rows')} extra={row.get('Extra')}")
+    return plans
+
+def check_query_plans(create_missing=False):
+    """检查热点查询是否使用了复合索引"""
+    app = create_app()
+    with app.app_context():
+        if create_missing:
+            # 为已有数据库补建新增的表和模型中声明的索引
+            db.create_all()
+            for table in db.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(bind=db.engine, checkfirst=True)
+            print("已补建缺失的索引")
+        
+        all_passed = True
+        with db.engine.connect() as connection:
+            for name, query, expected_index in _hot_queries(db.session):
+                plans = _explain(connection, query)
+                used = any(expected_index in plan for plan in plans)
+                all_passed = all_passed and used
+                print(f"{'通过' if used else '未使用索引'}: {name} (期望 {expected_index})")
+                for plan in plans:
+                    print(f"    {plan}")
+        return all_passed
+
+if __name__ == "__main__":
+    if check_query_plans(create_missing='--create-indexes' in sys.argv):
+        print("查询计划检查通过")
+        sys.exit(0)
+    else:
+        print("查询计划检查失败，部分查询未使用预期索引（数据量很小时优化器可能选择全表扫描）")
+        sys.exit(1)
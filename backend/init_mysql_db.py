@@ -1,6 +1,12 @@
 import os
+import sys
+import time
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import pandas as pd
 import pymysql
+import openpyxl
 from sqlalchemy import create_engine, text
 import datetime
 
@@ -15,6 +21,18 @@ DB_CONFIG = {
 
 DB_NAME = 'warehouse'
 
+# 批量导入的Excel表格及需要忽略的列（表格名与数据库表名一致）
+IMPORT_SHEETS = [
+    ('users', ['password']),  # 数据库表中没有password字段
+    ('charging_stations', []),
+    ('robots', []),
+    ('charging_orders', []),
+    ('system_alerts', []),
+    ('efficiency_logs', []),
+    ('system_settings', []),
+    ('system_logs', []),
+]
+
 def create_database():
     """创建数据库"""
     conn = pymysql.connect(**DB_CONFIG)
@@ -59,7 +77,9 @@ def create_tables():
             efficiency FLOAT DEFAULT 100.0,
             power_rating FLOAT DEFAULT 0.0,
             created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            INDEX idx_stations_status (status),
+            INDEX idx_stations_updated_at (updated_at)
         ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
         """))
         print("充电站表创建成功")
@@ -73,7 +93,9 @@ def create_tables():
             status VARCHAR(20) DEFAULT 'idle',
             last_charging DATETIME,
             created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            INDEX idx_robots_status_battery (status, battery_level),
+            INDEX idx_robots_updated_at (updated_at)
         ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
         """))
         print("机器人表创建成功")
@@ -91,12 +113,36 @@ def create_tables():
             charging_efficiency FLOAT DEFAULT 0.0,
             created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
             updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            active_station_id INT AS (CASE WHEN status = 'charging' THEN station_id END) VIRTUAL,
+            INDEX idx_orders_station_start (station_id, start_time),
+            INDEX idx_orders_start_status (start_time, status),
+            INDEX idx_orders_robot_status_start (robot_id, status, start_time DESC),
+            INDEX idx_orders_updated_at (updated_at),
+            UNIQUE INDEX uq_orders_active_station (active_station_id),
             FOREIGN KEY (robot_id) REFERENCES robots(id),
             FOREIGN KEY (station_id) REFERENCES charging_stations(id)
         ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
         """))
         print("充电订单表创建成功")
         
+        # 创建充电站小时汇总表
+        conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS station_hourly_rollup (
+            station_id INT NOT NULL,
+            hour DATETIME NOT NULL,
+            energy FLOAT NOT NULL DEFAULT 0,
+            session_count INT NOT NULL DEFAULT 0,
+            busy_seconds FLOAT NOT NULL DEFAULT 0,
+            efficiency_sum FLOAT NOT NULL DEFAULT 0,
+            efficiency_count INT NOT NULL DEFAULT 0,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            PRIMARY KEY (station_id, hour),
+            INDEX idx_rollup_hour (hour),
+            FOREIGN KEY (station_id) REFERENCES charging_stations(id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+        """))
+        print("充电站小时汇总表创建成功")
+        
         # 创建系统告警表
         conn.execute(text("""
         CREATE TABLE IF NOT EXISTS system_alerts (
@@ -105,7 +151,8 @@ def create_tables():
             type VARCHAR(50) NOT NULL,
             message TEXT NOT NULL,
             is_read BOOLEAN DEFAULT FALSE,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_alerts_time (time DESC)
         ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
         """))
         print("系统告警表创建成功")
@@ -147,6 +194,28 @@ def create_tables():
         """))
         print("系统日志表创建成功")
         
+        # 创建删除记录墓碑表（增量同步）
+        conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS deleted_records (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            table_name VARCHAR(50) NOT NULL,
+            record_id INT NOT NULL,
+            deleted_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_deleted_records_table_time (table_name, deleted_at)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+        """))
+        print("删除记录表创建成功")
+        
+        # 创建数据版本表（HTTP条件请求）
+        conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS data_versions (
+            name VARCHAR(32) PRIMARY KEY,
+            version INT NOT NULL DEFAULT 0,
+            updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+        """))
+        print("数据版本表创建成功")
+        
         # 提交事务
         conn.commit()
 
@@ -302,9 +371,180 @@ def import_data_from_excel():
     finally:
         conn.close()
 
+def _iter_sheet_rows(excel_file, sheet_name, skip_columns):
+    """以只读流式方式逐行读取表格，返回列名和数据行生成器（不把整张表加载进内存）"""
+    workbook = openpyxl.load_workbook(excel_file, read_only=True, data_only=True)
+    rows = workbook[sheet_name].iter_rows(values_only=True)
+    header = next(rows, None) or ()
+    # 只保留有列名且不需要忽略的列
+    positions = [i for i, name in enumerate(header) if name is not None and name not in skip_columns]
+    columns = [str(header[i]) for i in positions]
+
+    def generate():
+        try:
+            for row in rows:
+                values = tuple(row[i] if i < len(row) else None for i in positions)
+                if any(value is not None for value in values):  # 跳过空行
+                    yield values
+        finally:
+            workbook.close()
+
+    return columns, generate()
+
+def _connect_for_import(local_infile=False):
+    """批量导入使用的连接：关闭外键和唯一性检查，由调用方按批提交"""
+    conn = pymysql.connect(
+        host=DB_CONFIG['host'],
+        user=DB_CONFIG['user'],
+        password=DB_CONFIG['password'],
+        database=DB_NAME,
+        charset='utf8mb4',
+        local_infile=local_infile
+    )
+    with conn.cursor() as cursor:
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0;")
+        cursor.execute("SET UNIQUE_CHECKS = 0;")
+    return conn
+
+def _insert_in_chunks(conn, table, columns, rows, chunk_size):
+    """按块执行多行INSERT（pymysql的executemany会把一块数据合并成多行VALUES语句）"""
+    sql = "INSERT INTO `{}` ({}) VALUES ({})".format(
+        table, ', '.join(f'`{c}`' for c in columns), ', '.join(['%s'] * len(columns))
+    )
+    count = 0
+    chunk = []
+    with conn.cursor() as cursor:
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                cursor.executemany(sql, chunk)
+                conn.commit()
+                count += len(chunk)
+                chunk = []
+        if chunk:
+            cursor.executemany(sql, chunk)
+            conn.commit()
+            count += len(chunk)
+    return count
+
+def _to_tsv_field(value):
+    """转换为LOAD DATA默认格式的字段：NULL写为\\N，反斜杠、制表符和换行需要转义"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, datetime.datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+def _load_data_infile(conn, table, columns, rows):
+    """先把数据流式写入临时文件，再用一条LOAD DATA LOCAL INFILE导入（需要服务器开启local_infile）"""
+    fd, temp_path = tempfile.mkstemp(suffix='.tsv', prefix=f'{table}_')
+    count = 0
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            for row in rows:
+                f.write('\t'.join(_to_tsv_field(value) for value in row))
+                f.write('\n')
+                count += 1
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "LOAD DATA LOCAL INFILE %s INTO TABLE `{}` CHARACTER SET utf8mb4 "
+                "FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' ({})".format(
+                    table, ', '.join(f'`{c}`' for c in columns)
+                ),
+                (temp_path,)
+            )
+        conn.commit()
+    finally:
+        os.remove(temp_path)
+    return count
+
+def _import_sheet_bulk(excel_file, sheet_name, skip_columns, chunk_size, use_load_data):
+    """导入单个表格，返回 (表名, 行数, 耗时秒数, 错误信息)"""
+    started = time.time()
+    conn = None
+    try:
+        columns, rows = _iter_sheet_rows(excel_file, sheet_name, skip_columns)
+        conn = _connect_for_import(local_infile=use_load_data)
+        with conn.cursor() as cursor:
+            cursor.execute(f"TRUNCATE TABLE `{sheet_name}`;")
+        if use_load_data:
+            count = _load_data_infile(conn, sheet_name, columns, rows)
+        else:
+            count = _insert_in_chunks(conn, sheet_name, columns, rows, chunk_size)
+        return sheet_name, count, time.time() - started, None
+    except Exception as e:
+        return sheet_name, 0, time.time() - started, str(e)
+    finally:
+        if conn is not None:
+            conn.close()
+
+def import_data_from_excel_bulk(excel_file=None, chunk_size=5000, workers=4, use_load_data=False):
+    """批量导入Excel数据：流式读取表格，分块多行INSERT或LOAD DATA导入，各表在独立进程中并行导入"""
+    excel_file = excel_file or os.path.join('data', 'charging_system_data.xlsx')
+    if not os.path.exists(excel_file):
+        print(f"文件不存在: {excel_file}")
+        return False
+
+    workbook = openpyxl.load_workbook(excel_file, read_only=True)
+    available = set(workbook.sheetnames)
+    workbook.close()
+    sheets = [(name, skip) for name, skip in IMPORT_SHEETS if name in available]
+    for name, _ in IMPORT_SHEETS:
+        if name not in available:
+            print(f"Excel中缺少表格 {name}，已跳过")
+
+    mode = 'LOAD DATA LOCAL INFILE' if use_load_data else f'多行INSERT（每批 {chunk_size} 行）'
+    print(f"开始批量导入 {len(sheets)} 个表格，方式: {mode}，并行数: {workers}")
+    started = time.time()
+    total_rows = 0
+    success = True
+    # 外键检查在各连接中关闭，表之间没有导入顺序依赖；读取Excel主要消耗CPU，因此使用多进程
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [
+            executor.submit(_import_sheet_bulk, excel_file, name, skip, chunk_size, use_load_data)
+            for name, skip in sheets
+        ]
+        for future in as_completed(futures):
+            table, count, seconds, error = future.result()
+            if error:
+                success = False
+                print(f"导入 {table} 时出错: {error}")
+                continue
+            total_rows += count
+            rate = count / seconds if seconds > 0 else 0
+            print(f"{table}: 导入 {count} 行，耗时 {seconds:.2f} 秒，{rate:,.0f} 行/秒")
+
+    elapsed = time.time() - started
+    rate = total_rows / elapsed if elapsed > 0 else 0
+    print(f"批量导入完成: 共 {total_rows} 行，耗时 {elapsed:.2f} 秒，{rate:,.0f} 行/秒")
+    return success
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='初始化MySQL数据库并导入Excel数据')
+    parser.add_argument('--bulk', action='store_true', help='使用批量导入（流式读取、分块写入、多表并行）')
+    parser.add_argument('--load-data', action='store_true', help='批量导入时使用LOAD DATA LOCAL INFILE')
+    parser.add_argument('--chunk-size', type=int, default=5000, help='批量导入每批INSERT的行数')
+    parser.add_argument('--workers', type=int, default=4, help='批量导入的并行进程数')
+    parser.add_argument('--excel', help='Excel文件路径，默认 data/charging_system_data.xlsx')
+    args = parser.parse_args()
+
     print("开始初始化MySQL数据库...")
     create_database()
     create_tables()
-    import_data_from_excel()
-    print("MySQL数据库初始化完成！") 
\ No newline at end of file
+    if args.bulk or args.load_data:
+        if not import_data_from_excel_bulk(args.excel, args.chunk_size, args.workers, args.load_data):
+            print("部分表格导入失败")
+            sys.exit(1)
+    elif args.excel:
+        print("--excel 仅在批量导入时生效")
+        sys.exit(1)
+    else:
+        import_data_from_excel()
+    # 导入的历史订单不会经过订单完成逻辑，需要重建充电站小时汇总表，否则长时间范围的能效分析没有数据
+    from rebuild_station_rollup import rebuild_station_rollup
+    if not rebuild_station_rollup():
+        sys.exit(1)
+    print("MySQL数据库初始化完成！")
+    sys.exit(0)
@@ -0,0 +1,42 @@
+import sys
+from sqlalchemy import inspect, text
+
+from app import create_app, db
+
+def migrate_active_order_constraint():
+    """为已有数据库的charging_orders表补建active_station_id生成列和uq_orders_active_station唯一索引"""
+    app = create_app()
+    with app.app_context():
+        with db.engine.begin() as conn:
+            columns = [column['name'] for column in inspect(conn).get_columns('charging_orders')]
+            if 'active_station_id' in columns:
+                print("active_station_id 列已存在，无需迁移")
+                return True
+
+            # 同一充电桩存在多个充电中的订单时无法建立唯一索引，需要先人工处理
+            duplicates = conn.execute(text(
+                "SELECT station_id, COUNT(*) FROM charging_orders "
+                "WHERE status = 'charging' GROUP BY station_id HAVING COUNT(*) > 1"
+            )).fetchall()
+            if duplicates:
+                for station_id, count in duplicates:
+                    print(f"错误: 充电桩 {station_id} 有 {count} 个充电中的订单")
+                return False
+
+            # 生成列语法MySQL和SQLite通用（SQLite的ALTER TABLE只支持VIRTUAL生成列）
+            conn.execute(text(
+                "ALTER TABLE charging_orders "
+                "ADD COLUMN active_station_id INT AS (CASE WHEN status = 'charging' THEN station_id END) VIRTUAL"
+            ))
+            conn.execute(text(
+                "CREATE UNIQUE INDEX uq_orders_active_station ON charging_orders (active_station_id)"
+            ))
+            print("已添加 active_station_id 列和 uq_orders_active_station 唯一索引")
+            return True
+
+if __name__ == "__main__":
+    if migrate_active_order_constraint():
+        sys.exit(0)
+    else:
+        print("迁移失败，请先结束重复的充电中订单")
+        sys.exit(1)
@@ -0,0 +1,32 @@
+import sys
+import time
+
+from app import create_app, db
+from app import data_access
+from app.models import StationHourlyRollup, DataVersion
+
+def rebuild_station_rollup():
+    """根据历史已完成订单重建充电站小时汇总表"""
+    app = create_app()
+    with app.app_context():
+        # 已有数据库可能还没有汇总表和数据版本表
+        StationHourlyRollup.__table__.create(bind=db.engine, checkfirst=True)
+        DataVersion.__table__.create(bind=db.engine, checkfirst=True)
+
+        started = time.time()
+        try:
+            processed, rows = data_access.rebuild_station_rollup()
+        except Exception as e:
+            print(f"重建充电站小时汇总表失败: {str(e)}")
+            return False
+        # 数据通常是由生成或导入脚本直接写入的，递增数据版本使运行中的服务在缓存过期后返回新数据
+        data_access.clear_cache()
+        print(f"已处理 {processed} 个已完成订单，生成 {rows} 行小时汇总，耗时 {time.time() - started:.2f} 秒")
+        return True
+
+if __name__ == "__main__":
+    if rebuild_station_rollup():
+        print("充电站小时汇总表重建完成")
+        sys.exit(0)
+    else:
+        sys.exit(1)
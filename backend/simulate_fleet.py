@@ -0,0 +1,199 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from sqlalchemy import bindparam
+
+import config
+
+# 车队仿真：用NumPy数组模拟大量机器人的耗电，驱动真实的 data_access.check_low_battery_robots
+# 在SQLite（默认临时文件）或MySQL测试库上运行，统计调度吞吐、排队长度和等待时间分布
+
+WORKING, QUEUED, CHARGING = 0, 1, 2
+LOW_BATTERY_THRESHOLD = 20  # 与 data_access._charging_sweep_robots_query 的默认阈值一致
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='机器人车队充电调度仿真')
+    parser.add_argument('--robots', type=int, default=10000, help='机器人数量')
+    parser.add_argument('--stations', type=int, default=200, help='充电桩数量')
+    parser.add_argument('--ticks', type=int, default=120, help='仿真步数（每步调用一次调度）')
+    parser.add_argument('--tick-minutes', type=float, default=1.0, help='每步对应的仿真时间（分钟）')
+    parser.add_argument('--drain-min', type=float, default=6.0, help='工作中每小时最小耗电百分比')
+    parser.add_argument('--drain-max', type=float, default=15.0, help='工作中每小时最大耗电百分比')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--db', help='数据库URI，默认使用临时SQLite文件（MySQL请使用单独的测试库，数据会被清空）')
+    parser.add_argument('--json', help='将报告写入JSON文件')
+    return parser.parse_args()
+
+def _create_app(database_uri):
+    """使用指定数据库创建应用（仿真期间不启动自动充电后台任务）"""
+    config.Config.SQLALCHEMY_DATABASE_URI = database_uri
+    config.Config.CHARGING_WORKER_ENABLED = False
+    from app import create_app
+    return create_app()
+
+def seed_fleet(db, args, rng):
+    """重建表并写入充电桩和机器人，机器人ID从1开始连续编号以便与数组下标对应"""
+    from app.models import Robot, ChargingStation
+
+    db.drop_all()
+    db.create_all()
+    db.session.bulk_insert_mappings(ChargingStation, [
+        {'id': i, 'name': f'仿真充电桩-{i:04d}', 'location': f'区域-{i % 20}', 'status': 'idle',
+         'power_output': float(power), 'power_rating': float(power), 'efficiency': 90.0}
+        for i, power in enumerate(rng.choice([5.0, 7.5, 10.0, 12.0], size=args.stations), start=1)
+    ])
+    battery = rng.uniform(LOW_BATTERY_THRESHOLD + 5, 100, size=args.robots)
+    db.session.bulk_insert_mappings(Robot, [
+        {'id': i, 'name': f'仿真机器人-{i:06d}', 'battery_level': float(level), 'status': 'working'}
+        for i, level in enumerate(battery, start=1)
+    ])
+    db.session.commit()
+    return battery
+
+def _percentiles(values, points=(50, 90, 99)):
+    if len(values) == 0:
+        return {f'p{p}': 0 for p in points}
+    return {f'p{p}': round(float(np.percentile(values, p)), 2) for p in points}
+
+def run_simulation(args):
+    rng = np.random.default_rng(args.seed)
+    database_uri = args.db
+    temp_path = None
+    if not database_uri:
+        fd, temp_path = tempfile.mkstemp(suffix='.db', prefix='fleet_sim_')
+        os.close(fd)
+        database_uri = 'sqlite:///' + temp_path
+
+    app = _create_app(database_uri)
+    from app import db, data_access
+    from app.models import Robot
+
+    robot_table = Robot.__table__
+    update_robots = robot_table.update().where(robot_table.c.id == bindparam('robot_id')).values(
+        status=bindparam('new_status'), battery_level=bindparam('new_battery')
+    )
+
+    with app.app_context():
+        battery = seed_fleet(db, args, rng)
+        state = np.full(args.robots, WORKING, dtype='int8')
+        drain_per_tick = rng.uniform(args.drain_min, args.drain_max, size=args.robots) * args.tick_minutes / 60
+        queued_at = np.full(args.robots, -1, dtype='int64')  # 进入排队的步数
+
+        waits = []
+        queue_lengths = []
+        charging_counts = []
+        tick_seconds = []
+        totals = {'assigned': 0, 'completed': 0, 'queued': 0}
+        started = time.perf_counter()
+
+        for tick in range(args.ticks):
+            # 1. 工作中的机器人耗电，电量低于阈值的停止工作进入排队（只把状态变化的机器人写回数据库）
+            working = state == WORKING
+            battery[working] = np.maximum(battery[working] - drain_per_tick[working], 0)
+            newly_low = np.nonzero(working & (battery < LOW_BATTERY_THRESHOLD))[0]
+            state[newly_low] = QUEUED
+            queued_at[newly_low] = tick
+            totals['queued'] += len(newly_low)
+            if len(newly_low):
+                db.session.execute(update_robots, [
+                    {'robot_id': int(i) + 1, 'new_status': 'idle', 'new_battery': float(battery[i])}
+                    for i in newly_low
+                ])
+                db.session.commit()
+
+            # 2. 调用真实的调度逻辑
+            tick_started = time.perf_counter()
+            results = data_access.check_low_battery_robots()
+            tick_seconds.append(time.perf_counter() - tick_started)
+            db.session.remove()
+
+            # 3. 读取排队和充电中机器人的最新状态
+            rows = db.session.query(Robot.id, Robot.status, Robot.battery_level).filter(
+                Robot.status.in_(['idle', 'charging'])
+            ).all()
+            ids = np.array([row[0] for row in rows], dtype='int64') - 1
+            statuses = np.array([row[1] for row in rows], dtype=object)
+            levels = np.array([row[2] for row in rows], dtype='float64')
+            battery[ids] = levels
+
+            # 开始充电的机器人记录等待时间
+            charging = ids[statuses == 'charging']
+            started_charging = charging[state[charging] == QUEUED]
+            waits.extend(((tick - queued_at[started_charging]) * args.tick_minutes).tolist())
+            state[started_charging] = CHARGING
+            queued_at[started_charging] = -1
+            totals['assigned'] += len(started_charging)
+
+            # 充满电（调度将其置为idle且电量100）的机器人回到工作状态
+            idle = ids[statuses == 'idle']
+            finished = idle[(state[idle] == CHARGING) & (battery[idle] >= 100)]
+            state[finished] = WORKING
+            totals['completed'] += len(finished)
+            if len(finished):
+                db.session.execute(update_robots, [
+                    {'robot_id': int(i) + 1, 'new_status': 'working', 'new_battery': float(battery[i])}
+                    for i in finished
+                ])
+                db.session.commit()
+
+            queue_lengths.append(int((state == QUEUED).sum()))
+            charging_counts.append(int((state == CHARGING).sum()))
+            if tick % max(args.ticks // 10, 1) == 0:
+                print(f"第 {tick} 步: 排队 {queue_lengths[-1]}，充电中 {charging_counts[-1]}，"
+                      f"调度耗时 {tick_seconds[-1] * 1000:.1f} ms，结果 {len(results)} 条")
+
+        wall_seconds = time.perf_counter() - started
+        tick_array = np.array(tick_seconds)
+        scheduler_seconds = float(tick_array.sum())
+        report = {
+            'robots': args.robots,
+            'stations': args.stations,
+            'ticks': args.ticks,
+            'tick_minutes': args.tick_minutes,
+            'database': db.engine.dialect.name,
+            'wall_seconds': round(wall_seconds, 3),
+            'scheduler': {
+                'total_seconds': round(scheduler_seconds, 3),
+                'avg_tick_ms': round(float(tick_array.mean()) * 1000, 2),
+                'max_tick_ms': round(float(tick_array.max()) * 1000, 2),
+                **{f'{key}_tick_ms': value for key, value in _percentiles(tick_array * 1000).items()},
+                'assignments_per_second': round(totals['assigned'] / scheduler_seconds, 2) if scheduler_seconds else 0
+            },
+            'totals': totals,
+            'queue_length': {
+                'avg': round(float(np.mean(queue_lengths)), 2),
+                'max': int(np.max(queue_lengths)),
+                'final': queue_lengths[-1]
+            },
+            'charging': {
+                'avg': round(float(np.mean(charging_counts)), 2),
+                'max': int(np.max(charging_counts))
+            },
+            'wait_minutes': {
+                'count': len(waits),
+                'avg': round(float(np.mean(waits)), 2) if waits else 0,
+                'max': round(float(np.max(waits)), 2) if waits else 0,
+                **_percentiles(np.array(waits)),
+                'still_queued': int((state == QUEUED).sum())
+            }
+        }
+        db.session.remove()
+
+    if temp_path:
+        os.remove(temp_path)
+    return report
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = run_simulation(args)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"仿真报告已写入: {args.json}")
+    sys.exit(0)
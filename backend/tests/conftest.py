@@ -0,0 +1,69 @@
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+# 测试在临时SQLite数据库上运行，不需要MySQL：在backend目录执行 python -m pytest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from app import create_app, db, data_access, order_store
+from app.models import User, ChargingStation, Robot, ChargingOrder
+
+# 种子数据使用固定的创建和修改时间
+SEED_TIME = datetime(2025, 5, 1)
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """每个测试使用一个新的SQLite数据库：3个空闲充电桩、3个空闲机器人"""
+    monkeypatch.setattr(config.Config, 'SQLALCHEMY_DATABASE_URI', 'sqlite:///' + str(tmp_path / 'test.db'))
+    monkeypatch.setattr(config.Config, 'SLOW_QUERY_LOG_FILE', str(tmp_path / 'slow_queries.log'))
+    monkeypatch.setattr(config.Config, 'CHARGING_WORKER_ENABLED', False)
+    app = create_app()
+    with app.app_context():
+        # 进程级缓存和订单快照可能还是上一个测试数据库的数据
+        data_access.clear_cache()
+        order_store.invalidate(full=True)
+
+        user = User(username='admin', role='admin')
+        user.set_password('admin123')
+        db.session.add(user)
+        for i in range(1, 4):
+            db.session.add(ChargingStation(name=f'充电站-{i:03d}', location=f'位置-{i}', status='idle',
+                                           power_output=7.5, power_rating=7.5, efficiency=90,
+                                           created_at=SEED_TIME, updated_at=SEED_TIME))
+            db.session.add(Robot(name=f'机器人-{i:03d}', battery_level=80, status='idle',
+                                 created_at=SEED_TIME, updated_at=SEED_TIME))
+        db.session.commit()
+        yield app
+        db.session.remove()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def auth_headers(client):
+    """管理员登录后的请求头"""
+    response = client.post('/api/auth/login', json={'username': 'admin', 'password': 'admin123'})
+    return {'Authorization': 'Bearer ' + response.get_json()['access_token']}
+
+@pytest.fixture
+def orders(app):
+    """2025年5月的120个历史订单（已完成和失败），包含跨天订单和缺失的充电量、效率"""
+    rng = random.Random(7)
+    for _ in range(120):
+        start = SEED_TIME + timedelta(minutes=rng.randint(0, 60 * 24 * 20))
+        end = start + timedelta(minutes=rng.randint(10, 600))
+        status = rng.choice(['completed', 'completed', 'completed', 'failed'])
+        db.session.add(ChargingOrder(
+            robot_id=rng.randint(1, 3), station_id=rng.randint(1, 3), start_time=start, end_time=end, status=status,
+            charge_amount=rng.choice([None, round(rng.uniform(1, 40), 2)]),
+            charging_efficiency=rng.choice([None, round(rng.uniform(80, 98), 2)]),
+            created_at=start, updated_at=end
+        ))
+    db.session.commit()
+    data_access.clear_cache()
+    return ChargingOrder.query.order_by(ChargingOrder.id).all()
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+
+from app.models import ChargingStation
+
+START = datetime(2025, 5, 3)
+END = datetime(2025, 5, 15)
+RANGE = 'startDate=2025-05-03T00:00:00.000Z&endDate=2025-05-15T00:00:00.000Z'
+
+# 以下参考实现是向量化之前逐日、逐小时扫描订单的算法，用来校验批量计算的结果
+
+def _completed_in_range(orders):
+    return [order for order in orders if order.status == 'completed' and START <= order.start_time <= END]
+
+def _reference_heatmap(orders, dates):
+    points = []
+    for date in dates:
+        for hour in range(24):
+            hour_start = datetime.strptime(f'{date} {hour:02d}:00:00', '%Y-%m-%d %H:%M:%S')
+            hour_end = hour_start + timedelta(seconds=3599)
+            hour_orders = [order for order in orders if order.start_time <= hour_end and order.end_time >= hour_start]
+            if not hour_orders:
+                points.append([date, str(hour), 0])
+                continue
+            total_energy = 0
+            for order in hour_orders:
+                charge_amount = order.charge_amount
+                if charge_amount is None:
+                    if order.charging_efficiency:
+                        hours = (order.end_time - order.start_time).total_seconds() / 3600
+                        charge_amount = 7.5 * hours * order.charging_efficiency / 100
+                    else:
+                        charge_amount = 5.0
+                overlap = min(order.end_time, hour_end) - max(order.start_time, hour_start)
+                total_energy += charge_amount * overlap.total_seconds() / (order.end_time - order.start_time).total_seconds()
+            points.append([date, str(hour), round(total_energy, 2)])
+    return points
+
+def test_energy_distribution_matches_hourly_scan(client, orders):
+    response = client.get('/api/energy-efficiency/energy-distribution/?' + RANGE).get_json()
+    dates = [(START + timedelta(days=i)).strftime('%Y-%m-%d') for i in range((END - START).days + 1)]
+    assert response['days'] == dates
+
+    expected = _reference_heatmap(_completed_in_range(orders), dates)
+    assert response['data'] == expected
+    assert sum(1 for point in response['data'] if point[2]) > 24
+
+def _reference_trend(stations, orders, dates):
+    result = []
+    for station in stations:
+        daily_efficiencies = []
+        for date in dates:
+            day_orders = [order for order in orders
+                          if order.station_id == station.id and order.start_time.strftime('%Y-%m-%d') == date]
+            if day_orders:
+                efficiencies = []
+                for order in day_orders:
+                    if order.charging_efficiency is not None:
+                        efficiencies.append(order.charging_efficiency)
+                    elif order.charge_amount:
+                        hours = (order.end_time - order.start_time).total_seconds() / 3600
+                        efficiencies.append(order.charge_amount / hours / station.power_output * 100)
+                average = sum(efficiencies) / len(efficiencies) if efficiencies else station.efficiency
+                daily_efficiencies.append(round(average, 2))
+            elif daily_efficiencies:
+                daily_efficiencies.append(daily_efficiencies[-1])
+            else:
+                daily_efficiencies.append(round(station.efficiency, 2))
+        result.append({'id': station.id, 'name': station.name, 'efficiencyData': daily_efficiencies})
+    return result
+
+def test_efficiency_trend_matches_per_day_scan(client, orders):
+    response = client.get('/api/energy-efficiency/efficiency-trend/?' + RANGE + '&stationIds=1,3').get_json()
+    dates = [(START + timedelta(days=i)).strftime('%Y-%m-%d') for i in range((END - START).days + 1)]
+    assert response['timeline'] == dates
+
+    stations = ChargingStation.query.filter(ChargingStation.id.in_([1, 3])).order_by(ChargingStation.id).all()
+    completed = [order for order in _completed_in_range(orders) if order.station_id in (1, 3)]
+    assert response['stations'] == _reference_trend(stations, completed, dates)
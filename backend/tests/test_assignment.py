@@ -0,0 +1,31 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models import ChargingOrder, Robot
+
+def test_second_assign_to_same_station_is_rejected(client):
+    assert client.post('/api/robots/1/assign/1').status_code == 200
+
+    response = client.post('/api/robots/2/assign/1')
+    assert response.status_code == 400
+    assert ChargingOrder.query.filter_by(station_id=1, status='charging').count() == 1
+    assert Robot.query.get(2).status == 'idle'
+
+def test_active_station_unique_index(app):
+    db.session.add(ChargingOrder(robot_id=1, station_id=1, status='charging'))
+    db.session.commit()
+
+    db.session.add(ChargingOrder(robot_id=2, station_id=1, status='charging'))
+    with pytest.raises(IntegrityError):
+        db.session.commit()
+    db.session.rollback()
+
+    # 非充电中的订单不参与唯一性比较
+    db.session.add_all([
+        ChargingOrder(robot_id=2, station_id=1, status='completed'),
+        ChargingOrder(robot_id=3, station_id=1, status='completed'),
+        ChargingOrder(robot_id=3, station_id=2, status='charging')
+    ])
+    db.session.commit()
+    assert ChargingOrder.query.filter_by(status='charging').count() == 2
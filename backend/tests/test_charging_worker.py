@@ -0,0 +1,6 @@
+def test_worker_stats_require_login(client, auth_headers):
+    assert client.get('/api/system/charging-worker').status_code == 401
+    response = client.get('/api/system/charging-worker', headers=auth_headers)
+    assert response.status_code == 200
+    # 测试配置中未启动后台任务
+    assert response.get_json() == {'enabled': False}
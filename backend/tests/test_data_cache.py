@@ -0,0 +1,49 @@
+from app import data_access
+
+def test_cache_hits_until_the_entry_expires(app, monkeypatch):
+    stats = data_access.get_cache_stats()
+    first = data_access.get_robots()
+    first[0]['name'] = '调用方修改'
+    # 返回的是副本，修改不影响缓存
+    assert data_access.get_robots()[0]['name'] == '机器人-001'
+    after_hit = data_access.get_cache_stats()
+    assert after_hit['misses'] == stats['misses'] + 1
+    assert after_hit['hits'] == stats['hits'] + 1
+
+    monkeypatch.setattr(data_access, '_cache_timeout', 0)
+    data_access.get_robots()
+    assert data_access.get_cache_stats()['misses'] == stats['misses'] + 2
+
+def test_least_recently_used_entry_is_evicted(app, monkeypatch):
+    monkeypatch.setattr(data_access, '_cache_max_entries', 2)
+    data_access.get_robots()
+    data_access.get_charging_stations()
+    data_access.get_robots()  # robots成为最近使用的条目
+    data_access.get_charging_orders()
+
+    stats = data_access.get_cache_stats()
+    assert stats['keys'] == ['robots', 'orders']
+    assert stats['evictions'] == 1
+
+def test_clear_cache_drops_only_the_given_key(app):
+    data_access.get_robots()
+    data_access.get_charging_stations()
+    invalidations = data_access.get_cache_stats()['invalidations']
+
+    cleared = []
+    data_access.add_invalidation_listener(cleared.append)
+    try:
+        data_access.clear_cache('robots')
+    finally:
+        data_access._invalidation_listeners.remove(cleared.append)
+
+    stats = data_access.get_cache_stats()
+    assert stats['keys'] == ['stations']
+    assert stats['invalidations'] == invalidations + 1
+    assert cleared == ['robots']
+
+def test_cache_stats_requires_login(client, auth_headers):
+    assert client.get('/api/system/cache-stats').status_code == 401
+    response = client.get('/api/system/cache-stats', headers=auth_headers)
+    assert response.status_code == 200
+    assert 'orderStore' in response.get_json()
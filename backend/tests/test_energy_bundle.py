@@ -0,0 +1,35 @@
+import pytest
+
+PANELS = {
+    'kpi': 'kpi',
+    'efficiencyTrend': 'efficiency-trend',
+    'energyDistribution': 'energy-distribution',
+    'stationUtilization': 'station-utilization',
+    'robotChargingBehavior': 'robot-charging-behavior',
+    'peakAnalysis': 'peak-analysis',
+    'chargingEvents': 'charging-events'
+}
+
+RANGE = 'startDate=2025-05-03T00:00:00.000Z&endDate=2025-05-15T00:00:00.000Z'
+
+@pytest.mark.parametrize('workers', [1, 4])
+@pytest.mark.parametrize('query', [
+    RANGE,
+    RANGE + '&stationIds=1,2',
+    RANGE + '&robotIds=2,3',
+    RANGE + '&page=2&pageSize=5&query=机器人-001'
+])
+def test_bundle_matches_single_panel_endpoints(app, client, orders, workers, query):
+    app.config['ENERGY_BUNDLE_WORKERS'] = workers
+    bundle = client.get('/api/energy-efficiency/bundle/?' + query)
+    assert bundle.status_code == 200
+    bundle = bundle.get_json()
+    assert sorted(bundle) == sorted(PANELS)
+    for name, endpoint in PANELS.items():
+        single = client.get(f'/api/energy-efficiency/{endpoint}/?{query}').get_json()
+        assert bundle[name] == single, name
+
+def test_bundle_returns_only_requested_panels(client, orders):
+    bundle = client.get('/api/energy-efficiency/bundle/?panels=kpi,chargingEvents&' + RANGE).get_json()
+    assert sorted(bundle) == ['chargingEvents', 'kpi']
+    assert bundle['chargingEvents']['pagination']['totalItems'] > 0
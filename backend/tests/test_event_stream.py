@@ -0,0 +1,84 @@
+import json
+from collections import deque
+
+import pytest
+
+from app import data_access, event_stream
+
+@pytest.fixture(autouse=True)
+def fresh_hub(monkeypatch):
+    # 推送状态是进程级的，每个测试从未初始化的状态开始
+    monkeypatch.setattr(event_stream, '_buffer', deque(maxlen=event_stream._BUFFER_SIZE))
+    monkeypatch.setattr(event_stream, '_seq', 0)
+    monkeypatch.setattr(event_stream, '_robots', None)
+    monkeypatch.setattr(event_stream, '_stations', None)
+    monkeypatch.setattr(event_stream, '_counters', None)
+    monkeypatch.setattr(event_stream, '_today', None)
+    monkeypatch.setattr(event_stream, '_clients', 0)
+    monkeypatch.setattr(event_stream, '_stats', {'events': 0, 'connections': 0, 'rejected': 0})
+
+def _events(message):
+    """把一段SSE消息解析为 [(id, 事件名, 数据)]"""
+    events = []
+    for block in message.split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.split('\n') if ': ' in line and not line.startswith(':'))
+        if 'event' in fields:
+            events.append((int(fields['id']), fields['event'], json.loads(fields['data'])))
+    return events
+
+def test_change_event_carries_only_the_delta(app):
+    messages, release = event_stream.open_stream(heartbeat=0.01)
+    [(_, name, snapshot)] = _events(next(messages))
+    assert name == 'snapshot'
+    assert snapshot['dashboard']['robotCount'] == 3
+    assert snapshot['dashboard']['waitingRobots'] == 0
+
+    data_access.update_robot(1, {'battery_level': 10})
+    data_access.update_robot(2, {'battery_level': 80})  # 值未变化，不产生事件
+    [(seq, name, change)] = _events(next(messages))
+    assert (seq, name) == (1, 'change')
+    assert change['robots'] == [{'id': 1, 'battery_level': 10}]
+    assert change['dashboard']['delta'] == {'waitingRobots': 1}
+    assert change['dashboard']['counters']['waitingRobots'] == 1
+
+    assert next(messages) == ': keepalive\n\n'
+    messages.close()
+    assert event_stream.get_stats()['clients'] == 0
+
+def test_reconnect_replays_missed_events(app):
+    messages, release = event_stream.open_stream()
+    next(messages)
+    data_access.update_robot(1, {'status': 'error'})
+    data_access.update_charging_station(2, {'status': 'offline'})
+    data_access.update_robot(3, {'battery_level': 20})
+    release()
+
+    # 从第1条事件之后补发，不再发送快照
+    messages, release = event_stream.open_stream(last_event_id='1')
+    assert next(messages) == 'retry: 5000\n\n'
+    replayed = _events(next(messages))
+    assert [(seq, name) for seq, name, _ in replayed] == [(2, 'change'), (3, 'change')]
+    assert replayed[0][2]['stations'] == [{'id': 2, 'status': 'offline'}]
+    release()
+
+    # 序号超出当前范围（服务已重启）时重新发送快照
+    messages, release = event_stream.open_stream(last_event_id='99')
+    [(seq, name, snapshot)] = _events(next(messages))
+    assert (seq, name) == (3, 'snapshot')
+    assert snapshot['dashboard']['errorRobots'] == 1
+    release()
+
+def test_unstarted_streams_release_their_slot(app, client):
+    for _ in range(3):
+        response = client.head('/api/system/stream')
+        assert response.status_code == 200
+        # WSGI服务器在发送完响应后关闭它，生成器始终没有开始迭代
+        response.close()
+    assert event_stream.get_stats()['clients'] == 0
+
+    first = event_stream.open_stream(max_clients=1)
+    assert event_stream.open_stream(max_clients=1) is None
+    first[1]()
+    first[1]()  # 重复释放不会多减
+    assert event_stream.get_stats() == {'events': 0, 'connections': 4, 'rejected': 1,
+                                        'clients': 0, 'last_event_id': 0}
@@ -0,0 +1,52 @@
+from app import data_access, order_store
+from app.models import ChargingStation
+
+def test_conditional_get_returns_304(client):
+    first = client.get('/api/stations/')
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+
+    cached = client.get('/api/stations/', headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.data == b''
+    assert cached.headers['ETag'] == etag
+
+    # 与接口一致，写操作提交后调用clear_cache
+    data_access.update_charging_station(1, {'name': '充电站-改'})
+    data_access.clear_cache('stations')
+    changed = client.get('/api/stations/', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+    assert any(item['name'] == '充电站-改' for item in changed.get_json())
+
+def test_clear_cache_bumps_the_stored_version(app):
+    robots = data_access.read_data_version('robots')[0]
+    stations = data_access.read_data_version('stations')[0]
+    data_access.clear_cache('robots')
+    data_access.clear_cache()
+    assert data_access.read_data_version('robots')[0] == robots + 2
+    assert data_access.read_data_version('stations')[0] == stations + 1
+
+def test_other_process_writes_show_up_when_the_cache_expires(client, monkeypatch):
+    etag = client.get('/api/stations/').headers['ETag']
+
+    # 模拟其他进程的写操作：数据和版本已更新，本进程的缓存仍然有效
+    station = ChargingStation.query.get(2)
+    station.name = '充电站-其他进程'
+    data_access.db.session.commit()
+    data_access._bump_data_versions(['stations'])
+    assert client.get('/api/stations/', headers={'If-None-Match': etag}).status_code == 304
+
+    monkeypatch.setattr(data_access, '_cache_timeout', 0)
+    changed = client.get('/api/stations/', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert any(item['name'] == '充电站-其他进程' for item in changed.get_json())
+
+def test_order_version_follows_the_order_store(app):
+    order_store.get_order_frame()
+    version, _ = data_access.get_data_version('orders')
+    assert data_access.get_data_version('orders')[0] == version
+
+    data_access.clear_cache('orders')
+    # 订单存储需要刷新时读取数据库中的版本，不沿用旧快照的版本
+    assert data_access.get_data_version('orders')[0] != version
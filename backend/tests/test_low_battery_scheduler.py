@@ -0,0 +1,51 @@
+from app import data_access, db
+from app.data_access import _schedule_low_battery_robots
+from app.models import ChargingOrder, ChargingStation, Robot
+
+def _actions(plan):
+    return [(robot[0], station[0] if station else None, action) for robot, station, action in plan]
+
+def test_lowest_battery_is_served_first():
+    candidates = [(1, 'r1', 15, None), (2, 'r2', 5, None), (3, 'r3', 10, 3), (4, 'r4', 12, None)]
+    idle_stations = [(2, 's2'), (1, 's1'), (3, 's3')]
+    assert _actions(_schedule_low_battery_robots(candidates, idle_stations)) == [
+        (2, 1, 'assign_and_start_charging'),
+        (3, 3, 'start_charging'),
+        (4, 2, 'assign_and_start_charging'),
+        (1, None, 'no_idle_station')
+    ]
+
+def test_equal_battery_is_ordered_by_robot_id():
+    candidates = [(7, 'r7', 10, None), (3, 'r3', 10, None)]
+    assert _actions(_schedule_low_battery_robots(candidates, [(1, 's1')])) == [
+        (3, 1, 'assign_and_start_charging'),
+        (7, None, 'no_idle_station')
+    ]
+
+def test_reserved_station_is_used_last():
+    # 充电桩1已分配给机器人2，电量更低的机器人1只有在没有其他空闲充电桩时才占用它
+    candidates = [(1, 'r1', 5, None), (2, 'r2', 10, 1)]
+    assert _actions(_schedule_low_battery_robots(candidates, [(1, 's1'), (2, 's2')])) == [
+        (1, 2, 'assign_and_start_charging'),
+        (2, 1, 'start_charging')
+    ]
+    # 已分配的充电桩被占用时该机器人本次不开始充电
+    assert _actions(_schedule_low_battery_robots(candidates, [(1, 's1')])) == [
+        (1, 1, 'assign_and_start_charging')
+    ]
+
+def test_sweep_assigns_idle_stations_in_one_pass(app):
+    ChargingStation.query.get(1).status = 'offline'
+    Robot.query.get(1).battery_level = 10
+    Robot.query.get(2).battery_level = 5
+    db.session.commit()
+
+    results = data_access.check_low_battery_robots()
+    assert [(result['robot_id'], result.get('station_id'), result['action']) for result in results] == [
+        (2, 2, 'assign_and_start_charging'),
+        (1, 3, 'assign_and_start_charging')
+    ]
+    db.session.expire_all()
+    assert {(order.robot_id, order.station_id) for order in ChargingOrder.query.filter_by(status='charging')} == {(2, 2), (1, 3)}
+    assert [robot.status for robot in Robot.query.order_by(Robot.id)] == ['charging', 'charging', 'idle']
+    assert ChargingStation.query.get(1).status == 'offline'
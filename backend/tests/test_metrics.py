@@ -0,0 +1,17 @@
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app import db, metrics
+
+def test_failed_statements_leave_no_timing_state(app):
+    before = dict(metrics._sql.get(metrics.BACKGROUND, {'count': 0}))
+    with db.engine.connect() as connection:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                connection.exec_driver_sql('SELECT * FROM missing_table')
+        assert connection.exec_driver_sql('SELECT 1').scalar() == 1
+        # metrics和慢查询日志的计时都不在连接上留下状态
+        assert not connection.info
+
+    # 只统计成功执行的语句
+    assert metrics._sql[metrics.BACKGROUND]['count'] == before['count'] + 1
@@ -0,0 +1,68 @@
+import calendar
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app import db, order_store
+from app.models import ChargingOrder
+from app.order_store import OrderFrame, OrderStore
+
+def _frame(ids, statuses, status_names):
+    ids = np.array(ids, dtype='int64')
+    return OrderFrame(ids, ids * 10, ids * 100, ids, ids, ids,
+                      np.array([status_names.index(status) for status in statuses], dtype='int16'),
+                      ids * 1.5, np.full(len(ids), np.nan), status_names)
+
+def test_merge_overwrites_existing_ids_and_keeps_id_order():
+    current = _frame([1, 2, 4], ['charging', 'charging', 'completed'], ['charging', 'completed', 'failed'])
+    changes = _frame([5, 2, 3], ['failed', 'completed', 'cancelled'], ['charging', 'completed', 'failed', 'cancelled'])
+    changes.robot_id[1] = -1
+
+    merged = OrderStore._merge(current, changes)
+    assert merged.id.tolist() == [1, 2, 3, 4, 5]
+    assert merged.robot_id.tolist() == [10, -1, 30, 40, 50]
+    assert merged.status_text() == ['charging', 'completed', 'cancelled', 'completed', 'failed']
+    # 已发出的快照不受合并影响
+    assert current.robot_id.tolist() == [10, 20, 40]
+    assert current.status_text() == ['charging', 'charging', 'completed']
+
+def test_merge_into_empty_frame():
+    changes = _frame([3, 1], ['charging', 'failed'], list(order_store.STATUS_NAMES))
+    assert OrderStore._merge(OrderFrame.empty(), changes) is changes
+
+def _add_order(order_id, updated_at):
+    db.session.add(ChargingOrder(id=order_id, robot_id=1, station_id=1, status='completed',
+                                 start_time=updated_at, end_time=updated_at, created_at=updated_at, updated_at=updated_at))
+    db.session.commit()
+
+def test_late_commit_inside_grace_window_is_picked_up(app):
+    store = OrderStore()
+    now = datetime.utcnow()
+    _add_order(1, now)
+    store.frame()
+    # 高水位停在刷新前_HIGH_WATER_LAG秒，没有取到订单1的updated_at
+    assert store._high_water < now
+
+    # updated_at在提交前生成：订单2的时间早于已读到的订单1，但晚于高水位
+    _add_order(2, now - timedelta(seconds=1))
+    store.invalidate()
+    assert store.frame().id.tolist() == [1, 2]
+    assert store.stats['incremental_refreshes'] == 1
+
+def test_settled_orders_advance_the_high_water(app):
+    store = OrderStore()
+    old = datetime.utcnow() - timedelta(minutes=10)
+    _add_order(1, old)
+    store.frame()
+    assert store._high_water == old
+
+def test_now_epoch_uses_utc(monkeypatch):
+    # 服务器时区不是UTC时也与数据库中的UTC时间一致
+    monkeypatch.setenv('TZ', 'Asia/Shanghai')
+    time.tzset()
+    try:
+        assert abs(order_store.now_epoch() - calendar.timegm(time.gmtime())) <= 1
+    finally:
+        monkeypatch.undo()
+        time.tzset()
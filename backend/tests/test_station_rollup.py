@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import data_access, db
+from app.models import ChargingOrder, StationHourlyRollup
+
+RANGE = 'startDate=2025-05-03T00:00:00.000Z&endDate=2025-05-14T23:59:59.000Z'
+
+def _rollup_rows():
+    return {
+        (row.station_id, row.hour): (row.energy, row.session_count, row.busy_seconds, row.efficiency_sum, row.efficiency_count)
+        for row in StationHourlyRollup.query.all()
+    }
+
+def test_rebuilt_rollup_totals_match_raw_orders(app, orders):
+    processed, _ = data_access.rebuild_station_rollup(batch_size=16)
+    completed = [order for order in orders if order.status == 'completed']
+    assert processed == len(completed)
+
+    for station_id in (1, 2, 3):
+        station_orders = [order for order in completed if order.station_id == station_id]
+        rows = [values for (row_station, _), values in _rollup_rows().items() if row_station == station_id]
+        assert sum(values[1] for values in rows) == len(station_orders)
+        assert sum(values[0] for values in rows) == pytest.approx(sum(order.charge_amount or 0 for order in station_orders))
+        assert sum(values[2] for values in rows) == pytest.approx(
+            sum((order.end_time - order.start_time).total_seconds() for order in station_orders))
+
+def test_efficiency_trend_from_rollup_matches_raw_orders(app, client, orders):
+    data_access.rebuild_station_rollup()
+    app.config['STATION_ROLLUP_MIN_DAYS'] = 0
+    from_rollup = client.get('/api/energy-efficiency/efficiency-trend/?' + RANGE).get_json()
+    app.config['STATION_ROLLUP_MIN_DAYS'] = 1000
+    from_orders = client.get('/api/energy-efficiency/efficiency-trend/?' + RANGE).get_json()
+    assert from_rollup == from_orders
+
+def test_empty_rollup_falls_back_to_orders(app, client, orders):
+    app.config['STATION_ROLLUP_MIN_DAYS'] = 0
+    heatmap = client.get('/api/energy-efficiency/energy-distribution/?' + RANGE).get_json()
+    assert any(point[2] for point in heatmap['data'])
+
+def test_completing_an_order_updates_the_rollup(app, client):
+    assert client.post('/api/robots/1/assign/1').status_code == 200
+    # 把充电开始时间提前，使订单跨越多个小时
+    order = ChargingOrder.query.filter_by(robot_id=1, status='charging').one()
+    order.start_time = datetime.utcnow() - timedelta(hours=2, minutes=30)
+    db.session.commit()
+
+    assert client.post('/api/robots/1/release').status_code == 200
+    incremental = _rollup_rows()
+    assert len(incremental) >= 3
+    assert sum(values[1] for values in incremental.values()) == 1
+
+    data_access.rebuild_station_rollup()
+    rebuilt = _rollup_rows()
+    assert incremental.keys() == rebuilt.keys()
+    for key, values in incremental.items():
+        assert values == pytest.approx(rebuilt[key])
@@ -0,0 +1,51 @@
+from app import data_access
+
+def _sync(client, since):
+    response = client.get('/api/stations/', query_string={'since': since})
+    assert response.status_code == 200
+    return response.get_json()
+
+def test_delta_sync_cursor_round_trip(app, client):
+    # 不回退游标，便于断言同步后没有重复的行
+    app.config['SYNC_CURSOR_LAG_SECONDS'] = 0
+
+    full = _sync(client, '0')
+    assert full['full'] is True
+    assert sorted(item['id'] for item in full['items']) == [1, 2, 3]
+
+    unchanged = _sync(client, full['cursor'])
+    assert unchanged['full'] is False
+    assert unchanged['items'] == [] and unchanged['deleted'] == []
+
+    data_access.update_charging_station(2, {'name': '充电站-新'})
+    changed = _sync(client, unchanged['cursor'])
+    assert [(item['id'], item['name']) for item in changed['items']] == [(2, '充电站-新')]
+    assert changed['hasMore'] is False
+
+    assert _sync(client, changed['cursor'])['items'] == []
+
+def test_delta_sync_pages_and_tombstones(app, client):
+    app.config['SYNC_CURSOR_LAG_SECONDS'] = 0
+    cursor = _sync(client, '0')['cursor']
+
+    added = data_access.add_charging_station({'name': '充电站-004', 'power_rating': 7.5})
+    for station_id in (1, 3):
+        data_access.update_charging_station(station_id, {'location': '新位置'})
+
+    # 每页一行，逐页读取直到hasMore为false
+    seen = []
+    while True:
+        page = client.get('/api/stations/', query_string={'since': cursor, 'limit': 1}).get_json()
+        seen += [item['id'] for item in page['items']]
+        cursor = page['cursor']
+        if not page['hasMore']:
+            break
+    assert sorted(seen) == sorted([added['id'], 1, 3])
+
+    assert data_access.delete_charging_station(added['id'])
+    deleted = _sync(client, cursor)
+    assert deleted['items'] == []
+    assert deleted['deleted'] == [added['id']]
+
+def test_delta_sync_rejects_bad_cursor(client):
+    assert client.get('/api/stations/', query_string={'since': 'not-a-cursor'}).status_code == 400
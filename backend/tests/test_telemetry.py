@@ -0,0 +1,25 @@
+from app.models import Robot
+
+def test_telemetry_summary(client):
+    response = client.post('/api/robots/telemetry', json=[
+        {'id': 1, 'battery_level': 55},
+        {'id': 2, 'battery_level': 80, 'status': 'idle'},
+        {'id': 999, 'battery_level': 10},
+        {'id': 3, 'battery_level': 150},
+        {'battery_level': 20},
+        {'id': 3, 'status': 'flying'}
+    ])
+    assert response.status_code == 200
+    summary = response.get_json()
+    assert summary['received'] == 6
+    assert summary['updated'] == 1
+    assert summary['unchanged'] == 1
+    assert summary['not_found'] == [999]
+    assert [item['index'] for item in summary['invalid']] == [3, 4, 5]
+
+    assert Robot.query.get(1).battery_level == 55
+    robots = {robot['id']: robot for robot in client.get('/api/robots/').get_json()}
+    assert robots[1]['battery_level'] == 55
+
+def test_telemetry_rejects_non_list_body(client):
+    assert client.post('/api/robots/telemetry', json={'id': 1}).status_code == 400
@@ -1,11 +1,11 @@
-import { api } from './index';
+import { api, conditionalGet } from './index';
 
 export default {
   /**
    * 获取仪表盘概览数据
    */
   getDashboardOverview() {
-    return api.get('/system/dashboard');
+    return conditionalGet('/system/dashboard');
   },
   
   /**
@@ -26,13 +26,39 @@ export default {
    * 检查低电量机器人并自动充电
    */
   checkLowBatteryRobots() {
-    return api.get('/robots/check-low-battery');
+    return api.post('/robots/check-low-battery');
   },
 
   /**
    * 获取充电效率趋势数据
    */
   getChargingEfficiency() {
-    return api.get('/system/charging-efficiency');
+    return conditionalGet('/system/charging-efficiency');
+  },
+
+  /**
+   * 订阅实时推送（Server-Sent Events）
+   * @param {Object} handlers 事件处理函数 { snapshot, change, error }，参数为解析后的事件数据
+   * @returns {EventSource} 调用close()取消订阅；浏览器不支持时返回null
+   */
+  subscribeStream(handlers = {}) {
+    if (typeof EventSource === 'undefined') {
+      return null;
+    }
+    const source = new EventSource(`${api.defaults.baseURL}/system/stream`);
+    ['snapshot', 'change'].forEach(type => {
+      source.addEventListener(type, event => {
+        if (handlers[type]) {
+          handlers[type](JSON.parse(event.data));
+        }
+      });
+    });
+    // 连接断开后浏览器会自动重连，并通过Last-Event-ID补发错过的事件
+    source.onerror = error => {
+      if (handlers.error) {
+        handlers.error(error);
+      }
+    };
+    return source;
   }
 }; 
\ No newline at end of file
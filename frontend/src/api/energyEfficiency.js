@@ -1,4 +1,4 @@
-import { api } from './index';
+import { api, conditionalGet } from './index';
 
 export default {
   // 获取充电站列表
@@ -46,6 +46,11 @@ export default {
     return api.get('/energy-efficiency/charging-events/', { params });
   },
   
+  // 一次获取能效分析页面全部面板数据（KPI、各图表和充电事件）
+  getBundle(params) {
+    return conditionalGet('/energy-efficiency/bundle/', { params });
+  },
+  
   // 导出数据
   exportData(params) {
     return api.get('/energy-efficiency/export/', { 
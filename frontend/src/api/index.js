@@ -163,6 +163,35 @@ api.interceptors.response.use(
   }
 )
 
+// 条件请求：记录GET接口返回的ETag，下次请求时带上If-None-Match，
+// 数据未变化时服务器返回304（不含响应体），直接使用上次的数据
+const etagCache = new Map()
+
+export function conditionalGet(url, config = {}) {
+  const key = url + JSON.stringify(config.params || {})
+  const cached = etagCache.get(key)
+  const headers = { ...(config.headers || {}) }
+  if (cached) {
+    headers['If-None-Match'] = cached.etag
+  }
+  return api.get(url, {
+    ...config,
+    headers,
+    validateStatus: status => (status >= 200 && status < 300) || status === 304
+  }).then(response => {
+    if (response.status === 304 && cached) {
+      return { ...response, status: 200, data: cached.data }
+    }
+    const etag = response.headers.etag
+    if (etag) {
+      etagCache.set(key, { etag, data: response.data })
+    } else {
+      etagCache.delete(key)
+    }
+    return response
+  })
+}
+
 // 充电站相关 API
 export const stationApi = {
   // 获取所有充电站
@@ -511,7 +540,7 @@ export const robotApi = {
   // 新增：检查低电量机器人并自动充电
   checkLowBattery() {
     console.log('调用API: 检查低电量机器人')
-    return api.get('/robots/check-low-battery')
+    return api.post('/robots/check-low-battery')
   }
 }
 
@@ -1,5 +1,8 @@
 import os
+import sys
+import time
 import random
+import argparse
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -448,5 +451,300 @@ def main():
     print(f"- 系统设置: {len(settings_df)} 条记录")
     print(f"- 系统日志: {len(system_logs_df)} 条记录")
 
+# ---------------- 大规模数据生成 ----------------
+# 用NumPy按列批量生成充电站、机器人和充电订单，订单分块写出，内存占用只与块大小有关
+
+STATION_STATUSES = np.array(['idle', 'charging', 'maintenance', 'error'])
+STATION_STATUS_WEIGHTS = [0.4, 0.4, 0.1, 0.1]
+ROBOT_STATUSES = np.array(['idle', 'working', 'charging', 'error'])
+ROBOT_STATUS_WEIGHTS = [0.3, 0.4, 0.2, 0.1]
+
+# 各表的写出顺序（与Excel表格顺序一致）
+TABLE_ORDER = ['users', 'charging_stations', 'robots', 'charging_orders',
+               'system_alerts', 'efficiency_logs', 'system_settings', 'system_logs']
+# 由订单派生或记录删除的表，数据库输出时一并清空，避免残留旧数据
+DERIVED_TABLES = ['station_hourly_rollup', 'deleted_records']
+
+def _now64():
+    return np.datetime64(now.replace(microsecond=0), 's')
+
+def _minutes_before(now64, minutes):
+    return now64 - minutes.astype('timedelta64[m]')
+
+def generate_stations_columnar(rng, count):
+    """按列生成充电站数据"""
+    ids = np.arange(1, count + 1)
+    status = rng.choice(STATION_STATUSES, size=count, p=STATION_STATUS_WEIGHTS)
+    power_output = np.round(rng.uniform(5.0, 15.0, size=count), 2)
+    # 故障充电桩的效率较低
+    efficiency = np.where(status == 'error',
+                          rng.uniform(50.0, 85.0, size=count),
+                          rng.uniform(85.0, 100.0, size=count)).round(2)
+    created_days = rng.integers(1, 61, size=count)
+    updated_days = (rng.random(count) * (created_days + 1)).astype('int64')
+    now64 = _now64()
+    return pd.DataFrame({
+        'id': ids,
+        'name': [f'充电站-{i}' for i in ids],
+        'location': [f'{zone}区{row}排{col}号' for zone, row, col in zip(
+            np.array(list('ABCDEFGH'))[ids % 8], ids // 8 % 50 + 1, ids % 20 + 1)],
+        'status': status,
+        'power_output': power_output,
+        'efficiency': efficiency,
+        'created_at': _minutes_before(now64, created_days * 1440),
+        'updated_at': _minutes_before(now64, updated_days * 1440),
+        'power_rating': power_output
+    })
+
+def generate_robots_columnar(rng, count):
+    """按列生成机器人数据，充电中的机器人电量较低、空闲的较高"""
+    ids = np.arange(1, count + 1)
+    status = rng.choice(ROBOT_STATUSES, size=count, p=ROBOT_STATUS_WEIGHTS)
+    battery = rng.uniform(10.0, 100.0, size=count)
+    battery = np.where(status == 'charging', rng.uniform(10.0, 40.0, size=count), battery)
+    battery = np.where(status == 'idle', rng.uniform(60.0, 100.0, size=count), battery)
+    created_days = rng.integers(1, 91, size=count)
+    updated_days = (rng.random(count) * (created_days + 1)).astype('int64')
+    now64 = _now64()
+    # 90%的机器人有上次充电记录
+    last_charging_minutes = (rng.random(count) * (np.minimum(created_days, 30) + 1)).astype('int64') * 1440 \
+        + rng.integers(0, 24 * 60, size=count)
+    last_charging = _minutes_before(now64, last_charging_minutes)
+    last_charging[rng.random(count) <= 0.1] = np.datetime64('NaT')
+    return pd.DataFrame({
+        'id': ids,
+        'name': [f'机器人-{i:03d}' for i in ids],
+        'battery_level': battery.round(2),
+        'status': status,
+        'last_charging': last_charging,
+        'created_at': _minutes_before(now64, created_days * 1440),
+        'updated_at': _minutes_before(now64, updated_days * 1440)
+    })
+
+def generate_orders_columnar(rng, stations_df, robot_count, total, days, chunk_size):
+    """分块生成充电订单，每次产出一个DataFrame
+
+    历史订单为已完成或失败（比例与示例数据的 0.7:0.1 一致）；
+    最后为每个状态为charging的充电桩生成一个进行中的订单，保证每个充电桩最多一个充电中订单
+    """
+    power = stations_df['power_output'].to_numpy()
+    base_efficiency = stations_df['efficiency'].to_numpy()
+    active_stations = stations_df['id'].to_numpy()[stations_df['status'].to_numpy() == 'charging']
+    active_stations = active_stations[:min(len(active_stations), robot_count, total)]
+    history_total = total - len(active_stations)
+    now64 = _now64()
+
+    next_id = 1
+    while next_id <= history_total:
+        n = min(chunk_size, history_total - next_id + 1)
+        station_idx = rng.integers(0, len(power), size=n)
+        completed = rng.random(n) < 0.7 / 0.8
+        start = _minutes_before(now64, rng.integers(0, days * 24 * 60 + 1, size=n))
+        minutes = rng.integers(30, 241, size=n)
+        end = start + minutes.astype('timedelta64[m]')
+        efficiency = np.clip(base_efficiency[station_idx] + rng.uniform(-5, 5, size=n), 50, 100).round(2)
+        amount = (power[station_idx] * minutes / 60 * efficiency / 100).round(2)
+        yield pd.DataFrame({
+            'id': np.arange(next_id, next_id + n),
+            'robot_id': rng.integers(1, robot_count + 1, size=n),
+            'station_id': station_idx + 1,
+            'start_time': start,
+            'end_time': end,
+            'status': np.where(completed, 'completed', 'failed'),
+            'charge_amount': np.where(completed, amount, np.nan),
+            'charging_efficiency': np.where(completed, efficiency, np.nan),
+            'created_at': start,
+            'updated_at': end
+        })
+        next_id += n
+
+    if len(active_stations):
+        n = len(active_stations)
+        start = _minutes_before(now64, rng.integers(0, 4 * 60, size=n))
+        yield pd.DataFrame({
+            'id': np.arange(next_id, next_id + n),
+            'robot_id': rng.choice(robot_count, size=n, replace=False) + 1,
+            'station_id': active_stations,
+            'start_time': start,
+            'end_time': np.full(n, np.datetime64('NaT'), dtype='datetime64[s]'),
+            'status': 'charging',
+            'charge_amount': np.nan,
+            'charging_efficiency': np.nan,
+            'created_at': start,
+            'updated_at': start
+        })
+
+def generate_efficiency_logs_columnar(rng, stations_df, days=7):
+    """按列生成充电效率记录：每个充电桩每天 6/12/18/23 点各一条"""
+    hours = np.array([6, 12, 18, 23])
+    today = np.datetime64(now.date(), 's')
+    slots = (today - np.arange(days)[:, None].astype('timedelta64[D]') + hours.astype('timedelta64[h]')).ravel()
+    slots = slots[slots <= _now64()]
+    station_ids = np.repeat(stations_df['id'].to_numpy(), len(slots))
+    base = np.repeat(stations_df['efficiency'].to_numpy(), len(slots))
+    return pd.DataFrame({
+        'id': np.arange(1, len(station_ids) + 1),
+        'station_id': station_ids,
+        'efficiency': np.clip(base + rng.uniform(-5, 5, size=len(base)), 50, 100).round(2),
+        'timestamp': np.tile(slots, len(stations_df))
+    })
+
+def _format_times(values):
+    """把datetime64列批量格式化为 'YYYY-MM-DD HH:MM:SS' 字符串，NaT转为None（比逐个strftime快得多）"""
+    values = np.asarray(values, dtype='datetime64[s]')
+    text = np.datetime_as_string(values, unit='s').astype('U19')
+    text.view('U1').reshape(-1, 19)[:, 10] = ' '
+    result = text.astype(object)
+    result[np.isnat(values)] = None
+    return result
+
+def _with_text_times(df):
+    """返回时间列已格式化为字符串的DataFrame，用于csv和数据库输出"""
+    df = df.copy()
+    for column in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = _format_times(df[column].to_numpy())
+    return df
+
+class TableWriter:
+    """按表追加写出DataFrame，支持csv、parquet和数据库三种输出"""
+
+    def __init__(self, fmt, output_dir=None, db_uri=None):
+        self.fmt = fmt
+        self.output_dir = output_dir
+        self.counts = {}
+        self._parquet_writers = {}
+        self._engine = None
+        if fmt in ('csv', 'parquet'):
+            os.makedirs(output_dir, exist_ok=True)
+        if fmt == 'parquet':
+            try:
+                import pyarrow
+                import pyarrow.parquet
+            except ImportError:
+                raise RuntimeError("输出parquet需要安装pyarrow: pip install pyarrow")
+            self._pa = pyarrow
+        if fmt == 'db':
+            from sqlalchemy import create_engine
+            self._engine = create_engine(db_uri)
+
+    def clear(self, tables):
+        """数据库输出前清空目标表（表结构需已由 init_mysql_db.py 或 init_db.py 创建）"""
+        if self._engine is None:
+            return
+        from sqlalchemy import text
+        with self._engine.begin() as conn:
+            if self._engine.dialect.name == 'mysql':
+                conn.execute(text("SET FOREIGN_KEY_CHECKS = 0"))
+            for table in tables:
+                conn.execute(text(f"DELETE FROM {table}"))
+            if self._engine.dialect.name == 'mysql':
+                conn.execute(text("SET FOREIGN_KEY_CHECKS = 1"))
+
+    def write(self, table, df):
+        if self.fmt == 'csv':
+            path = os.path.join(self.output_dir, f'{table}.csv')
+            first = table not in self.counts
+            _with_text_times(df).to_csv(path, mode='w' if first else 'a', header=first, index=False)
+        elif self.fmt == 'parquet':
+            batch = self._pa.Table.from_pandas(df, preserve_index=False)
+            writer = self._parquet_writers.get(table)
+            if writer is None:
+                import pyarrow.parquet
+                writer = pyarrow.parquet.ParquetWriter(os.path.join(self.output_dir, f'{table}.parquet'), batch.schema)
+                self._parquet_writers[table] = writer
+            writer.write_table(batch.cast(writer.schema))
+        else:
+            self._insert(table, df)
+        self.counts[table] = self.counts.get(table, 0) + len(df)
+
+    def _insert(self, table, df):
+        """executemany批量插入（pymysql会把同一批数据合并为多行INSERT）"""
+        from sqlalchemy import text
+        df = _with_text_times(df)
+        columns = list(df.columns)
+        df = df.astype(object).where(df.notna(), None)
+        rows = [dict(zip(columns, row)) for row in df.itertuples(index=False, name=None)]
+        sql = text("INSERT INTO {} ({}) VALUES ({})".format(
+            table, ', '.join(columns), ', '.join(f':{c}' for c in columns)))
+        with self._engine.begin() as conn:
+            if self._engine.dialect.name == 'mysql':
+                conn.execute(text("SET FOREIGN_KEY_CHECKS = 0"))
+            conn.execute(sql, rows)
+
+    def close(self):
+        for writer in self._parquet_writers.values():
+            writer.close()
+        if self._engine is not None:
+            self._engine.dispose()
+
+def generate_scaled(args):
+    """按命令行参数生成大规模数据并分块写出"""
+    rng = np.random.default_rng(args.seed)
+    writer = TableWriter(args.format, args.output, args.db)
+    started = time.time()
+    try:
+        writer.clear(DERIVED_TABLES + TABLE_ORDER)
+        stations_df = generate_stations_columnar(rng, args.stations)
+        robots_df = generate_robots_columnar(rng, args.robots)
+        users_df = generate_users()
+        # 数据库users表没有明文password列
+        writer.write('users', users_df.drop(columns=['password']) if args.format == 'db' else users_df)
+        writer.write('charging_stations', stations_df)
+        writer.write('robots', robots_df)
+        print(f"已生成 {len(stations_df)} 个充电桩、{len(robots_df)} 个机器人")
+
+        for chunk in generate_orders_columnar(rng, stations_df, args.robots, args.orders, args.days, args.chunk_size):
+            writer.write('charging_orders', chunk)
+            written = writer.counts['charging_orders']
+            elapsed = time.time() - started
+            print(f"充电订单: {written}/{args.orders}，{written / elapsed:,.0f} 行/秒")
+
+        writer.write('system_alerts', generate_system_alerts())
+        writer.write('efficiency_logs', generate_efficiency_logs_columnar(rng, stations_df))
+        writer.write('system_settings', generate_system_settings())
+        writer.write('system_logs', generate_system_logs(users_df))
+    finally:
+        writer.close()
+
+    target = os.path.abspath(args.output) if args.format != 'db' else writer._engine.url.render_as_string(hide_password=True)
+    print(f"模拟数据已写入: {target}，耗时 {time.time() - started:.2f} 秒")
+    for table in TABLE_ORDER:
+        print(f"- {table}: {writer.counts.get(table, 0)} 条记录")
+    if args.format == 'db':
+        return rebuild_station_rollup(args.db)
+    return True
+
+def rebuild_station_rollup(db_uri):
+    """按写入的订单重建充电站小时汇总表（使用后端的重建逻辑），否则长时间范围的能效分析没有数据"""
+    os.environ['DATABASE_URL'] = db_uri
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+    from rebuild_station_rollup import rebuild_station_rollup as rebuild
+    return rebuild()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='生成模拟数据')
+    parser.add_argument('--format', choices=['xlsx', 'csv', 'parquet', 'db'], default='xlsx',
+                        help='输出格式，xlsx 为原有的示例数据（固定规模），其余按参数规模分块生成')
+    parser.add_argument('--orders', type=int, default=3000, help='充电订单数量，如 10_000_000')
+    parser.add_argument('--robots', type=int, default=50, help='机器人数量')
+    parser.add_argument('--stations', type=int, default=12, help='充电桩数量')
+    parser.add_argument('--days', type=int, default=30, help='订单时间跨度（天）')
+    parser.add_argument('--chunk-size', type=int, default=500_000, help='每块生成和写出的订单数')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default=os.path.join('data', 'generated'), help='csv/parquet 输出目录')
+    parser.add_argument('--db', help='--format db 时的数据库URI（目标表会被清空）')
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    args = parse_args()
+    if args.format == 'xlsx':
+        main()
+    elif args.format == 'db' and not args.db:
+        print("--format db 需要通过 --db 指定数据库URI")
+        sys.exit(1)
+    elif args.robots < 1 or args.stations < 1 or args.orders < 0 or args.days < 1 or args.chunk_size < 1:
+        print("数量参数必须为正数")
+        sys.exit(1)
+    elif not generate_scaled(args):
+        sys.exit(1)
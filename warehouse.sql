@@ -35,6 +35,10 @@ CREATE TABLE `charging_orders`  (
   PRIMARY KEY (`id`) USING BTREE,
   INDEX `robot_id`(`robot_id` ASC) USING BTREE,
   INDEX `station_id`(`station_id` ASC) USING BTREE,
+  INDEX `idx_orders_station_start`(`station_id` ASC, `start_time` ASC) USING BTREE,
+  INDEX `idx_orders_start_status`(`start_time` ASC, `status` ASC) USING BTREE,
+  INDEX `idx_orders_robot_status_start`(`robot_id` ASC, `status` ASC, `start_time` DESC) USING BTREE,
+  INDEX `idx_orders_updated_at`(`updated_at` ASC) USING BTREE,
   CONSTRAINT `charging_orders_ibfk_1` FOREIGN KEY (`robot_id`) REFERENCES `robots` (`id`) ON DELETE RESTRICT ON UPDATE RESTRICT,
   CONSTRAINT `charging_orders_ibfk_2` FOREIGN KEY (`station_id`) REFERENCES `charging_stations` (`id`) ON DELETE RESTRICT ON UPDATE RESTRICT
 ) ENGINE = InnoDB AUTO_INCREMENT = 72 CHARACTER SET = utf8mb4 COLLATE = utf8mb4_general_ci ROW_FORMAT = Dynamic;
@@ -122,6 +126,11 @@ INSERT INTO `charging_orders` VALUES (77, 2, 2, '2025-06-06 10:59:17', NULL, 'ch
 INSERT INTO `charging_orders` VALUES (78, 3, 10, '2025-06-06 10:59:22', NULL, 'charging', 0, 0, '2025-06-06 10:59:22', '2025-06-06 10:59:22');
 INSERT INTO `charging_orders` VALUES (79, 4, 5, '2025-06-06 11:06:53', NULL, 'charging', 0, 0, '2025-06-06 11:06:53', '2025-06-06 11:06:53');
 
+-- 每个充电桩最多一个充电中的订单：生成列在充电中时为station_id，其余为NULL
+ALTER TABLE `charging_orders`
+  ADD COLUMN `active_station_id` int GENERATED ALWAYS AS (case when (`status` = 'charging') then `station_id` end) VIRTUAL NULL,
+  ADD UNIQUE INDEX `uq_orders_active_station`(`active_station_id` ASC) USING BTREE;
+
 -- ----------------------------
 -- Table structure for charging_stations
 -- ----------------------------
@@ -137,7 +146,9 @@ CREATE TABLE `charging_stations`  (
   `last_maintenance` datetime NULL DEFAULT NULL,
   `created_at` datetime NULL DEFAULT NULL,
   `updated_at` datetime NULL DEFAULT NULL,
-  PRIMARY KEY (`id`) USING BTREE
+  PRIMARY KEY (`id`) USING BTREE,
+  INDEX `idx_stations_status`(`status` ASC) USING BTREE,
+  INDEX `idx_stations_updated_at`(`updated_at` ASC) USING BTREE
 ) ENGINE = InnoDB AUTO_INCREMENT = 13 CHARACTER SET = utf8mb4 COLLATE = utf8mb4_general_ci ROW_FORMAT = Dynamic;
 
 -- ----------------------------
@@ -158,6 +169,30 @@ INSERT INTO `charging_stations` VALUES (12, '充电站-012', '位置-12', 'idle'
 INSERT INTO `charging_stations` VALUES (13, '充电站-013', '位置-13', 'idle', 22, 80, 22, NULL, '2025-06-06 10:41:21', '2025-06-06 10:41:21');
 INSERT INTO `charging_stations` VALUES (14, '14', '位置-14', 'idle', 33.33, 80, 33, NULL, '2025-06-06 10:58:19', '2025-06-06 10:58:19');
 
+-- ----------------------------
+-- Table structure for data_versions
+-- ----------------------------
+DROP TABLE IF EXISTS `data_versions`;
+CREATE TABLE `data_versions`  (
+  `name` varchar(32) CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci NOT NULL,
+  `version` int NOT NULL DEFAULT 0,
+  `updated_at` datetime NOT NULL,
+  PRIMARY KEY (`name`) USING BTREE
+) ENGINE = InnoDB CHARACTER SET = utf8mb4 COLLATE = utf8mb4_general_ci ROW_FORMAT = Dynamic;
+
+-- ----------------------------
+-- Table structure for deleted_records
+-- ----------------------------
+DROP TABLE IF EXISTS `deleted_records`;
+CREATE TABLE `deleted_records`  (
+  `id` int NOT NULL AUTO_INCREMENT,
+  `table_name` varchar(50) CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci NOT NULL,
+  `record_id` int NOT NULL,
+  `deleted_at` datetime NOT NULL,
+  PRIMARY KEY (`id`) USING BTREE,
+  INDEX `idx_deleted_records_table_time`(`table_name` ASC, `deleted_at` ASC) USING BTREE
+) ENGINE = InnoDB CHARACTER SET = utf8mb4 COLLATE = utf8mb4_general_ci ROW_FORMAT = Dynamic;
+
 -- ----------------------------
 -- Table structure for efficiency_logs
 -- ----------------------------
@@ -201,6 +236,8 @@ CREATE TABLE `robots`  (
   `updated_at` datetime NULL DEFAULT NULL,
   PRIMARY KEY (`id`) USING BTREE,
   INDEX `station_id`(`station_id` ASC) USING BTREE,
+  INDEX `idx_robots_status_battery`(`status` ASC, `battery_level` ASC) USING BTREE,
+  INDEX `idx_robots_updated_at`(`updated_at` ASC) USING BTREE,
   CONSTRAINT `robots_ibfk_1` FOREIGN KEY (`station_id`) REFERENCES `charging_stations` (`id`) ON DELETE RESTRICT ON UPDATE RESTRICT
 ) ENGINE = InnoDB AUTO_INCREMENT = 21 CHARACTER SET = utf8mb4 COLLATE = utf8mb4_general_ci ROW_FORMAT = Dynamic;
 
@@ -228,6 +265,277 @@ INSERT INTO `robots` VALUES (18, '机器人-018', 99.1921, 'idle', NULL, '2025-0
 INSERT INTO `robots` VALUES (19, '机器人-019', 99.7879, 'idle', NULL, '2025-05-20 16:42:50', '2025-06-05 16:42:50', '2025-06-05 16:42:50');
 INSERT INTO `robots` VALUES (20, '机器人-020', 100, 'idle', NULL, '2025-06-06 10:45:21', '2025-06-05 16:42:50', '2025-06-06 10:45:21');
 
+-- ----------------------------
+-- Table structure for station_hourly_rollup
+-- ----------------------------
+DROP TABLE IF EXISTS `station_hourly_rollup`;
+CREATE TABLE `station_hourly_rollup`  (
+  `station_id` int NOT NULL,
+  `hour` datetime NOT NULL,
+  `energy` float NOT NULL DEFAULT 0,
+  `session_count` int NOT NULL DEFAULT 0,
+  `busy_seconds` float NOT NULL DEFAULT 0,
+  `efficiency_sum` float NOT NULL DEFAULT 0,
+  `efficiency_count` int NOT NULL DEFAULT 0,
+  `updated_at` datetime NULL DEFAULT NULL,
+  PRIMARY KEY (`station_id`, `hour`) USING BTREE,
+  INDEX `idx_rollup_hour`(`hour` ASC) USING BTREE,
+  CONSTRAINT `station_hourly_rollup_ibfk_1` FOREIGN KEY (`station_id`) REFERENCES `charging_stations` (`id`) ON DELETE RESTRICT ON UPDATE RESTRICT
+) ENGINE = InnoDB CHARACTER SET = utf8mb4 COLLATE = utf8mb4_general_ci ROW_FORMAT = Dynamic;
+
+-- ----------------------------
+-- Records of station_hourly_rollup
+-- ----------------------------
+INSERT INTO `station_hourly_rollup` VALUES (1, '2025-05-11 11:00:00', 4.6064, 1, 2410, 91.7408, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (1, '2025-05-11 12:00:00', 6.8809, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (1, '2025-05-11 13:00:00', 6.8809, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (1, '2025-05-11 14:00:00', 6.7299, 0, 3521, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (1, '2025-05-15 19:00:00', 4.4362, 1, 2590, 82.2081, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (1, '2025-05-15 20:00:00', 6.1662, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (1, '2025-05-15 21:00:00', 6.1662, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (1, '2025-05-15 22:00:00', 0.5995, 0, 350, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (1, '2025-05-25 11:00:00', 5.897, 1, 3250, 87.0934, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (1, '2025-05-25 12:00:00', 6.5321, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (1, '2025-05-25 13:00:00', 6.5321, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (1, '2025-05-25 14:00:00', 6.5248, 0, 3596, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (1, '2025-05-30 01:00:00', 4.4137, 1, 2170, 97.6215, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (1, '2025-05-30 02:00:00', 7.3223, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (1, '2025-05-30 03:00:00', 6.0287, 0, 2964, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (1, '2025-06-01 05:00:00', 5.3534, 1, 3010, 85.364, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (1, '2025-06-01 06:00:00', 6.4027, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (1, '2025-06-01 07:00:00', 6.4027, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (1, '2025-06-01 08:00:00', 2.4757, 0, 1392, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (1, '2025-06-01 17:00:00', 2.6384, 1, 1330, 95.1993, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (1, '2025-06-01 18:00:00', 5.4117, 0, 2728, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (1, '2025-06-03 11:00:00', 3.7677, 1, 2110, 85.7091, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (1, '2025-06-03 12:00:00', 6.4283, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (1, '2025-06-03 13:00:00', 6.4283, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (1, '2025-06-03 14:00:00', 6.3676, 0, 3566, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (1, '2025-06-06 10:00:00', 0, 2, 858, 180, 2, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (1, '2025-06-06 11:00:00', 0, 0, 1047, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-05-09 23:00:00', 9.9311, 1, 3130, 95.1718, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-05-10 00:00:00', 2.5574, 0, 806, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-05-16 15:00:00', 9.0514, 1, 3010, 90.2028, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-05-16 16:00:00', 11.2318, 1, 3730, 93.7399, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-05-16 17:00:00', 13.2217, 0, 4256, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-05-16 18:00:00', 11.249, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-05-16 19:00:00', 4.2715, 0, 1367, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-05-17 07:00:00', 2.2752, 1, 730, 93.4956, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-05-17 08:00:00', 11.22, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-05-17 09:00:00', 11.22, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-05-17 10:00:00', 9.2908, 0, 2981, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-05-24 05:00:00', 8.5787, 1, 2890, 89.0513, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-05-24 06:00:00', 10.6863, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-05-24 07:00:00', 10.5438, 0, 3552, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-05-25 05:00:00', 4.2647, 1, 1390, 92.0322, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-05-25 06:00:00', 8.7902, 0, 2865, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-05-27 05:00:00', 0.1883, 1, 70, 80.6933, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-05-27 06:00:00', 9.6847, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-05-27 07:00:00', 3.3466, 0, 1244, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-05-28 12:00:00', 8.5384, 1, 3130, 81.8383, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-05-28 13:00:00', 4.7084, 0, 1726, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-06-01 01:00:00', 0.7322, 1, 250, 87.8677, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-06-01 02:00:00', 10.5443, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-06-01 03:00:00', 10.5443, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-06-01 04:00:00', 10.5443, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-06-01 05:00:00', 8.5585, 0, 2922, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-06-05 17:00:00', 0, 2, 2813, 180, 2, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-06-05 18:00:00', 0, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-06-05 19:00:00', 0, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-06-05 20:00:00', 0, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-06-05 21:00:00', 0, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-06-05 22:00:00', 0, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-06-05 23:00:00', 0, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-06-06 00:00:00', 0, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-06-06 01:00:00', 0, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-06-06 02:00:00', 0, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-06-06 03:00:00', 0, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-06-06 04:00:00', 0, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-06-06 05:00:00', 0, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-06-06 06:00:00', 0, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-06-06 07:00:00', 0, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-06-06 08:00:00', 0, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-06-06 09:00:00', 0, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (2, '2025-06-06 10:00:00', 0, 2, 3154, 180, 2, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (3, '2025-05-11 09:00:00', 1.5533, 1, 1150, 97.2439, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (3, '2025-05-11 10:00:00', 4.8626, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (3, '2025-05-11 11:00:00', 1.1589, 0, 858, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (3, '2025-05-14 10:00:00', 4.0572, 1, 3430, 85.1495, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (3, '2025-05-14 11:00:00', 1.0776, 0, 911, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (3, '2025-05-14 20:00:00', 1.9811, 1, 1630, 87.4981, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (3, '2025-05-14 21:00:00', 4.3753, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (3, '2025-05-14 22:00:00', 4.1517, 0, 3416, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (3, '2025-05-27 15:00:00', 0.8834, 1, 670, 94.9286, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (3, '2025-05-27 16:00:00', 4.7464, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (3, '2025-05-27 17:00:00', 4.7464, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (3, '2025-05-27 18:00:00', 4.7464, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (3, '2025-05-27 19:00:00', 1.1365, 0, 862, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (3, '2025-06-01 19:00:00', 0.0116, 1, 10, 83.5536, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (3, '2025-06-01 20:00:00', 4.1781, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (3, '2025-06-01 21:00:00', 2.6264, 0, 2263, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (4, '2025-05-17 04:00:00', 3.5173, 1, 1510, 83.8562, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (4, '2025-05-17 05:00:00', 8.3856, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (4, '2025-05-17 06:00:00', 3.0188, 0, 1296, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (4, '2025-05-19 20:00:00', 6.7524, 1, 2650, 91.7281, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (4, '2025-05-19 21:00:00', 7.7488, 0, 3041, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (5, '2025-05-08 12:00:00', 2.4318, 1, 2110, 82.9749, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (5, '2025-05-08 13:00:00', 4.149, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (5, '2025-05-08 14:00:00', 4.149, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (5, '2025-05-08 15:00:00', 3.7122, 0, 3221, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (5, '2025-05-14 15:00:00', 1.7826, 1, 1390, 92.3302, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (5, '2025-05-14 16:00:00', 4.6168, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (5, '2025-05-14 17:00:00', 4.6168, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (5, '2025-05-14 18:00:00', 1.7723, 0, 1382, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (5, '2025-05-18 08:00:00', 2.218, 1, 1810, 88.2223, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (5, '2025-05-18 09:00:00', 4.2486, 0, 3467, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (5, '2025-05-21 09:00:00', 0.9202, 1, 790, 83.8639, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (5, '2025-05-21 10:00:00', 4.1933, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (5, '2025-05-21 11:00:00', 0.9214, 0, 791, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (5, '2025-05-22 17:00:00', 1.4663, 1, 1210, 87.2485, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (5, '2025-05-22 18:00:00', 4.3626, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (5, '2025-05-22 19:00:00', 4.3626, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (5, '2025-05-22 20:00:00', 4.3626, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (5, '2025-05-22 21:00:00', 1.9656, 0, 1622, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (6, '2025-05-20 20:00:00', 9.4502, 1, 2950, 96.0966, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (6, '2025-05-20 21:00:00', 11.5324, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (6, '2025-05-20 22:00:00', 11.5324, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (6, '2025-05-20 23:00:00', 0.8938, 0, 279, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (6, '2025-05-21 22:00:00', 6.1436, 1, 1930, 95.4893, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (6, '2025-05-21 23:00:00', 11.4596, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (6, '2025-05-22 00:00:00', 10.4473, 0, 3282, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (6, '2025-05-25 09:00:00', 0.4193, 1, 130, 96.7678, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (6, '2025-05-25 10:00:00', 11.6126, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (6, '2025-05-25 11:00:00', 11.6126, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (6, '2025-05-25 12:00:00', 9.4224, 0, 2921, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (6, '2025-05-26 01:00:00', 4.9604, 1, 1810, 82.2117, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (6, '2025-05-26 02:00:00', 9.8659, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (6, '2025-05-26 03:00:00', 9.8659, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (6, '2025-05-26 04:00:00', 9.8659, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (6, '2025-05-26 05:00:00', 0.3015, 0, 110, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (6, '2025-05-27 14:00:00', 0.4185, 1, 130, 96.5583, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (6, '2025-05-27 15:00:00', 11.5884, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (6, '2025-05-27 16:00:00', 3.7952, 0, 1179, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (6, '2025-05-31 13:00:00', 3.353, 1, 1030, 97.652, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (6, '2025-05-31 14:00:00', 11.7193, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (6, '2025-05-31 15:00:00', 3.8706, 0, 1189, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (6, '2025-06-06 10:00:00', 0, 1, 5, 90, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-05-05 19:00:00', 2.727, 1, 2110, 93.046, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-05-05 20:00:00', 3.2116, 0, 2485, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-05-06 05:00:00', 1.2871, 1, 1090, 85.0127, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-05-06 06:00:00', 4.2509, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-05-06 07:00:00', 1.4666, 0, 1242, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-05-09 10:00:00', 3.5767, 1, 2890, 89.0976, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-05-09 11:00:00', 3.4517, 0, 2789, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-05-09 23:00:00', 1.8086, 1, 1330, 97.912, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-05-10 00:00:00', 4.8956, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-05-10 01:00:00', 4.8956, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-05-10 02:00:00', 4.8956, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-05-10 03:00:00', 0.223, 0, 164, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-05-10 18:00:00', 3.0215, 1, 2470, 88.0738, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-05-10 19:00:00', 4.4039, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-05-10 20:00:00', 4.4039, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-05-10 21:00:00', 4.4039, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-05-10 22:00:00', 0.2557, 0, 209, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-05-20 10:00:00', 1.8774, 1, 1390, 97.2414, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-05-20 11:00:00', 4.8624, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-05-20 12:00:00', 4.8624, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-05-20 13:00:00', 4.8624, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-05-20 14:00:00', 1.5398, 0, 1140, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-05-27 18:00:00', 2.13, 1, 1750, 87.6341, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-05-27 19:00:00', 4.3818, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-05-27 20:00:00', 2.0862, 0, 1714, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-06-01 00:00:00', 1.4243, 1, 1210, 84.7447, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-06-01 01:00:00', 4.2022, 0, 3570, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-06-04 15:00:00', 0.5535, 1, 430, 92.6747, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-06-04 16:00:00', 4.6338, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (7, '2025-06-04 17:00:00', 2.7532, 0, 2139, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (8, '2025-05-09 02:00:00', 5.1411, 1, 1810, 85.203, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (8, '2025-05-09 03:00:00', 9.2226, 0, 3247, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (8, '2025-05-11 10:00:00', 8.4042, 1, 2830, 89.078, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (8, '2025-05-11 11:00:00', 3.3765, 0, 1137, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (8, '2025-05-12 06:00:00', 7.1049, 1, 2290, 93.0754, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (8, '2025-05-12 07:00:00', 6.4316, 0, 2073, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (8, '2025-05-13 20:00:00', 6.783, 1, 2110, 96.4368, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (8, '2025-05-13 21:00:00', 11.5729, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (8, '2025-05-13 22:00:00', 0.4372, 0, 136, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (8, '2025-05-16 03:00:00', 7.7314, 1, 2710, 85.5849, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (8, '2025-05-16 04:00:00', 10.2705, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (8, '2025-05-16 05:00:00', 2.0341, 0, 713, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (8, '2025-05-17 23:00:00', 6.6869, 1, 2350, 85.3606, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (8, '2025-05-18 00:00:00', 10.2437, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (8, '2025-05-18 01:00:00', 6.1861, 0, 2174, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (8, '2025-05-19 12:00:00', 5.5764, 1, 2050, 81.6023, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (8, '2025-05-19 13:00:00', 9.7928, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (8, '2025-05-19 14:00:00', 9.7928, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (8, '2025-05-19 15:00:00', 9.7928, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (8, '2025-05-19 16:00:00', 0.661, 0, 243, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (8, '2025-05-21 14:00:00', 10.1824, 1, 3250, 93.9902, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (8, '2025-05-21 15:00:00', 11.2789, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (8, '2025-05-21 16:00:00', 11.2789, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (8, '2025-05-21 17:00:00', 4.9847, 0, 1591, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (8, '2025-05-24 13:00:00', 6.4082, 1, 2050, 93.7752, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (8, '2025-05-24 14:00:00', 8.3557, 0, 2673, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (9, '2025-05-31 14:00:00', 0.8076, 1, 250, 96.9058, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (9, '2025-05-31 15:00:00', 11.6295, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (9, '2025-05-31 16:00:00', 6.758, 0, 2092, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (9, '2025-05-31 17:00:00', 9.7413, 1, 3190, 91.6116, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (9, '2025-05-31 18:00:00', 10.9933, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (9, '2025-05-31 19:00:00', 10.9933, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (9, '2025-05-31 20:00:00', 4.6172, 0, 1512, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (10, '2025-05-07 11:00:00', 9.1268, 1, 3370, 97.4931, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (10, '2025-05-07 12:00:00', 5.6629, 0, 2091, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (10, '2025-05-15 15:00:00', 3.2653, 1, 1450, 81.0654, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (10, '2025-05-15 16:00:00', 7.0756, 0, 3142, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (10, '2025-05-17 04:00:00', 3.3209, 1, 1450, 82.4474, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (10, '2025-05-17 05:00:00', 8.245, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (10, '2025-05-17 06:00:00', 8.245, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (10, '2025-05-17 07:00:00', 8.245, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (10, '2025-05-17 08:00:00', 1.5734, 0, 687, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (10, '2025-05-18 22:00:00', 2.088, 1, 790, 95.1354, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (10, '2025-05-18 23:00:00', 9.5147, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (10, '2025-05-19 00:00:00', 2.8465, 0, 1077, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (10, '2025-05-21 12:00:00', 7.8525, 1, 3070, 92.0706, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (10, '2025-05-21 13:00:00', 9.2081, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (10, '2025-05-21 14:00:00', 2.3353, 0, 913, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (10, '2025-05-29 23:00:00', 4.7918, 1, 1870, 92.2436, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (10, '2025-05-30 00:00:00', 9.2249, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (10, '2025-05-30 01:00:00', 1.0762, 0, 420, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (10, '2025-05-30 03:00:00', 2.9007, 1, 1150, 90.8006, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (10, '2025-05-30 04:00:00', 9.0805, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (10, '2025-05-30 05:00:00', 9.0805, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (10, '2025-05-30 06:00:00', 3.5994, 0, 1427, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (10, '2025-06-01 11:00:00', 4.6379, 1, 1750, 95.4093, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (10, '2025-06-01 12:00:00', 9.5409, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (10, '2025-06-01 13:00:00', 9.5409, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (10, '2025-06-01 14:00:00', 9.5409, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (10, '2025-06-01 15:00:00', 0.432, 0, 163, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (11, '2025-05-05 18:00:00', 5.4079, 1, 3070, 84.5486, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (11, '2025-05-05 19:00:00', 6.3415, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (11, '2025-05-05 20:00:00', 6.3415, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (11, '2025-05-05 21:00:00', 6.3415, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (11, '2025-05-05 22:00:00', 0.5584, 0, 317, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (11, '2025-05-17 12:00:00', 2.5617, 1, 1390, 88.4554, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (11, '2025-05-17 13:00:00', 6.6346, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (11, '2025-05-17 14:00:00', 6.6346, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (11, '2025-05-17 15:00:00', 1.4633, 0, 794, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (12, '2025-05-12 06:00:00', 8.4868, 1, 3070, 82.9217, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (12, '2025-05-12 07:00:00', 9.0977, 0, 3291, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (12, '2025-05-15 01:00:00', 7.1207, 1, 2530, 84.4282, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (12, '2025-05-15 02:00:00', 10.1323, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (12, '2025-05-15 03:00:00', 9.5638, 0, 3398, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (12, '2025-05-17 23:00:00', 0.3705, 1, 130, 85.4876, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (12, '2025-05-18 00:00:00', 10.2592, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (12, '2025-05-18 01:00:00', 10.2592, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (12, '2025-05-18 02:00:00', 10.2592, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (12, '2025-05-18 03:00:00', 2.9324, 0, 1029, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (12, '2025-05-22 13:00:00', 7.5564, 1, 2530, 89.602, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (12, '2025-05-22 14:00:00', 10.7522, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (12, '2025-05-22 15:00:00', 10.7522, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (12, '2025-05-22 16:00:00', 3.2197, 0, 1078, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (12, '2025-05-23 18:00:00', 3.4977, 1, 1090, 96.263, 1, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (12, '2025-05-23 19:00:00', 11.5521, 0, 3600, 0, 0, '2025-06-06 19:29:13');
+INSERT INTO `station_hourly_rollup` VALUES (12, '2025-05-23 20:00:00', 3.2988, 0, 1028, 0, 0, '2025-06-06 19:29:13');
+
 -- ----------------------------
 -- Table structure for system_alerts
 -- ----------------------------
@@ -239,7 +547,8 @@ CREATE TABLE `system_alerts`  (
   `message` text CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci NOT NULL,
   `is_read` tinyint(1) NULL DEFAULT NULL,
   `created_at` datetime NULL DEFAULT NULL,
-  PRIMARY KEY (`id`) USING BTREE
+  PRIMARY KEY (`id`) USING BTREE,
+  INDEX `idx_alerts_time`(`time` DESC) USING BTREE
 ) ENGINE = InnoDB AUTO_INCREMENT = 1 CHARACTER SET = utf8mb4 COLLATE = utf8mb4_general_ci ROW_FORMAT = Dynamic;
 
 -- ----------------------------